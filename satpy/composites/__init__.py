@@ -26,6 +26,7 @@
 
 import logging
 import os
+import threading
 import time
 from weakref import WeakValueDictionary
 
@@ -35,18 +36,22 @@ import xarray as xr
 import xarray.ufuncs as xu
 import dask.array as da
 import yaml
+from pyresample.geometry import AreaDefinition
 
-from satpy.config import (CONFIG_PATH, config_search_paths,
+from satpy.config import (CONFIG_CACHE, CONFIG_PATH, config_search_paths,
                           recursive_dict_update)
 from satpy.dataset import (DATASET_KEYS, DatasetID, MetadataObject,
                            combine_metadata)
 from satpy.readers import DatasetDict
+from satpy.resample import ResampleCache
 from satpy.utils import sunzen_corr_cos, atmospheric_path_length_correction
 from satpy.writers import get_enhanced_image
 from satpy import CHUNK_SIZE
 
 LOG = logging.getLogger(__name__)
 
+ANGLES_FILE_PREFIX = 'angles-'
+
 
 class IncompatibleAreas(Exception):
 
@@ -67,12 +72,20 @@ class IncompatibleTimes(Exception):
 class CompositorLoader(object):
 
     """Read composites using the configuration files on disk.
+
+    The compositors and modifiers built from a set of configuration files are
+    cached for the whole process (see `satpy.config.CONFIG_CACHE`) and shared
+    by all loaders until one of the files, or of the files of the sensors it
+    inherits from, is modified. Compositor objects must therefore not be
+    modified once created.
     """
 
     def __init__(self, ppp_config_dir=CONFIG_PATH):
         self.modifiers = {}
         self.compositors = {}
         self.ppp_config_dir = ppp_config_dir
+        # cache entries this loader was populated from
+        self._entries = []
 
     def load_sensor_composites(self, sensor_name):
         """Load all compositor configs for the provided sensor."""
@@ -85,7 +98,41 @@ class CompositorLoader(object):
             LOG.debug("No composite config found called {}".format(
                 config_filename))
             return
-        self._load_config(composite_configs)
+        entry = self._get_cached_config(composite_configs)
+        self._entries.append((composite_configs, entry))
+        self._add_entry(entry)
+
+    def _add_entry(self, entry):
+        for dep_entry in entry['deps']:
+            self._add_entry(dep_entry[1])
+        sensor_id = entry['sensor_id']
+        if sensor_id is not None:
+            self.compositors[sensor_id] = entry['compositors']
+            self.modifiers[sensor_id] = entry['modifiers']
+
+    def _get_cached_config(self, composite_configs):
+        """Get the cached compositors and modifiers of *composite_configs*.
+
+        Entries built from a sensor depending on other sensors are rebuilt
+        when the entries of these sensors are not current anymore.
+        """
+        name = (self.__class__, 'composites', self.ppp_config_dir)
+
+        def _build():
+            loader = self.__class__(self.ppp_config_dir)
+            sensor_id = loader._load_config(composite_configs)
+            return {'sensor_id': sensor_id,
+                    'compositors': loader.compositors.get(sensor_id),
+                    'modifiers': loader.modifiers.get(sensor_id),
+                    'deps': loader._entries}
+
+        while True:
+            entry = CONFIG_CACHE.get(name, composite_configs, _build,
+                                     copy_result=False)
+            if all(self._get_cached_config(dep_configs) is dep_entry
+                   for dep_configs, dep_entry in entry['deps']):
+                return entry
+            CONFIG_CACHE.discard(name, composite_configs)
 
     def get_compositor(self, key, sensor_names):
         for sensor_name in sensor_names:
@@ -120,8 +167,9 @@ class CompositorLoader(object):
                     sensor_name -> modifier name -> (modifier class,
                     modifiers options)
 
-                Note that these dictionaries are copies of those cached in
-                this object.
+                Note that these dictionaries are shallow copies of those
+                cached in this object. The compositor objects themselves are
+                shared.
         """
         comps = {}
         mods = {}
@@ -129,8 +177,7 @@ class CompositorLoader(object):
             if sensor_name not in self.compositors:
                 self.load_sensor_composites(sensor_name)
             if sensor_name in self.compositors:
-                comps[sensor_name] = DatasetDict(
-                    self.compositors[sensor_name].copy())
+                comps[sensor_name] = self.compositors[sensor_name].copy()
                 mods[sensor_name] = self.modifiers[sensor_name].copy()
         return comps, mods
 
@@ -196,7 +243,7 @@ class CompositorLoader(object):
         except KeyError:
             LOG.debug('No "sensor_name" tag found in %s, skipping.',
                       composite_config)
-            return
+            return None
 
         sensor_id = sensor_name.split('/')[-1]
         sensor_deps = sensor_name.split('/')[:-1]
@@ -218,6 +265,7 @@ class CompositorLoader(object):
             for composite_name in conf[composite_type]:
                 self._process_composite_config(composite_name, conf,
                                                composite_type, sensor_id, composite_config, **kwargs)
+        return sensor_id
 
 
 def check_times(projectables):
@@ -321,12 +369,130 @@ class CompositeBase(MetadataObject):
         return data_arrays
 
 
+_angle_providers = threading.local()
+
+
+def get_angle_provider():
+    """Get the `AngleProvider` to use for the current composite generation.
+
+    This is the provider of the `Scene` generating composites in the current
+    thread, or a new provider if the compositors are called outside of a
+    `Scene`.
+    """
+    stack = getattr(_angle_providers, 'stack', None)
+    if stack:
+        return stack[-1]
+    return AngleProvider()
+
+
+class AngleProvider(object):
+    """Provide the sun and satellite angles of areas, computing them once.
+
+    The angles are dask arrays built the first time they are requested for
+    an area and a start time (or a satellite position for the satellite
+    angles) and shared by all the compositors and modifiers requesting them
+    afterwards, rechunked to the chunks they request if needed. Each `Scene`
+    has its own provider, which is returned by :func:`get_angle_provider`
+    while the `Scene` generates composites.
+
+    If `cache_dir` is provided the longitudes/latitudes and satellite angles
+    of `AreaDefinition` areas, which don't change with time for
+    geostationary satellites, are also saved in this directory and read back
+    lazily by later providers::
+
+        >>> scn.angle_provider.cache_dir = '/path/to/cache_dir'
+
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir
+        self._cache = ResampleCache(max_entries=None)
+
+    def __enter__(self):
+        if not hasattr(_angle_providers, 'stack'):
+            _angle_providers.stack = []
+        _angle_providers.stack.append(self)
+        return self
+
+    def __exit__(self, *args):
+        _angle_providers.stack.pop()
+
+    def _get(self, area, key, compute, chunks, persist=False):
+        """Get the arrays computed by *compute* for *area* and *key*."""
+        the_hash = area.update_hash()
+        the_hash.update(str(key).encode('utf-8'))
+        cache_key = the_hash.hexdigest()
+        filename = None
+        if persist and self.cache_dir and isinstance(area, AreaDefinition):
+            filename = os.path.join(self.cache_dir,
+                                    ANGLES_FILE_PREFIX + cache_key)
+        value = self._cache.get(cache_key, filename)
+        if value is None:
+            value = self._cache.put(cache_key, compute(), filename)
+        res = {}
+        for name, arr in value.items():
+            arr = da.asarray(arr)
+            if arr.chunks != da.core.normalize_chunks(chunks, arr.shape):
+                arr = arr.rechunk(chunks)
+            res[name] = arr
+        return res
+
+    def get_lonlats(self, area, chunks=CHUNK_SIZE):
+        """Get the longitudes and latitudes of *area*."""
+        def _compute():
+            lons, lats = area.get_lonlats_dask(chunks)
+            return {'lons': lons, 'lats': lats}
+        res = self._get(area, 'lonlats', _compute, chunks, persist=True)
+        return res['lons'], res['lats']
+
+    def get_cos_sun_zenith(self, area, start_time, chunks=CHUNK_SIZE):
+        """Get the cosine of the sun zenith angle of *area* at *start_time*."""
+        def _compute():
+            from pyorbital.astronomy import cos_zen
+            LOG.debug("Computing sun zenith angles.")
+            lons, lats = self.get_lonlats(area, chunks)
+            return {'coszen': cos_zen(start_time, lons, lats)}
+        return self._get(area, ('coszen', start_time), _compute,
+                         chunks)['coszen']
+
+    def get_sun_angles(self, area, start_time, chunks=CHUNK_SIZE):
+        """Get the sun azimuth and zenith angles in degrees."""
+        def _compute():
+            from pyorbital.astronomy import get_alt_az
+            lons, lats = self.get_lonlats(area, chunks)
+            suna = get_alt_az(start_time, lons, lats)[1]
+            coszen = self.get_cos_sun_zenith(area, start_time, chunks)
+            return {'azimuth': da.rad2deg(suna),
+                    'zenith': da.rad2deg(da.arccos(coszen))}
+        res = self._get(area, ('sun_angles', start_time), _compute, chunks)
+        return res['azimuth'], res['zenith']
+
+    def get_satellite_angles(self, area, start_time, satellite_longitude,
+                             satellite_latitude, satellite_altitude,
+                             chunks=CHUNK_SIZE):
+        """Get the satellite azimuth and zenith angles in degrees.
+
+        For a fixed satellite position these angles don't depend on
+        `start_time`, so they are shared by all the times.
+        """
+        def _compute():
+            from pyorbital.orbital import get_observer_look
+            LOG.debug("Computing satellite angles.")
+            lons, lats = self.get_lonlats(area, chunks)
+            sata, satel = get_observer_look(
+                satellite_longitude, satellite_latitude, satellite_altitude,
+                start_time, lons, lats, 0)
+            return {'azimuth': sata, 'zenith': 90 - satel}
+        res = self._get(area, ('satellite_angles', satellite_longitude,
+                               satellite_latitude, satellite_altitude),
+                        _compute, chunks, persist=True)
+        return res['azimuth'], res['zenith']
+
+
 class SunZenithCorrectorBase(CompositeBase):
 
     """Base class for sun zenith correction"""
 
-    coszen = WeakValueDictionary()
-
     def __call__(self, projectables, **info):
         projectables = self.check_areas(projectables)
         vis = projectables[0]
@@ -334,29 +500,16 @@ class SunZenithCorrectorBase(CompositeBase):
             LOG.debug("Sun zen correction already applied")
             return vis
 
-        if hasattr(vis.attrs["area"], 'name'):
-            area_name = vis.attrs["area"].name
-        else:
-            area_name = 'swath' + str(vis.shape)
-        key = (vis.attrs["start_time"], area_name)
         tic = time.time()
         LOG.debug("Applying sun zen correction")
         if len(projectables) == 1:
-            coszen = self.coszen.get(key)
-            if coszen is None:
-                from pyorbital.astronomy import cos_zen
-                LOG.debug("Computing sun zenith angles.")
-                lons, lats = vis.attrs["area"].get_lonlats_dask(CHUNK_SIZE)
-
-                coszen = xr.DataArray(cos_zen(vis.attrs["start_time"],
-                                              lons, lats),
-                                      dims=['y', 'x'],
-                                      coords=[vis['y'], vis['x']])
-                coszen = coszen.where((coszen > 0.035) & (coszen < 1))
-                self.coszen[key] = coszen
+            coszen = get_angle_provider().get_cos_sun_zenith(
+                vis.attrs["area"], vis.attrs["start_time"], CHUNK_SIZE)
+            coszen = xr.DataArray(coszen, dims=['y', 'x'],
+                                  coords=[vis['y'], vis['x']])
+            coszen = coszen.where((coszen > 0.035) & (coszen < 1))
         else:
             coszen = xu.cos(xu.deg2rad(projectables[1]))
-            self.coszen[key] = coszen
 
         proj = self._apply_correction(vis, coszen)
         proj.attrs = vis.attrs.copy()
@@ -396,22 +549,16 @@ class PSPRayleighReflectance(CompositeBase):
     _rayleigh_cache = WeakValueDictionary()
 
     def get_angles(self, vis):
-        from pyorbital.astronomy import get_alt_az, sun_zenith_angle
-        from pyorbital.orbital import get_observer_look
-
-        lons, lats = vis.attrs['area'].get_lonlats_dask(
-            chunks=vis.data.chunks)
-
-        sunalt, suna = get_alt_az(vis.attrs['start_time'], lons, lats)
-        suna = xu.rad2deg(suna)
-        sunz = sun_zenith_angle(vis.attrs['start_time'], lons, lats)
-        sata, satel = get_observer_look(
+        angles = get_angle_provider()
+        suna, sunz = angles.get_sun_angles(vis.attrs['area'],
+                                           vis.attrs['start_time'],
+                                           vis.data.chunks)
+        sata, satz = angles.get_satellite_angles(
+            vis.attrs['area'], vis.attrs['start_time'],
             vis.attrs['satellite_longitude'],
             vis.attrs['satellite_latitude'],
             vis.attrs['satellite_altitude'],
-            vis.attrs['start_time'],
-            lons, lats, 0)
-        satz = 90 - satel
+            vis.data.chunks)
         return sata, satz, suna, sunz
 
     def __call__(self, projectables, optional_datasets=None, **info):
@@ -447,13 +594,14 @@ class PSPRayleighReflectance(CompositeBase):
                         vis.attrs['sensor'], atmosphere, aerosol_type)
         LOG.info("Removing Rayleigh scattering with atmosphere '{}' and aerosol type '{}' for '{}'".format(
             atmosphere, aerosol_type, vis.attrs['name']))
-        if rayleigh_key not in self._rayleigh_cache:
+        # the weakly referenced corrector may be gone after a membership
+        # test when the compositor is shared between threads
+        corrector = self._rayleigh_cache.get(rayleigh_key)
+        if corrector is None:
             corrector = Rayleigh(vis.attrs['platform_name'], vis.attrs['sensor'],
                                  atmosphere=atmosphere,
                                  aerosol_type=aerosol_type)
             self._rayleigh_cache[rayleigh_key] = corrector
-        else:
-            corrector = self._rayleigh_cache[rayleigh_key]
 
         try:
             refl_cor_band = corrector.get_reflectance(sunz, satz, ssadiff,
@@ -477,9 +625,10 @@ class NIRReflectance(CompositeBase):
         """Get the reflectance part of an NIR channel. Not supposed to be used
         for wavelength outside [3, 4] µm.
         """
-        self._init_refl3x(projectables)
+        refl3x = self._init_refl3x(projectables)
         _nir, _ = projectables
-        refl = self._get_reflectance(projectables, optional_datasets) * 100
+        refl = self._get_reflectance(projectables, optional_datasets,
+                                     refl3x) * 100
         proj = xr.DataArray(refl.filled(np.nan), dims=_nir.dims,
                             coords=_nir.coords, attrs=_nir.attrs)
 
@@ -490,6 +639,9 @@ class NIRReflectance(CompositeBase):
 
     def _init_refl3x(self, projectables):
         """Initiate the 3.x reflectance derivations
+
+        The pyspectral calculator is returned rather than kept in the
+        compositor, which is shared by all the scenes of the process.
         """
         try:
             from pyspectral.near_infrared_reflectance import Calculator
@@ -498,9 +650,9 @@ class NIRReflectance(CompositeBase):
             raise
 
         _nir, _tb11 = projectables
-        self._refl3x = Calculator(_nir.attrs['platform_name'], _nir.attrs['sensor'], _nir.attrs['name'])
+        return Calculator(_nir.attrs['platform_name'], _nir.attrs['sensor'], _nir.attrs['name'])
 
-    def _get_reflectance(self, projectables, optional_datasets):
+    def _get_reflectance(self, projectables, optional_datasets, refl3x):
         """Calculate 3.x reflectance with pyspectral"""
         _nir, _tb11 = projectables
         LOG.info('Getting reflective part of %s', _nir.attrs['name'])
@@ -519,11 +671,10 @@ class NIRReflectance(CompositeBase):
 
         # Check if the sun-zenith angle was provided:
         if sun_zenith is None:
-            from pyorbital.astronomy import sun_zenith_angle as sza
-            lons, lats = _nir.attrs["area"].get_lonlats_dask(CHUNK_SIZE)
-            sun_zenith = sza(_nir.attrs['start_time'], lons, lats)
+            sun_zenith = get_angle_provider().get_sun_angles(
+                _nir.attrs["area"], _nir.attrs['start_time'], CHUNK_SIZE)[1]
 
-        return self._refl3x.reflectance_from_tbs(sun_zenith, _nir, _tb11, tb_ir_co2=tb13_4)
+        return refl3x.reflectance_from_tbs(sun_zenith, _nir, _tb11, tb_ir_co2=tb13_4)
 
 
 class NIREmissivePartFromReflectance(NIRReflectance):
@@ -532,15 +683,15 @@ class NIREmissivePartFromReflectance(NIRReflectance):
         """Get the emissive part an NIR channel after having derived the reflectance.
         Not supposed to be used for wavelength outside [3, 4] µm.
         """
-        self._init_refl3x(projectables)
+        refl3x = self._init_refl3x(projectables)
         # Derive the sun-zenith angles, and use the nir and thermal ir
         # brightness tempertures and derive the reflectance using
         # PySpectral. The reflectance is stored internally in PySpectral and
         # needs to be derived first in order to get the emissive part.
-        _ = self._get_reflectance(projectables, optional_datasets)
+        _ = self._get_reflectance(projectables, optional_datasets, refl3x)
         _nir, _ = projectables
         raise NotImplementedError("This compositor wasn't fully converted to dask yet.")
-        proj = xr.DataArray(self._refl3x.emissive_part_3x(), attrs=_nir.attrs,
+        proj = xr.DataArray(refl3x.emissive_part_3x(), attrs=_nir.attrs,
                             dims=_nir.dims, coords=_nir.coords)
 
         proj.attrs['units'] = 'K'
@@ -561,22 +712,15 @@ class PSPAtmosphericalCorrection(CompositeBase):
         if optional_datasets:
             satz = optional_datasets[0]
         else:
-            from pyorbital.orbital import get_observer_look
-            lons, lats = band.attrs['area'].get_lonlats_dask(CHUNK_SIZE)
-
             try:
-                dummy, satel = get_observer_look(band.attrs['satellite_longitude'],
-                                                 band.attrs[
-                                                     'satellite_latitude'],
-                                                 band.attrs[
-                                                     'satellite_altitude'],
-                                                 band.attrs['start_time'],
-                                                 lons, lats, 0)
+                satz = get_angle_provider().get_satellite_angles(
+                    band.attrs['area'], band.attrs['start_time'],
+                    band.attrs['satellite_longitude'],
+                    band.attrs['satellite_latitude'],
+                    band.attrs['satellite_altitude'], CHUNK_SIZE)[1]
             except KeyError:
                 raise KeyError(
                     'Band info is missing some meta data!')
-            satz = 90 - satel
-            del satel
 
         LOG.info('Correction for limb cooling')
         corrector = AtmosphericalCorrection(band.attrs['platform_name'],
@@ -856,17 +1000,14 @@ class DayNightCompositor(GenericCompositor):
         try:
             coszen = xu.cos(xu.deg2rad(projectables[2]))
         except IndexError:
-            from pyorbital.astronomy import cos_zen
-            LOG.debug("Computing sun zenith angles.")
             # Get chunking that matches the data
             try:
                 chunks = day_data.sel(bands=day_data['bands'][0]).chunks
             except KeyError:
                 chunks = day_data.chunks
-            lons, lats = day_data.attrs["area"].get_lonlats_dask(chunks)
-            coszen = xr.DataArray(cos_zen(day_data.attrs["start_time"],
-                                          lons, lats),
-                                  dims=['y', 'x'],
+            coszen = get_angle_provider().get_cos_sun_zenith(
+                day_data.attrs["area"], day_data.attrs["start_time"], chunks)
+            coszen = xr.DataArray(coszen, dims=['y', 'x'],
                                   coords=[day_data['y'], day_data['x']])
         # Calculate blending weights
         coszen -= np.min((lim_high, lim_low))
@@ -32,7 +32,8 @@ import dask.array as da
 import xarray as xr
 import xarray.ufuncs as xu
 
-from satpy.composites import CompositeBase, GenericCompositor
+from satpy.composites import (CompositeBase, GenericCompositor,
+                              get_angle_provider)
 from satpy.config import get_environ_ancpath
 from satpy.dataset import combine_metadata
 
@@ -133,7 +134,8 @@ class ReflectanceCorrector(CompositeBase):
                                         refl_data.attrs["wavelength"],
                                         refl_data.attrs["resolution"])
         use_abi = vis.attrs['sensor'] == 'abi'
-        lons, lats = vis.attrs['area'].get_lonlats_dask(chunks=vis.chunks)
+        lons, lats = get_angle_provider().get_lonlats(vis.attrs['area'],
+                                                      vis.chunks)
         results = run_crefl(refl_data,
                             coefficients,
                             lons,
@@ -154,21 +156,16 @@ class ReflectanceCorrector(CompositeBase):
         return results
 
     def get_angles(self, vis):
-        from pyorbital.astronomy import get_alt_az, sun_zenith_angle
-        from pyorbital.orbital import get_observer_look
-
-        lons, lats = vis.attrs['area'].get_lonlats_dask(
-            chunks=vis.data.chunks)
-        suna = get_alt_az(vis.attrs['start_time'], lons, lats)[1]
-        suna = xu.rad2deg(suna)
-        sunz = sun_zenith_angle(vis.attrs['start_time'], lons, lats)
-        sata, satel = get_observer_look(
+        angles = get_angle_provider()
+        suna, sunz = angles.get_sun_angles(vis.attrs['area'],
+                                           vis.attrs['start_time'],
+                                           vis.data.chunks)
+        sata, satz = angles.get_satellite_angles(
+            vis.attrs['area'], vis.attrs['start_time'],
             vis.attrs['satellite_longitude'],
             vis.attrs['satellite_latitude'],
             vis.attrs['satellite_altitude'],
-            vis.attrs['start_time'],
-            lons, lats, 0)
-        satz = 90 - satel
+            vis.data.chunks)
         return sata, satz, suna, sunz
 
 
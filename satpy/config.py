@@ -25,9 +25,11 @@
 
 """SatPy Configuration directory and file handling
 """
+import copy
 import glob
 import logging
 import os
+import threading
 from collections import Mapping, OrderedDict
 
 from six.moves import configparser
@@ -132,6 +134,86 @@ def recursive_dict_update(d, u):
     return d
 
 
+def _config_signature(config_files):
+    """Get the identifying information of the on-disk state of *config_files*."""
+    signature = []
+    for config_file in config_files:
+        stat = os.stat(config_file)
+        signature.append((os.path.abspath(config_file), stat.st_mtime, stat.st_size))
+    return tuple(signature)
+
+
+class ConfigCache(object):
+    """Process-wide cache of objects built from configuration files.
+
+    Entries are identified by a user provided name and the list of
+    configuration files they were built from. Each entry remembers the
+    modification time and size of those files so that editing a file on disk
+    invalidates any cached object built from it.
+
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, name, config_files, builder, copy_result=True):
+        """Get the cached object for *name* and *config_files*.
+
+        Args:
+            name (hashable): Identifier of the kind of object being cached
+                (ex. the class creating the object).
+            config_files (iterable): Configuration filenames the object is
+                built from.
+            builder (callable): Called without arguments to create the object
+                when it is not cached or the configuration files changed.
+            copy_result (bool): Return a deep copy of the cached object so
+                the caller is free to modify it (default: True).
+
+        """
+        config_files = tuple(config_files)
+        key = (name, config_files)
+        signature = _config_signature(config_files)
+        with self._lock:
+            cached = self._entries.get(key)
+        if cached is not None and cached[0] == signature:
+            self.hits += 1
+            value = cached[1]
+        else:
+            self.misses += 1
+            value = builder()
+            with self._lock:
+                self._entries[key] = (signature, value)
+        if copy_result:
+            return copy.deepcopy(value)
+        return value
+
+    def discard(self, name, config_files):
+        """Forget the object cached for *name* and *config_files*.
+
+        Used when a cached object depends on other cached objects that were
+        rebuilt since it was created.
+
+        """
+        with self._lock:
+            self._entries.pop((name, tuple(config_files)), None)
+
+    def clear(self):
+        """Remove all cached objects and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+CONFIG_CACHE = ConfigCache()
+
+
 def check_yaml_configs(configs, key, hdr_len):
     """Get a diagnostic for the yaml *configs*.
 
@@ -228,6 +228,24 @@ class MultiScene(object):
         new_scenes = new_scenes if self.is_generator else list(new_scenes)
         return self.__class__(new_scenes)
 
+    def resample_many(self, destinations, **kwargs):
+        """Resample the multiscene to several destinations at once.
+
+        Every scene is resampled with :meth:`Scene.resample_many`, so the
+        source-side work is shared by all destinations.
+
+        .. note::
+
+            This iterates through generator-based scenes.
+
+        Returns: list of new multiscenes, one per destination
+
+        """
+        resampled = [scn.resample_many(destinations, **kwargs)
+                     for scn in self.scenes]
+        return [self.__class__([new_scenes[idx] for new_scenes in resampled])
+                for idx in range(len(destinations))]
+
     def blend(self, blend_function=stack):
         """Blend the datasets into one scene.
 
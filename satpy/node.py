@@ -22,7 +22,7 @@
 """Nodes to build trees."""
 
 from satpy import DatasetDict, DatasetID, DATASET_KEYS
-from satpy.readers import TooManyResults
+from satpy.readers import TooManyResults, get_key
 from satpy.utils import get_logger
 
 LOG = get_logger(__name__)
@@ -96,30 +96,69 @@ class Node(object):
             (" +" * previous) + str(self.name) + no_data + '\n' +
             ''.join([child.display(previous + 1) for child in self.children]))
 
+    def walk(self, unique=True, visited=None):
+        """Iterate over this node and all of its descendants depth-first.
+
+        Nodes are yielded before their children. When `unique` is True
+        every node is yielded once, even if it is the child of more than
+        one parent, and its children are only walked the first time.
+
+        Args:
+            unique (bool): only yield individual nodes once
+            visited (set, optional): `id` of nodes to skip when `unique` is
+                                     True, updated with the nodes yielded
+
+        """
+        if visited is None:
+            visited = set()
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if unique:
+                # names can change while composites are generated so
+                # compare the node objects themselves
+                if id(node) in visited:
+                    continue
+                visited.add(id(node))
+            yield node
+            stack.extend(reversed(node.children))
+
     def leaves(self, unique=True):
         """Get the leaves of the tree starting at this root."""
-        if not self.children:
-            return [self]
-        else:
-            res = list()
-            for child in self.children:
-                for sub_child in child.leaves(unique=unique):
-                    if not unique or sub_child not in res:
-                        res.append(sub_child)
-            return res
+        return [node for node in self.walk(unique=unique)
+                if not node.children]
 
     def trunk(self, unique=True):
         """Get the trunk of the tree starting at this root."""
-        # uniqueness is not correct in `trunk` yet
-        unique = False
+        return [node for node in self.walk(unique=unique)
+                if node.children and node.name is not None]
+
+    def postorder(self, visited=None):
+        """Get all nodes below this root with children before parents.
+
+        Every node appears once and after all of the nodes it depends on,
+        making this a topological order of the dependency graph.
+
+        Args:
+            visited (set, optional): `id` of nodes to skip, updated with the
+                                     nodes returned
+
+        """
+        if visited is None:
+            visited = set()
         res = []
-        if self.children:
-            if self.name is not None:
-                res.append(self)
-            for child in self.children:
-                for sub_child in child.trunk(unique=unique):
-                    if not unique or sub_child not in res:
-                        res.append(sub_child)
+        stack = [(self, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if expanded:
+                res.append(node)
+                continue
+            if id(node) in visited:
+                continue
+            visited.add(id(node))
+            stack.append((node, True))
+            stack.extend((child, False) for child in reversed(node.children)
+                         if id(child) not in visited)
         return res
 
 
@@ -154,6 +193,44 @@ class DependencyTree(Node):
         # keep a flat dictionary of nodes contained in the tree for better
         # __contains__
         self._all_nodes = DatasetDict()
+        # results of leaves/trunk queries, cleared when the tree changes
+        self._query_cache = {}
+
+    def _cached_query(self, kind, nodes, unique):
+        """Get the `kind` ('leaves', 'trunk' or 'postorder') nodes of the tree.
+
+        Results are cached until a node is added to the tree.
+
+        """
+        key = (kind, None if nodes is None else frozenset(nodes), unique)
+        try:
+            return list(self._query_cache[key])
+        except KeyError:
+            pass
+
+        if nodes is None:
+            roots = [self]
+        else:
+            roots = [self._all_nodes[child_id] for child_id in nodes]
+        res = []
+        visited = set()
+        if kind == 'postorder':
+            for root in roots:
+                res.extend(root.postorder(visited=visited))
+            return self._store_query(key, res)
+
+        for root in roots:
+            for node in root.walk(unique=unique, visited=visited):
+                if kind == 'leaves' and not node.children:
+                    res.append(node)
+                elif (kind == 'trunk' and node.children and
+                      node.name is not None):
+                    res.append(node)
+        return self._store_query(key, res)
+
+    def _store_query(self, key, res):
+        self._query_cache[key] = res
+        return list(res)
 
     def leaves(self, nodes=None, unique=True):
         """Get the leaves of the tree starting at this root.
@@ -166,15 +243,7 @@ class DependencyTree(Node):
             list of leaf nodes
 
         """
-        if nodes is None:
-            return super(DependencyTree, self).leaves(unique=unique)
-
-        res = list()
-        for child_id in nodes:
-            for sub_child in self._all_nodes[child_id].leaves(unique=unique):
-                if not unique or sub_child not in res:
-                    res.append(sub_child)
-        return res
+        return self._cached_query('leaves', nodes, unique)
 
     def trunk(self, nodes=None, unique=True):
         """Get the trunk nodes of the tree starting at this root.
@@ -188,15 +257,24 @@ class DependencyTree(Node):
             list of trunk nodes
 
         """
-        if nodes is None:
-            return super(DependencyTree, self).trunk(unique=unique)
+        return self._cached_query('trunk', nodes, unique)
 
-        res = list()
-        for child_id in nodes:
-            for sub_child in self._all_nodes[child_id].trunk(unique=unique):
-                if not unique or sub_child not in res:
-                    res.append(sub_child)
-        return res
+    def trunk_order(self, nodes=None):
+        """Get the trunk nodes in the order they should be generated.
+
+        Every trunk node comes after all of the trunk nodes it depends on so
+        composites can be generated by iterating over the result once.
+
+        Args:
+            nodes (iterable): limit trunk nodes to the names specified or the
+                              children of them that are also trunk nodes.
+
+        Returns:
+            list of trunk nodes
+
+        """
+        return [node for node in self._cached_query('postorder', nodes, True)
+                if node.children and node.name is not None]
 
     def add_child(self, parent, child):
         Node.add_child(parent, child)
@@ -206,6 +284,7 @@ class DependencyTree(Node):
         if self.contains(child.name):
             assert self._all_nodes[child.name] is child
         self._all_nodes[child.name] = child
+        self._query_cache.clear()
 
     def add_leaf(self, ds_id, parent=None):
         if parent is None:
@@ -224,11 +303,26 @@ class DependencyTree(Node):
         data. Theoretically it should be possible for tree copies to request
         compositor or modifier information as long as they don't depend on
         any datasets not already existing in the dependency tree.
+
+        Every `Node` is copied once, even if it has more than one parent,
+        since nodes are modified in place (ex. renamed when a composite is
+        generated). The data of the nodes is shared with the copy.
         """
         new_tree = DependencyTree({}, self.compositors, self.modifiers)
-        for c in self.children:
-            c = c.copy(node_cache=new_tree._all_nodes)
-            new_tree.add_child(new_tree, c)
+        copies = {}
+        # children are copied before their parents
+        for node in self.postorder():
+            if node is self:
+                continue
+            node_copy = Node(node.name, node.data)
+            for child in node.children:
+                Node.add_child(node_copy, copies[id(child)])
+            copies[id(node)] = node_copy
+        for child in self.children:
+            Node.add_child(new_tree, copies[id(child)])
+        for key, node in self._all_nodes.items():
+            if id(node) in copies:
+                new_tree._all_nodes[key] = copies[id(node)]
         return new_tree
 
     def __contains__(self, item):
@@ -461,6 +555,93 @@ class DependencyTree(Node):
 
         return node, unknowns
 
+    def _get_prerequisite_names(self, dataset_key):
+        """Get the required prerequisites of the composite *dataset_key*.
+
+        Unlike `get_compositor` modifiers are not instantiated, their
+        prerequisites are taken from their configured options.
+
+        """
+        for sensor_name in self.compositors.keys():
+            try:
+                compositor = self.compositors[sensor_name][dataset_key]
+            except KeyError:
+                continue
+            return compositor.attrs['prerequisites']
+
+        if isinstance(dataset_key, DatasetID) and dataset_key.modifiers:
+            modifier = dataset_key.modifiers[-1]
+            for modifiers in self.modifiers.values():
+                if modifier in modifiers:
+                    return modifiers[modifier][1].get('prerequisites', [])
+
+        raise KeyError("Could not find compositor '{}'".format(dataset_key))
+
+    def is_available(self, dataset_key, available_ids=None, checked=None):
+        """Check if *dataset_key* could be loaded or generated.
+
+        This is a lighter version of `find_dependencies`: no nodes are added
+        to the tree and modifiers are not instantiated. Only the required
+        prerequisites of composites are checked.
+
+        Args:
+            dataset_key (str, float, DatasetID): Dataset identifier to check
+            available_ids (DatasetIDIndex or iterable, optional): DatasetIDs
+                available from the readers. Defaults to every dataset the
+                readers can search for.
+            checked (dict, optional): Results of keys already checked,
+                                      updated with the keys checked by this
+                                      call. Reuse it when checking multiple
+                                      keys.
+
+        Returns:
+            bool
+
+        """
+        if checked is None:
+            checked = {}
+        try:
+            return checked[dataset_key]
+        except KeyError:
+            # don't loop forever on recursive configurations
+            checked[dataset_key] = False
+
+        checked[dataset_key] = res = self._is_available(
+            dataset_key, available_ids, checked)
+        return res
+
+    def _is_available(self, dataset_key, available_ids, checked):
+        if self.contains(dataset_key):
+            return True
+
+        try:
+            if available_ids is None:
+                if self._find_reader_dataset(dataset_key) is not None:
+                    return True
+            else:
+                get_key(dataset_key, available_ids)
+                return True
+        except TooManyResults:
+            return False
+        except KeyError:
+            pass
+
+        if dataset_key in self:
+            return True
+
+        if isinstance(dataset_key, DatasetID) and dataset_key.modifiers:
+            src_key = DatasetID(
+                *dataset_key[:-1] + (dataset_key.modifiers[:-1],))
+            if not self.is_available(src_key, available_ids, checked):
+                return False
+
+        try:
+            prereqs = self._get_prerequisite_names(dataset_key)
+        except KeyError:
+            return False
+        return all(self.is_available(prereq, available_ids, checked)
+                   for prereq in prereqs)
+
     def find_dependencies(self, dataset_keys, **dfilter):
         """Create the dependency tree.
 
@@ -29,8 +29,8 @@ import os
 import six
 import yaml
 
-from satpy.config import (config_search_paths, get_environ_config_dir,
-                          glob_config)
+from satpy.config import (CONFIG_CACHE, config_search_paths,
+                          get_environ_config_dir, glob_config)
 from satpy.dataset import DATASET_KEYS, DatasetID
 from satpy import CALIBRATION_ORDER
 
@@ -131,6 +131,11 @@ def filter_keys_by_dataset_id(did, key_container):
                     specific order.
 
     """
+    if isinstance(key_container, DatasetDict):
+        key_container = key_container.index
+    if isinstance(key_container, DatasetIDIndex):
+        return key_container.filter(did)
+
     keys = iter(key_container)
 
     for key in DATASET_KEYS:
@@ -148,6 +153,108 @@ def filter_keys_by_dataset_id(did, key_container):
     return keys
 
 
+class DatasetIDIndex(object):
+    """Secondary indexes over a collection of `DatasetID` objects.
+
+    Every indexed `DatasetID` is stored under each of its non-`None`
+    elements. Querying with `filter` then only intersects the groups of IDs
+    sharing the requested values instead of comparing every ID one element
+    at a time like `filter_keys_by_dataset_id` does for other containers.
+
+    Wavelengths are grouped by their full (min, nominal, max) interval so a
+    wavelength query only has to compare each distinct interval once.
+
+    """
+
+    def __init__(self, keys=None):
+        self._keys = set()
+        self._indexes = dict((key, {}) for key in DATASET_KEYS)
+        for ds_id in keys or []:
+            self.add(ds_id)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __contains__(self, item):
+        return item in self._keys
+
+    def add(self, ds_id):
+        """Add `ds_id` to the indexes.
+
+        Keys that are not `DatasetID` objects can't be queried and are
+        ignored.
+
+        """
+        if not isinstance(ds_id, DatasetID) or ds_id in self._keys:
+            return
+        self._keys.add(ds_id)
+        for key, value in zip(DATASET_KEYS, ds_id):
+            if value is not None:
+                self._indexes[key].setdefault(value, set()).add(ds_id)
+
+    def copy(self):
+        """Copy the indexes without indexing every key again."""
+        new_index = self.__class__()
+        new_index._keys = self._keys.copy()
+        for key, index in self._indexes.items():
+            new_index._indexes[key] = dict(
+                (value, ds_ids.copy()) for value, ds_ids in index.items())
+        return new_index
+
+    def discard(self, ds_id):
+        """Remove `ds_id` from the indexes if it is present."""
+        if ds_id not in self._keys:
+            return
+        self._keys.remove(ds_id)
+        for key, value in zip(DATASET_KEYS, ds_id):
+            if value is None:
+                continue
+            ds_ids = self._indexes[key][value]
+            ds_ids.discard(ds_id)
+            if not ds_ids:
+                del self._indexes[key][value]
+
+    def clear(self):
+        """Remove all indexed keys."""
+        self._keys.clear()
+        for index in self._indexes.values():
+            index.clear()
+
+    def _matching(self, key, value):
+        index = self._indexes[key]
+        if key != "wavelength":
+            return index.get(value, set())
+        matches = set()
+        for wavelength, ds_ids in index.items():
+            if DatasetID.wavelength_match(wavelength, value):
+                matches |= ds_ids
+        return matches
+
+    def filter(self, did):
+        """Get the indexed keys matching the provided `DatasetID`.
+
+        See `filter_keys_by_dataset_id` for the matching rules.
+
+        Returns (list): Sorted list of the matching keys.
+
+        """
+        candidates = None
+        for key in DATASET_KEYS:
+            value = getattr(did, key)
+            if value is None:
+                continue
+            matches = self._matching(key, value)
+            candidates = matches if candidates is None else candidates & matches
+            if not candidates:
+                return []
+        if candidates is None:
+            candidates = self._keys
+        return sorted(candidates)
+
+
 def get_key(key, key_container, num_results=1, best=True,
             resolution=None, calibration=None, polarization=None,
             level=None, modifiers=None):
@@ -261,6 +368,18 @@ class DatasetDict(dict):
 
     def __init__(self, *args, **kwargs):
         super(DatasetDict, self).__init__(*args, **kwargs)
+        self.index = DatasetIDIndex(super(DatasetDict, self).keys())
+
+    def __reduce__(self):
+        # the index is rebuilt from the items when unpickled or copied
+        return self.__class__, (dict(self), )
+
+    def copy(self):
+        """Shallow copy reusing the index of this dictionary."""
+        new_dict = self.__class__.__new__(self.__class__)
+        super(DatasetDict, new_dict).__init__(self)
+        new_dict.index = self.index.copy()
+        return new_dict
 
     def keys(self, names=False, wavelengths=False):
         # sort keys so things are a little more deterministic (.keys() is not)
@@ -288,7 +407,7 @@ class DatasetDict(dict):
             **dfilter (dict): See `get_key` function for more information.
 
         """
-        return get_key(match_key, self.keys(), num_results=num_results,
+        return get_key(match_key, self.index, num_results=num_results,
                        best=best, **dfilter)
 
     def getitem(self, item):
@@ -356,7 +475,38 @@ class DatasetDict(dict):
             if "wavelength" in d and d["wavelength"] != key.wavelength:
                 raise TypeError("Can't change the wavelength of a dataset")
 
-        return super(DatasetDict, self).__setitem__(key, value)
+        super(DatasetDict, self).__setitem__(key, value)
+        self.index.add(key)
+
+    def update(self, *args, **kwargs):
+        """Update the dictionary without modifying the values."""
+        other = dict(*args, **kwargs)
+        super(DatasetDict, self).update(other)
+        for key in other:
+            self.index.add(key)
+
+    def setdefault(self, key, default=None):
+        """Get the value of `key`, setting it to `default` if missing."""
+        value = super(DatasetDict, self).setdefault(key, default)
+        self.index.add(key)
+        return value
+
+    def pop(self, key, *args):
+        """Remove `key` and return its value."""
+        value = super(DatasetDict, self).pop(key, *args)
+        self.index.discard(key)
+        return value
+
+    def popitem(self):
+        """Remove and return an arbitrary item."""
+        key, value = super(DatasetDict, self).popitem()
+        self.index.discard(key)
+        return key, value
+
+    def clear(self):
+        """Remove all items."""
+        super(DatasetDict, self).clear()
+        self.index.clear()
 
     def contains(self, item):
         """Check contains when we know the *exact* DatasetID."""
@@ -372,20 +522,31 @@ class DatasetDict(dict):
     def __delitem__(self, key):
         try:
             # short circuit - try to get the object without more work
-            return super(DatasetDict, self).__delitem__(key)
+            super(DatasetDict, self).__delitem__(key)
         except KeyError:
             key = self.get_key(key)
-            return super(DatasetDict, self).__delitem__(key)
-
+            super(DatasetDict, self).__delitem__(key)
+        self.index.discard(key)
 
-def read_reader_config(config_files, loader=yaml.Loader):
-    """Read the reader `config_files` and return the info extracted."""
 
+def _read_reader_config(config_files, loader):
     conf = {}
     LOG.debug('Reading %s', str(config_files))
     for config_file in config_files:
         with open(config_file) as fd:
             conf.update(yaml.load(fd.read(), loader))
+    return conf
+
+
+def read_reader_config(config_files, loader=yaml.Loader):
+    """Read the reader `config_files` and return the info extracted.
+
+    Parsed configurations are cached process-wide (see
+    `satpy.config.CONFIG_CACHE`) until one of the files is modified.
+
+    """
+    conf = CONFIG_CACHE.get(('reader_info', loader), config_files,
+                            lambda: _read_reader_config(config_files, loader))
 
     try:
         reader_info = conf['reader']
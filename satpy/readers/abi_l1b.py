@@ -45,21 +45,40 @@ PLATFORM_NAMES = {
 
 class NC_ABI_L1B(BaseFileHandler):
 
+    file_handle_attributes = ('nc', )
+
     def __init__(self, filename, filename_info, filetype_info):
         super(NC_ABI_L1B, self).__init__(filename, filename_info,
                                          filetype_info)
-        # xarray's default netcdf4 engine
-        self.nc = xr.open_dataset(self.filename,
-                                  decode_cf=True,
-                                  mask_and_scale=False,
-                                  chunks={'x': CHUNK_SIZE, 'y': CHUNK_SIZE})
-        self.nc = self.nc.rename({'t': 'time'})
+        self.reopen(refresh=True)
         platform_shortname = filename_info['platform_shortname']
         self.platform_name = PLATFORM_NAMES.get(platform_shortname)
         self.sensor = 'abi'
         self.nlines, self.ncols = self.nc["Rad"].shape
         self.coords = {}
 
+    def _open_dataset(self):
+        # xarray's default netcdf4 engine
+        nc = xr.open_dataset(self.filename,
+                             decode_cf=True,
+                             mask_and_scale=False,
+                             chunks={'x': CHUNK_SIZE, 'y': CHUNK_SIZE})
+        return nc.rename({'t': 'time'})
+
+    def reopen(self, refresh=False):
+        """Open the file, or get it if it is open in this process already."""
+        self.nc = self.open_shared('abi_l1b', self._open_dataset, refresh)
+
+    def close(self):
+        """Release the file, it is opened again if the file handler is used.
+
+        The file is closed once the data loaded from it is gone.
+        """
+        nc = self.__dict__.pop('nc', None)
+        if nc is not None:
+            self.release_shared('abi_l1b', nc)
+        self.coords = {}
+
     def __getitem__(self, item):
         """Wrapper around `self.nc[item]`.
 
@@ -100,10 +119,10 @@ class NC_ABI_L1B(BaseFileHandler):
         """Get the shape of the data."""
         return self.nlines, self.ncols
 
-    def get_dataset(self, key, info):
+    def get_dataset(self, key, info, xslice=slice(None), yslice=slice(None)):
         """Load a dataset."""
         logger.debug('Reading in get_dataset %s.', key.name)
-        radiances = self['Rad']
+        radiances = self['Rad'][yslice, xslice]
 
         if key.calibration == 'reflectance':
             logger.debug("Calibrating to reflectances")
@@ -215,9 +234,3 @@ class NC_ABI_L1B(BaseFileHandler):
     @property
     def end_time(self):
         return datetime.strptime(self.nc.attrs['time_coverage_end'], '%Y-%m-%dT%H:%M:%S.%fZ')
-
-    def __del__(self):
-        try:
-            self.nc.close()
-        except (IOError, OSError):
-            pass
@@ -49,7 +49,9 @@ import xarray as xr
 from pyresample import geometry
 from satpy import CHUNK_SIZE
 from satpy.readers.file_handlers import BaseFileHandler
-from satpy.readers.utils import get_geostationary_angle_extent, np2str
+from satpy.readers.utils import (get_geostationary_angle_extent,
+                                 get_geostationary_segment_bounding_box,
+                                 np2str)
 
 AHI_CHANNEL_NAMES = ("1", "2", "3", "4", "5",
                      "6", "7", "8", "9", "10",
@@ -220,6 +222,46 @@ _SPARE_TYPE = np.dtype([
 ])
 
 
+# 8 Navigation correction data
+_NAVIGATION_CORRECTION_SUBINFO_TYPE = np.dtype([
+    ("line_number_after_rotation", "<u2"),
+    ("shift_amount_for_column_direction", "f4"),
+    ("shift_amount_for_line_direction", "f4"),
+])
+
+# 9 Observation time data
+_OBSERVATION_LINE_TIME_INFO_TYPE = np.dtype([
+    ("line_number", "<u2"),
+    ("observation_time", "f8"),
+])
+
+# 10 Error information data
+_ERROR_LINE_INFO_TYPE = np.dtype([
+    ("line_number", "<u2"),
+    ("numof_error_pixels_per_line", "<u2"),
+])
+
+
+class _HeaderBuffer(object):
+    """Sequential reader of the header blocks from a memory mapped file."""
+
+    def __init__(self, buf):
+        self.buf = buf
+        self.offset = 0
+
+    def read(self, dtype, count=1):
+        """Read *count* records of *dtype* at the current offset."""
+        count = int(count)
+        records = np.frombuffer(self.buf, dtype=dtype, count=count,
+                                offset=self.offset).copy()
+        self.offset += dtype.itemsize * count
+        return records
+
+    def skip(self, nbytes):
+        """Skip *nbytes* bytes."""
+        self.offset += nbytes
+
+
 class AHIHSDFileHandler(BaseFileHandler):
     """AHI standard format reader."""
 
@@ -232,25 +274,16 @@ class AHIHSDFileHandler(BaseFileHandler):
         self.units = dict([(i, 'counts') for i in AHI_CHANNEL_NAMES])
 
         self._data = dict([(i, None) for i in AHI_CHANNEL_NAMES])
-        self._header = dict([(i, None) for i in AHI_CHANNEL_NAMES])
         self.lons = None
         self.lats = None
         self.segment_number = filename_info['segment_number']
         self.total_segments = filename_info['total_segments']
 
-        with open(self.filename) as fd:
-            self.basic_info = np.fromfile(fd,
-                                          dtype=_BASIC_INFO_TYPE,
-                                          count=1)
-            self.data_info = np.fromfile(fd,
-                                         dtype=_DATA_INFO_TYPE,
-                                         count=1)
-            self.proj_info = np.fromfile(fd,
-                                         dtype=_PROJ_INFO_TYPE,
-                                         count=1)[0]
-            self.nav_info = np.fromfile(fd,
-                                        dtype=_NAV_INFO_TYPE,
-                                        count=1)[0]
+        self._header, self._data_offset = self._read_header()
+        self.basic_info = self._header['block1']
+        self.data_info = self._header['block2']
+        self.proj_info = self._header['block3'][0]
+        self.nav_info = self._header['block4'][0]
         self.platform_name = np2str(self.basic_info['satellite'])
         self.observation_area = np2str(self.basic_info['observation_area'])
         self.sensor = 'ahi'
@@ -269,8 +302,17 @@ class AHIHSDFileHandler(BaseFileHandler):
         timeline = "{:04d}".format(self.basic_info['observation_timeline'][0])
         return self.start_time.replace(hour=int(timeline[:2]), minute=int(timeline[2:4]), second=0, microsecond=0)
 
-    def get_dataset(self, key, info):
-        return self.read_band(key, info)
+    def get_dataset(self, key, info, xslice=slice(None), yslice=slice(None)):
+        return self.read_band(key, info, xslice=xslice, yslice=yslice)
+
+    def get_segment_area_def(self):
+        """Get the area of the segment from the header."""
+        return self.get_area_def(None)
+
+    def get_bounding_box(self):
+        """Get the lon/lat bounding box of the segment."""
+        return get_geostationary_segment_bounding_box(
+            self.get_segment_area_def())
 
     def get_area_def(self, dsid):
         del dsid
@@ -347,90 +389,73 @@ class AHIHSDFileHandler(BaseFileHandler):
                               dtype=np.float, chunks=CHUNK_SIZE)
         return ellipse(lines_idx[:, None], cols_idx[None, :])
 
-    def read_band(self, key, info):
-        """Read the data."""
-        tic = datetime.now()
+    def _read_header(self):
+        """Read all the header blocks of the file.
+
+        The file is memory mapped and each block, including the variable
+        length navigation correction, observation time and error
+        information data, is read with a single structured array read.
+
+        Returns:
+            The header blocks and the offset of the image data in the file.
+
+        """
+        hdr = _HeaderBuffer(np.memmap(self.filename, mode='r', dtype=np.uint8))
         header = {}
-        with open(self.filename, "rb") as fp_:
-
-            header['block1'] = np.fromfile(
-                fp_, dtype=_BASIC_INFO_TYPE, count=1)
-            header["block2"] = np.fromfile(fp_, dtype=_DATA_INFO_TYPE, count=1)
-            header["block3"] = np.fromfile(fp_, dtype=_PROJ_INFO_TYPE, count=1)
-            header["block4"] = np.fromfile(fp_, dtype=_NAV_INFO_TYPE, count=1)
-            header["block5"] = np.fromfile(fp_, dtype=_CAL_INFO_TYPE, count=1)
-            logger.debug("Band number = " +
-                         str(header["block5"]['band_number'][0]))
-            logger.debug('Time_interval: %s - %s',
-                         str(self.start_time), str(self.end_time))
-            band_number = header["block5"]['band_number'][0]
-            if band_number < 7:
-                cal = np.fromfile(fp_, dtype=_VISCAL_INFO_TYPE, count=1)
-            else:
-                cal = np.fromfile(fp_, dtype=_IRCAL_INFO_TYPE, count=1)
-
-            header['calibration'] = cal
-
-            header["block6"] = np.fromfile(
-                fp_, dtype=_INTER_CALIBRATION_INFO_TYPE, count=1)
-            header["block7"] = np.fromfile(
-                fp_, dtype=_SEGMENT_INFO_TYPE, count=1)
-            header["block8"] = np.fromfile(
-                fp_, dtype=_NAVIGATION_CORRECTION_INFO_TYPE, count=1)
-            # 8 The navigation corrections:
-            ncorrs = header["block8"]['numof_correction_info_data'][0]
-            dtype = np.dtype([
-                ("line_number_after_rotation", "<u2"),
-                ("shift_amount_for_column_direction", "f4"),
-                ("shift_amount_for_line_direction", "f4"),
-            ])
-            corrections = []
-            for i in range(ncorrs):
-                corrections.append(np.fromfile(fp_, dtype=dtype, count=1))
-            fp_.seek(40, 1)
-            header['navigation_corrections'] = corrections
-            header["block9"] = np.fromfile(fp_,
-                                           dtype=_OBS_TIME_INFO_TYPE,
-                                           count=1)
-            numobstimes = header["block9"]['number_of_observation_times'][0]
-
-            dtype = np.dtype([
-                ("line_number", "<u2"),
-                ("observation_time", "f8"),
-            ])
-            lines_and_times = []
-            for i in range(numobstimes):
-                lines_and_times.append(np.fromfile(fp_,
-                                                   dtype=dtype,
-                                                   count=1))
-            header['observation_time_information'] = lines_and_times
-            fp_.seek(40, 1)
-
-            header["block10"] = np.fromfile(fp_,
-                                            dtype=_ERROR_INFO_TYPE,
-                                            count=1)
-            dtype = np.dtype([
-                ("line_number", "<u2"),
-                ("numof_error_pixels_per_line", "<u2"),
-            ])
-            num_err_info_data = header["block10"][
-                'number_of_error_info_data'][0]
-            err_info_data = []
-            for i in range(num_err_info_data):
-                err_info_data.append(np.fromfile(fp_, dtype=dtype, count=1))
-            header['error_information_data'] = err_info_data
-            fp_.seek(40, 1)
-
-            np.fromfile(fp_, dtype=_SPARE_TYPE, count=1)
-
-            nlines = int(header["block2"]['number_of_lines'][0])
-            ncols = int(header["block2"]['number_of_columns'][0])
-
-            res = da.from_array(np.memmap(self.filename, offset=fp_.tell(),
-                                          dtype='<u2',  shape=(nlines, ncols), mode='r'),
-                                chunks=CHUNK_SIZE)
+        header['block1'] = hdr.read(_BASIC_INFO_TYPE)
+        header["block2"] = hdr.read(_DATA_INFO_TYPE)
+        header["block3"] = hdr.read(_PROJ_INFO_TYPE)
+        header["block4"] = hdr.read(_NAV_INFO_TYPE)
+        header["block5"] = hdr.read(_CAL_INFO_TYPE)
+        band_number = header["block5"]['band_number'][0]
+        if band_number < 7:
+            header['calibration'] = hdr.read(_VISCAL_INFO_TYPE)
+        else:
+            header['calibration'] = hdr.read(_IRCAL_INFO_TYPE)
+        header["block6"] = hdr.read(_INTER_CALIBRATION_INFO_TYPE)
+        header["block7"] = hdr.read(_SEGMENT_INFO_TYPE)
+        header["block8"] = hdr.read(_NAVIGATION_CORRECTION_INFO_TYPE)
+        # 8 The navigation corrections:
+        ncorrs = header["block8"]['numof_correction_info_data'][0]
+        header['navigation_corrections'] = hdr.read(
+            _NAVIGATION_CORRECTION_SUBINFO_TYPE, count=ncorrs)
+        hdr.skip(40)
+        header["block9"] = hdr.read(_OBS_TIME_INFO_TYPE)
+        numobstimes = header["block9"]['number_of_observation_times'][0]
+        header['observation_time_information'] = hdr.read(
+            _OBSERVATION_LINE_TIME_INFO_TYPE, count=numobstimes)
+        hdr.skip(40)
+        header["block10"] = hdr.read(_ERROR_INFO_TYPE)
+        num_err_info_data = header["block10"]['number_of_error_info_data'][0]
+        header['error_information_data'] = hdr.read(
+            _ERROR_LINE_INFO_TYPE, count=num_err_info_data)
+        hdr.skip(40)
+        hdr.skip(_SPARE_TYPE.itemsize)
+        return header, hdr.offset
+
+    def read_band(self, key, info, xslice=slice(None), yslice=slice(None)):
+        """Read the data.
+
+        Only the lines of *yslice* are read from the file.
+        """
+        tic = datetime.now()
+        header = self._header
+        logger.debug("Band number = " +
+                     str(header["block5"]['band_number'][0]))
+        logger.debug('Time_interval: %s - %s',
+                     str(self.start_time), str(self.end_time))
+
+        nlines = int(header["block2"]['number_of_lines'][0])
+        ncols = int(header["block2"]['number_of_columns'][0])
+
+        first_line, last_line = yslice.indices(nlines)[:2]
+        offset = self._data_offset + first_line * ncols * 2
+        res = da.from_array(np.memmap(self.filename, offset=offset, dtype='<u2',
+                                      shape=(last_line - first_line, ncols),
+                                      mode='r'),
+                            chunks=CHUNK_SIZE)
+        res = res[::yslice.step, xslice]
         res = da.where(res == 65535, np.float32(np.nan), res)
-        self._header = header
 
         logger.debug("Reading time " + str(datetime.now() - tic))
         res = self.calibrate(res, key.calibration)
@@ -452,7 +477,7 @@ class AHIHSDFileHandler(BaseFileHandler):
         res = xr.DataArray(res, attrs=new_info, dims=['y', 'x'])
         res = res.where(header['block5']["count_value_outside_scan_pixels"][0] != res)
         res = res.where(header['block5']["count_value_error_pixels"][0] != res)
-        res = res.where(self.geo_mask())
+        res = res.where(self.geo_mask()[yslice, xslice])
         return res
 
     def calibrate(self, data, calibration):
@@ -31,7 +31,9 @@ import h5py
 import xarray as xr
 import logging
 
+from satpy.dataset import DatasetID
 from satpy.readers.file_handlers import BaseFileHandler
+from satpy.readers.utils import get_geostationary_segment_bounding_box
 
 logger = logging.getLogger(__name__)
 
@@ -105,7 +107,7 @@ class FCIFDHSIFileHandler(BaseFileHandler):
         self.endline = int(measured['end_position_row'][...])
         self.startcol = int(measured['start_position_column'][...])
         self.endcol = int(measured['end_position_column'][...])
-        self.nlines, self.ncols = variable[:].shape
+        self.nlines, self.ncols = variable.shape
 
         logger.debug('Channel {} resolution: {}'.format(key.name, chkres))
         logger.debug('Row/Cols: {} / {}'.format(self.nlines, self.ncols))
@@ -129,6 +131,27 @@ class FCIFDHSIFileHandler(BaseFileHandler):
                       5429229.5285458621, startl)
         return(chk_extent)
 
+    def get_segment_area_def(self):
+        """Get the area of the chunk.
+
+        The rows covered by the chunk are taken from the position attributes
+        of its first channel, the chunks being full disk wide.
+        """
+        resolutions = {22272: 500, 11136: 1000, 5568: 2000}
+        for name in self.nc['/data']:
+            measured = '/data/{}/measured'.format(name)
+            if measured + '/effective_radiance' not in self.nc:
+                continue
+            ncols = self.nc[measured + '/effective_radiance'].shape[1]
+            key = DatasetID(name=name, resolution=resolutions[ncols])
+            return self.get_area_def(key)
+        raise NotImplementedError("No channel in " + str(self.filename))
+
+    def get_bounding_box(self):
+        """Get the lon/lat bounding box of the chunk."""
+        return get_geostationary_segment_bounding_box(
+            self.get_segment_area_def())
+
     def get_area_def(self, key, info=None):
         """Calculate on-fly area definition for 0 degree geos-projection
         for a dataset
@@ -20,7 +20,11 @@
 # You should have received a copy of the GNU General Public License along with
 # satpy.  If not, see <http://www.gnu.org/licenses/>.
 
+import os
+import threading
 from abc import ABCMeta
+from collections import MutableMapping, OrderedDict
+from weakref import WeakValueDictionary
 
 import numpy as np
 import six
@@ -32,7 +36,244 @@ from satpy.dataset import combine_metadata
 # what about file pattern and config ?
 
 
+class FileHandlePool(object):
+    """Bounded pool of open file objects shared by file handlers.
+
+    Opening a file and parsing its header can be expensive so file handlers
+    accessing the same file many times can keep the opened object in this
+    pool instead of reopening it every time. When more than `max_size`
+    objects are open the least recently used one is closed.
+
+    Keys are tuples whose first element is the filename, the other elements
+    identify how the file was opened (ex. the group of a NetCDF file).
+
+    """
+
+    def __init__(self, max_size=16):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._handles = OrderedDict()
+        self._lock = threading.RLock()
+        self._pid = os.getpid()
+
+    def __len__(self):
+        return len(self._handles)
+
+    def _check_pid(self):
+        # handles inherited from the parent of a forked process can't be
+        # used (or closed) safely, forget them
+        if self._pid != os.getpid():
+            self._handles = OrderedDict()
+            self._pid = os.getpid()
+
+    def __contains__(self, key):
+        return key in self._handles
+
+    def get(self, key, opener):
+        """Get the open file object for `key`.
+
+        Args:
+            key (tuple): Filename followed by any other hashable objects
+                identifying the file object.
+            opener (callable): Called without arguments to open the file if
+                it isn't in the pool already.
+
+        """
+        with self._lock:
+            self._check_pid()
+            try:
+                handle = self._handles.pop(key)
+                self.hits += 1
+            except KeyError:
+                handle = opener()
+                self.misses += 1
+            # (re)insert as the most recently used handle
+            self._handles[key] = handle
+            while len(self._handles) > self.max_size:
+                _, old_handle = self._handles.popitem(last=False)
+                old_handle.close()
+        return handle
+
+    def close(self, filename=None):
+        """Close the open file objects of `filename` or all of them."""
+        with self._lock:
+            self._check_pid()
+            for key in list(self._handles.keys()):
+                if filename is None or key[0] == filename:
+                    self._handles.pop(key).close()
+
+    def reset_stats(self):
+        """Reset the hit and miss counters."""
+        self.hits = 0
+        self.misses = 0
+
+
+class ProcessFileHandles(object):
+    """Open file objects shared by the file handlers of a process.
+
+    Contrary to `FileHandlePool`, file objects are never closed here: they
+    are kept as long as a file handler uses them, plus the `max_recent` most
+    recently requested ones, and are closed by the garbage collector when
+    they aren't referenced anymore. This is what file handlers unpickled by
+    `dask.distributed` workers use to reopen their files, so that the many
+    copies of a file handler in a worker process share a single file object.
+
+    After a fork the file objects of the parent process are forgotten.
+
+    """
+
+    def __init__(self, max_recent=16):
+        self.max_recent = max_recent
+        self.hits = 0
+        self.misses = 0
+        self._handles = WeakValueDictionary()
+        self._recent = OrderedDict()
+        self._lock = threading.RLock()
+        self._pid = os.getpid()
+
+    def __len__(self):
+        return len(self._handles)
+
+    def __contains__(self, key):
+        return key in self._handles
+
+    def get(self, key, opener, refresh=False):
+        """Get the file object for `key`, calling `opener` if needed.
+
+        Args:
+            key (tuple): Filename followed by any other hashable objects
+                identifying the file object.
+            opener (callable): Called without arguments to open the file if
+                it isn't open in this process already.
+            refresh (bool): Open the file again even if it is open already,
+                the new file object replaces the old one for the next calls.
+
+        """
+        with self._lock:
+            if self._pid != os.getpid():
+                self._handles = WeakValueDictionary()
+                self._recent = OrderedDict()
+                self._pid = os.getpid()
+            handle = None if refresh else self._handles.get(key)
+            if handle is None:
+                handle = self._handles[key] = opener()
+                self.misses += 1
+            else:
+                self.hits += 1
+            self._recent.pop(key, None)
+            self._recent[key] = handle
+            while len(self._recent) > self.max_recent:
+                self._recent.popitem(last=False)
+        return handle
+
+    def discard(self, key, handle):
+        """Forget `handle` if it is the file object stored for `key`.
+
+        The file object is closed by the garbage collector once the objects
+        read from it are gone.
+        """
+        with self._lock:
+            if self._handles.get(key) is handle:
+                del self._handles[key]
+            if self._recent.get(key) is handle:
+                del self._recent[key]
+
+    def clear(self):
+        """Forget the file objects not used by any file handler."""
+        with self._lock:
+            self._recent.clear()
+
+    def reset_stats(self):
+        """Reset the hit and miss counters."""
+        self.hits = 0
+        self.misses = 0
+
+
+FILE_HANDLES = ProcessFileHandles()
+
+
+class LazyFileContent(MutableMapping):
+    """File content mapping whose keys are read from the file when requested.
+
+    File handlers like `HDF5FileHandler` normally walk a whole file when
+    they are created to store every variable, attribute, shape and dtype in
+    a flat `file_content` dictionary. This mapping can be used instead to
+    only look up the keys that are actually requested. Values (and keys
+    missing from the file) are memoized.
+
+    Args:
+        resolve (callable): Called with a key to get its value from the
+            file. Must raise `KeyError` if the key isn't in the file.
+        collect (callable): Called to store every key of the file in this
+            mapping. This is only needed when the mapping is iterated over or
+            its length is requested.
+
+    """
+
+    def __init__(self, resolve, collect):
+        self._resolve = resolve
+        self._collect = collect
+        self._content = {}
+        self._missing = set()
+        self._complete = False
+
+    def __getitem__(self, key):
+        try:
+            return self._content[key]
+        except KeyError:
+            if self._complete or key in self._missing:
+                raise
+        try:
+            value = self._content[key] = self._resolve(key)
+        except KeyError:
+            self._missing.add(key)
+            raise
+        return value
+
+    def __setitem__(self, key, value):
+        self._missing.discard(key)
+        self._content[key] = value
+
+    def __delitem__(self, key):
+        del self._content[key]
+        self._missing.add(key)
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self):
+        self._collect_all()
+        return iter(self._content)
+
+    def __len__(self):
+        self._collect_all()
+        return len(self._content)
+
+    def _collect_all(self):
+        if not self._complete:
+            self._collect()
+            self._complete = True
+
+
 class BaseFileHandler(six.with_metaclass(ABCMeta, object)):
+    """Base class for the file handlers of the readers.
+
+    File handlers are pickled to run their dask graphs on other processes
+    (ex. with `dask.distributed`). File handlers keeping open file objects
+    list the attributes holding them in `file_handle_attributes`: these are
+    left out of the pickled state and the file handler's :meth:`reopen`
+    method is called to set them again once it is unpickled, or when they
+    are used again after the file handler was closed.
+
+    """
+
+    #: Names of the attributes holding objects opened from the file
+    file_handle_attributes = ()
 
     def __init__(self, filename, filename_info, filetype_info):
         self.filename = str(filename)
@@ -47,6 +288,63 @@ class BaseFileHandler(six.with_metaclass(ABCMeta, object)):
     def __repr__(self):
         return str(self)
 
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for attr in self.file_handle_attributes:
+            state.pop(attr, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.file_handle_attributes:
+            self.reopen()
+
+    def __getattr__(self, name):
+        # file objects dropped by close() are opened again when needed
+        if name in self.file_handle_attributes and 'filename' in self.__dict__:
+            self.reopen()
+            return self.__dict__[name]
+        raise AttributeError("'{}' object has no attribute '{}'".format(
+            self.__class__.__name__, name))
+
+    def reopen(self, refresh=False):
+        """Set the attributes of `file_handle_attributes`.
+
+        This is called with `refresh=False` when the file handler is
+        unpickled. Implementations should get their file objects with
+        :meth:`open_shared` so that they are opened once per process.
+        """
+        raise NotImplementedError
+
+    def open_shared(self, kind, opener, refresh=False):
+        """Get the object opened from the file by `opener`.
+
+        The object is shared with the other file handlers of this process
+        opening the same file in the same way.
+
+        Args:
+            kind (str): Identifies how the file is opened by `opener`.
+            opener (callable): Called without arguments to open the file if
+                it isn't open in this process already.
+            refresh (bool): Open the file again, typically when the file
+                handler is created and the file may have changed since it
+                was opened by another file handler.
+
+        """
+        return FILE_HANDLES.get((self.filename, kind), opener, refresh)
+
+    def release_shared(self, kind, handle):
+        """Stop sharing `handle`, the object returned by :meth:`open_shared`.
+
+        The object isn't kept for the other file handlers of this process
+        anymore, it is closed once nothing references it.
+        """
+        FILE_HANDLES.discard((self.filename, kind), handle)
+
+    def close(self):
+        """Close any file objects kept open by this file handler."""
+        pass
+
     def get_dataset(self, dataset_id, ds_info, out=None,
                     xslice=slice(None), yslice=slice(None)):
         raise NotImplementedError
@@ -54,6 +352,14 @@ class BaseFileHandler(six.with_metaclass(ABCMeta, object)):
     def get_area_def(self, dsid):
         raise NotImplementedError
 
+    def get_segment_area_def(self):
+        """Get the area covered by the file, from its header only.
+
+        Readers of segmented geostationary data implement this so that the
+        segments outside the area to load are discarded before reading data.
+        """
+        raise NotImplementedError
+
     def get_bounding_box(self):
         """Get the bounding box of the files, as a (lons, lats) tuple.
 
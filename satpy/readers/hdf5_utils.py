@@ -26,37 +26,147 @@
 
 """
 import logging
+from functools import partial
+
 import h5py
 import numpy as np
 import six
 import xarray as xr
 import dask.array as da
 
-from satpy.readers.file_handlers import BaseFileHandler
+from satpy.readers.file_handlers import (FILE_HANDLES, BaseFileHandler,
+                                         FileHandlePool, LazyFileContent)
 from satpy.readers.utils import np2str
 from satpy import CHUNK_SIZE
 
 LOG = logging.getLogger(__name__)
 
+# HDF5 files opened to read the metadata of HDF5FileHandlers lazily
+FILE_POOL = FileHandlePool()
+
+
+class HDF5DatasetProxy(object):
+    """Picklable stand-in for a `h5py.Dataset` to make dask arrays from.
+
+    h5py objects can't be pickled, so the dask arrays made from them can't
+    be computed on other processes. The proxy only pickles the filename and
+    the name of the dataset, and reopens the file with
+    :data:`~satpy.readers.file_handlers.FILE_HANDLES` when it is read after
+    being unpickled.
+    """
+
+    def __init__(self, dataset):
+        self.filename = dataset.file.filename
+        self.name = dataset.name
+        self.shape = dataset.shape
+        self.dtype = dataset.dtype
+        self.ndim = dataset.ndim
+        self.chunks = dataset.chunks
+        self._file = dataset.file
+        self._dataset = dataset
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_file'] = state['_dataset'] = None
+        return state
+
+    def __getitem__(self, key):
+        if self._dataset is None:
+            self._file = FILE_HANDLES.get((self.filename, 'h5py'),
+                                          partial(h5py.File, self.filename,
+                                                  'r'))
+            self._dataset = self._file[self.name]
+        return self._dataset[key]
+
 
 class HDF5FileHandler(BaseFileHandler):
     """Small class for inspecting a HDF5 file and retrieve its metadata/header data.
+
+    With `lazy_metadata=True` (or `lazy_metadata: True` in the file type
+    configuration) the file isn't walked when the file handler is created,
+    each item is read from the file the first time it is requested instead.
+
+    The h5py objects of the file content can't be pickled: the file content
+    is left out of the pickled state and read lazily from the file once the
+    file handler is unpickled.
     """
 
-    def __init__(self, filename, filename_info, filetype_info):
+    file_handle_attributes = ('file_content', )
+
+    def __init__(self, filename, filename_info, filetype_info,
+                 lazy_metadata=None):
         super(HDF5FileHandler, self).__init__(
             filename, filename_info, filetype_info)
-        self.file_content = {}
+        if lazy_metadata is None and isinstance(filetype_info, dict):
+            lazy_metadata = filetype_info.get('lazy_metadata', False)
+        if lazy_metadata:
+            # fail early on unreadable files like the eager mode does
+            self._get_file_handle()
+            self.file_content = LazyFileContent(self._resolve_content_key,
+                                                self._collect_file_content)
+        else:
+            self.file_content = {}
+            file_handle = self._open_file()
+            file_handle.visititems(self.collect_metadata)
+            self._collect_attrs('', file_handle.attrs)
+            file_handle.close()
+
+    def _open_file(self):
         try:
-            file_handle = h5py.File(self.filename, 'r')
+            return h5py.File(self.filename, 'r')
         except IOError:
             LOG.exception(
                 'Failed reading file %s. Possibly corrupted file', self.filename)
             raise
 
+    def _get_file_handle(self):
+        return FILE_POOL.get((self.filename,), self._open_file)
+
+    def reopen(self, refresh=False):
+        """Read the file content lazily from the file."""
+        if refresh:
+            FILE_POOL.close(self.filename)
+        self.file_content = LazyFileContent(self._resolve_content_key,
+                                            self._collect_file_content)
+
+    def _collect_file_content(self):
+        """Store all the file content in the lazy `file_content` mapping."""
+        file_handle = self._get_file_handle()
         file_handle.visititems(self.collect_metadata)
         self._collect_attrs('', file_handle.attrs)
-        file_handle.close()
+
+    @staticmethod
+    def _get_object(file_handle, name):
+        """Get the dataset or group called *name*, None if it doesn't exist."""
+        # file content names are relative to the root group
+        if not name or name.startswith('/'):
+            return None
+        try:
+            return file_handle.get(name)
+        except (KeyError, ValueError):
+            return None
+
+    def _resolve_content_key(self, key):
+        """Read the file content item *key* from the file."""
+        file_handle = self._get_file_handle()
+        obj = self._get_object(file_handle, key)
+        if isinstance(obj, h5py.Dataset):
+            return obj
+        for suffix in ('/dtype', '/shape'):
+            if key.endswith(suffix):
+                obj = self._get_object(file_handle, key[:-len(suffix)])
+                if isinstance(obj, h5py.Dataset):
+                    return getattr(obj, suffix[1:])
+        if '/attr/' in key:
+            name, attr_name = key.rsplit('/attr/', 1)
+            obj = self._get_object(file_handle, name) if name else file_handle
+            if obj is not None and attr_name in obj.attrs:
+                value = np.squeeze(obj.attrs[attr_name])
+                try:
+                    return np2str(value)
+                except ValueError:
+                    return value
+        raise KeyError(key)
 
     def _collect_attrs(self, name, attrs):
         for key, value in six.iteritems(attrs):
@@ -78,7 +188,7 @@ class HDF5FileHandler(BaseFileHandler):
         val = self.file_content[key]
         if isinstance(val, h5py.Dataset):
             # these datasets are closed and inaccessible when the file is closed, need to reopen
-            dset = h5py.File(self.filename, 'r')[key]
+            dset = HDF5DatasetProxy(h5py.File(self.filename, 'r')[key])
             dset = da.from_array(dset, chunks=CHUNK_SIZE)
             if dset.ndim > 1:
                 return xr.DataArray(dset, dims=['y', 'x'])
@@ -87,6 +197,10 @@ class HDF5FileHandler(BaseFileHandler):
 
         return val
 
+    def close(self):
+        """Close the file opened to read the metadata lazily."""
+        FILE_POOL.close(self.filename)
+
     def __contains__(self, item):
         return item in self.file_content
 
@@ -49,6 +49,7 @@ from pyresample import geometry
 from satpy.readers.file_handlers import BaseFileHandler
 from satpy.readers.eum_base import time_cds_short
 from satpy.readers.msg_base import dec10216
+from satpy.readers.utils import get_geostationary_segment_bounding_box
 
 logger = logging.getLogger('hrit_base')
 
@@ -241,10 +242,10 @@ class HRITFileHandler(BaseFileHandler):
     def end_time(self):
         return self._end_time
 
-    def get_dataset(self, key, info):
+    def get_dataset(self, key, info, xslice=slice(None), yslice=slice(None)):
         """Load a dataset."""
         # Read bands
-        data = self.read_band(key, info)
+        data = self.read_band(key, info, xslice=xslice, yslice=yslice)
 
         # Convert to xarray
         xdata = xr.DataArray(data, dims=['y', 'x'])
@@ -280,6 +281,17 @@ class HRITFileHandler(BaseFileHandler):
         return (np.deg2rad(ll_x) * h, np.deg2rad(ll_y) * h,
                 np.deg2rad(ur_x) * h, np.deg2rad(ur_y) * h)
 
+    def get_segment_area_def(self):
+        """Get the area of the segment from the navigation header."""
+        if 'cfac' not in self.mda:
+            raise NotImplementedError("No navigation in " + str(self.filename))
+        return self.get_area_def(None)
+
+    def get_bounding_box(self):
+        """Get the lon/lat bounding box of the segment."""
+        return get_geostationary_segment_bounding_box(
+            self.get_segment_area_def())
+
     def get_area_def(self, dsid):
         """Get the area definition of the band."""
         cfac = np.int32(self.mda['cfac'])
@@ -318,22 +330,41 @@ class HRITFileHandler(BaseFileHandler):
         self.area = area
         return area
 
-    def read_band(self, key, info):
-        """Read the data."""
-        shape = int(np.ceil(self.mda['data_field_length'] / 8.))
-        if self.mda['number_of_bits_per_pixel'] == 16:
+    def read_band(self, key, info, xslice=slice(None), yslice=slice(None)):
+        """Read the data.
+
+        Only the lines of *yslice* are read from the file, the columns of
+        *xslice* are selected once these lines are decoded.
+        """
+        nbits = self.mda['number_of_bits_per_pixel']
+        nlines = int(self.mda['number_of_lines'])
+        ncols = int(self.mda['number_of_columns'])
+        if nbits == 16:
             dtype = '>u2'
-            shape //= 2
-        elif self.mda['number_of_bits_per_pixel'] in [8, 10]:
+        elif nbits in [8, 10]:
             dtype = np.uint8
+        first_line, last_line = yslice.indices(nlines)[:2]
+        line_length = ncols * nbits // 8
+        if ((first_line, last_line) == (0, nlines) or
+                (ncols * nbits) % 8):
+            # read the whole data field
+            shape = int(np.ceil(self.mda['data_field_length'] / 8.))
+            offset = self.mda['total_header_length']
+        else:
+            yslice = slice(None)
+            nlines = last_line - first_line
+            shape = nlines * line_length
+            offset = (self.mda['total_header_length'] +
+                      first_line * line_length)
+        if nbits == 16:
+            shape //= 2
         shape = (shape, )
         data = np.memmap(self.filename, mode='r',
-                         offset=self.mda['total_header_length'],
+                         offset=offset,
                          dtype=dtype,
                          shape=shape)
         data = da.from_array(data, chunks=shape[0])
-        if self.mda['number_of_bits_per_pixel'] == 10:
+        if nbits == 10:
             data = dec10216(data)
-        data = data.reshape((self.mda['number_of_lines'],
-                             self.mda['number_of_columns']))
-        return data
+        data = data.reshape((nlines, ncols))
+        return data[yslice, xslice]
@@ -272,9 +272,10 @@ class HRITGOMSFileHandler(HRITFileHandler):
         satellite_id = self.prologue['SatelliteStatus']['SatelliteID']
         self.platform_name = SPACECRAFTS[satellite_id]
 
-    def get_dataset(self, key, info):
+    def get_dataset(self, key, info, xslice=slice(None), yslice=slice(None)):
         """Get the data  from the files."""
-        res = super(HRITGOMSFileHandler, self).get_dataset(key, info)
+        res = super(HRITGOMSFileHandler, self).get_dataset(
+            key, info, xslice=xslice, yslice=yslice)
 
         res = self.calibrate(res, key.calibration)
         res.attrs['units'] = info['units']
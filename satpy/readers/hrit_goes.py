@@ -376,10 +376,11 @@ class HRITGOESFileHandler(HRITFileHandler):
         satellite_id = self.prologue['SatelliteID']
         self.platform_name = SPACECRAFTS[satellite_id]
 
-    def get_dataset(self, key, info):
+    def get_dataset(self, key, info, xslice=slice(None), yslice=slice(None)):
         """Get the data  from the files."""
         logger.debug("Getting raw data")
-        res = super(HRITGOESFileHandler, self).get_dataset(key, info)
+        res = super(HRITGOESFileHandler, self).get_dataset(
+            key, info, xslice=xslice, yslice=yslice)
 
         self.mda['calibration_parameters'] = self._get_calibration_params()
 
@@ -165,9 +165,10 @@ class HRITJMAFileHandler(HRITFileHandler):
             area_extent)
         return area
 
-    def get_dataset(self, key, info):
+    def get_dataset(self, key, info, xslice=slice(None), yslice=slice(None)):
         """Get the dataset designated by *key*."""
-        res = super(HRITJMAFileHandler, self).get_dataset(key, info)
+        res = super(HRITJMAFileHandler, self).get_dataset(
+            key, info, xslice=xslice, yslice=yslice)
 
         res = self.calibrate(res, key.calibration)
         res.attrs.update(info)
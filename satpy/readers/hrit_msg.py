@@ -40,6 +40,7 @@ import numpy as np
 
 from pyresample import geometry
 
+from satpy.dataset import DatasetID
 from satpy.readers.eum_base import (time_cds_short,
                                     recarray2dict)
 from satpy.readers.hrit_base import (HRITFileHandler, ancillary_text,
@@ -226,6 +227,10 @@ class HRITMSGFileHandler(HRITFileHandler, SEVIRICalibrationHandler):
         return self.epilogue['ImageProductionStats'][
             'ActualScanningSummary']['ForwardScanEnd']
 
+    def get_segment_area_def(self):
+        """Get the area of the segment from the navigation header."""
+        return self.get_area_def(DatasetID(name=self.channel_name))
+
     def get_xy_from_linecol(self, line, col, offsets, factors):
         """Get the intermediate coordinates from line & col.
 
@@ -338,9 +343,10 @@ class HRITMSGFileHandler(HRITFileHandler, SEVIRICalibrationHandler):
         self.area = area.squeeze()
         return area
 
-    def get_dataset(self, key, info):
-        res = super(HRITMSGFileHandler, self).get_dataset(key, info)
-        res = self.calibrate(res, key.calibration)
+    def get_dataset(self, key, info, xslice=slice(None), yslice=slice(None)):
+        res = super(HRITMSGFileHandler, self).get_dataset(
+            key, info, xslice=xslice, yslice=yslice)
+        res = self.calibrate(res, key.calibration, yslice=yslice)
         res.attrs['units'] = info['units']
         res.attrs['wavelength'] = info['wavelength']
         res.attrs['standard_name'] = info['standard_name']
@@ -353,8 +359,11 @@ class HRITMSGFileHandler(HRITFileHandler, SEVIRICalibrationHandler):
         res.attrs['satellite_altitude'] = self.mda['projection_parameters']['h']
         return res
 
-    def calibrate(self, data, calibration):
-        """Calibrate the data."""
+    def calibrate(self, data, calibration, yslice=slice(None)):
+        """Calibrate the data.
+
+        *yslice* gives the lines of the segment in *data*.
+        """
         tic = datetime.now()
         channel_name = self.channel_name
 
@@ -372,6 +381,7 @@ class HRITMSGFileHandler(HRITFileHandler, SEVIRICalibrationHandler):
             line_mask &= self.mda['image_segment_line_quality']['line_validity'] <= 3
             line_mask &= self.mda['image_segment_line_quality']['line_radiometric_quality'] == 4
             line_mask &= self.mda['image_segment_line_quality']['line_geometric_quality'] == 4
+            line_mask = line_mask[yslice]
             res *= np.choose(line_mask, [1, np.nan])[:, np.newaxis].astype(np.float32)
 
         if calibration == 'reflectance':
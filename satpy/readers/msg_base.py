@@ -212,27 +212,35 @@ def dec10216(inbuf):
         op[2] = (ip[2] & 0x0F)*64 + ip[3]/4;
         op[3] = (ip[3] & 0x03)*256 +ip[4];
 
+    The bytes are decoded along the last axis of *inbuf*, which can be a
+    numpy or a dask array. Every block of a dask array is decoded
+    separately, so decoding the `(lines, bytes_per_line)` array of an image
+    gives a `(lines, columns)` array with the same row chunks.
+
     """
-    arr10 = inbuf.astype(np.uint16)
-    arr16_len = int(len(arr10) * 4 / 5)
-    arr10_len = int((arr16_len * 5) / 4)
-    arr10 = arr10[:arr10_len]  # adjust size
-
-    # dask is slow with indexing
-    arr10_0 = arr10[::5]
-    arr10_1 = arr10[1::5]
-    arr10_2 = arr10[2::5]
-    arr10_3 = arr10[3::5]
-    arr10_4 = arr10[4::5]
-
-    arr16_0 = (arr10_0 << 2) + (arr10_1 >> 6)
-    arr16_1 = ((arr10_1 & 63) << 4) + (arr10_2 >> 4)
-    arr16_2 = ((arr10_2 & 15) << 6) + (arr10_3 >> 2)
-    arr16_3 = ((arr10_3 & 3) << 8) + arr10_4
-    arr16 = da.stack([arr16_0, arr16_1, arr16_2, arr16_3], axis=-1).ravel()
-    arr16 = da.rechunk(arr16, arr16.shape[0])
-
-    return arr16
+    if not isinstance(inbuf, da.Array):
+        inbuf = da.from_array(inbuf, chunks=inbuf.shape)
+    # only whole groups of 5 bytes can be decoded
+    arr10_len = inbuf.shape[-1] - inbuf.shape[-1] % 5
+    if arr10_len != inbuf.shape[-1]:
+        inbuf = inbuf[..., :arr10_len]
+    if any(chunk % 5 for chunk in inbuf.chunks[-1]):
+        chunk = max(5, max(inbuf.chunks[-1]) // 5 * 5)
+        inbuf = inbuf.rechunk({inbuf.ndim - 1: chunk})
+
+    chunks = inbuf.chunks[:-1] + (tuple(chunk * 4 // 5 for chunk in inbuf.chunks[-1]),)
+    return inbuf.map_blocks(_dec10216_block, chunks=chunks, dtype=np.uint16)
+
+
+def _dec10216_block(inbuf):
+    """Decode a numpy array of 10 bits data whose last axis is a multiple of 5."""
+    arr10 = inbuf.astype(np.uint16).reshape(inbuf.shape[:-1] + (-1, 5))
+    arr16 = np.empty(arr10.shape[:-1] + (4, ), dtype=np.uint16)
+    arr16[..., 0] = (arr10[..., 0] << 2) + (arr10[..., 1] >> 6)
+    arr16[..., 1] = ((arr10[..., 1] & 63) << 4) + (arr10[..., 2] >> 4)
+    arr16[..., 2] = ((arr10[..., 2] & 15) << 6) + (arr10[..., 3] >> 2)
+    arr16[..., 3] = ((arr10[..., 3] & 3) << 8) + arr10[..., 4]
+    return arr16.reshape(inbuf.shape[:-1] + (-1, ))
 
 
 class SEVIRICalibrationHandler(object):
@@ -341,33 +341,22 @@ class NativeMSGFileHandler(BaseFileHandler, SEVIRICalibrationHandler):
                 i = channel_list.index(channel)
                 raw = self.dask_array['visir']['line_data'][:, i, :]
 
-            data = dec10216(raw.flatten())
+            data = dec10216(raw)
             data = da.flipud(da.fliplr((data.reshape(shape))))
 
         else:
             shape = (self.mda['hrv_number_of_lines'], self.mda['hrv_number_of_columns'])
 
-            raw2 = self.dask_array['hrv']['line_data'][:, 2, :]
-            raw1 = self.dask_array['hrv']['line_data'][:, 1, :]
-            raw0 = self.dask_array['hrv']['line_data'][:, 0, :]
-
-            shape_layer = (self.mda['number_of_lines'], self.mda['hrv_number_of_columns'])
-            data2 = dec10216(raw2.flatten())
-            data2 = da.flipud(da.fliplr((data2.reshape(shape_layer))))
-            data1 = dec10216(raw1.flatten())
-            data1 = da.flipud(da.fliplr((data1.reshape(shape_layer))))
-            data0 = dec10216(raw0.flatten())
-            data0 = da.flipud(da.fliplr((data0.reshape(shape_layer))))
-
-            data = np.zeros(shape)
-            idx = range(0, shape[0], 3)
-            data[idx, :] = data2
-            idx = range(1, shape[0], 3)
-            data[idx, :] = data1
-            idx = range(2, shape[0], 3)
-            data[idx, :] = data0
-
-        xarr = xr.DataArray(data, dims=['y', 'x']).where(data != 0).astype(np.float32)
+            # the lines of the image are stored as groups of 3 lines, in
+            # reverse order, so decoding the (lines, 3, bytes) array, flipping
+            # it and merging the two first dimensions gives the image
+            # without leaving dask
+            raw = self.dask_array['hrv']['line_data']
+            data = dec10216(raw)[::-1, ::-1, ::-1].reshape(shape)
+
+        data = data[yslice, xslice]
+        xarr = xr.DataArray(data, dims=['y', 'x']).astype(np.float32)
+        xarr = xarr.where(xarr != 0)
 
         if xarr is None:
             dataset = None
@@ -60,6 +60,8 @@ class NcNWCSAF(BaseFileHandler):
 
     """NWCSAF PPS&MSG NetCDF reader."""
 
+    file_handle_attributes = ('nc', )
+
     def __init__(self, filename, filename_info, filetype_info):
         """Init method."""
         super(NcNWCSAF, self).__init__(filename, filename_info,
@@ -70,12 +72,7 @@ class NcNWCSAF(BaseFileHandler):
             self.filename = self._unzipped
 
         self.cache = {}
-        self.nc = xr.open_dataset(self.filename,
-                                  decode_cf=True,
-                                  mask_and_scale=False,
-                                  chunks=CHUNK_SIZE)
-
-        self.nc = self.nc.rename({'nx': 'x', 'ny': 'y'})
+        self.reopen(refresh=True)
         self.pps = False
 
         try:
@@ -92,6 +89,23 @@ class NcNWCSAF(BaseFileHandler):
 
         self.sensor = SENSOR.get(self.platform_name, 'seviri')
 
+    def _open_dataset(self):
+        nc = xr.open_dataset(self.filename,
+                             decode_cf=True,
+                             mask_and_scale=False,
+                             chunks=CHUNK_SIZE)
+        return nc.rename({'nx': 'x', 'ny': 'y'})
+
+    def reopen(self, refresh=False):
+        """Open the file, or get it if it is open in this process already."""
+        self.nc = self.open_shared('nc_nwcsaf', self._open_dataset, refresh)
+
+    def __getstate__(self):
+        state = super(NcNWCSAF, self).__getstate__()
+        # the unzipped file is removed by the original file handler only
+        state['_unzipped'] = None
+        return state
+
     def remove_timedim(self, var):
         """Remove time dimension from dataset"""
         if self.pps and var.dims[0] == 'time':
@@ -30,11 +30,16 @@ import logging
 import xarray as xr
 
 from satpy import CHUNK_SIZE
-from satpy.readers.file_handlers import BaseFileHandler
+from satpy.readers.file_handlers import (BaseFileHandler, FileHandlePool,
+                                         LazyFileContent)
 from satpy.readers.utils import np2str
 
 LOG = logging.getLogger(__name__)
 
+# xarray datasets opened to access the variables of NetCDF4FileHandlers and
+# netCDF4 datasets opened to read their metadata lazily
+DATASET_POOL = FileHandlePool()
+
 
 class NetCDF4FileHandler(BaseFileHandler):
 
@@ -63,30 +68,113 @@ class NetCDF4FileHandler(BaseFileHandler):
 
         wrapper["group/subgroup/var_name/shape"]
 
+    Files reopened to load variables are kept open in the module's
+    `DATASET_POOL` so that loading more variables from the same file and
+    group doesn't reopen it. They are closed when the pool is full or when
+    `close` is called.
+
+    With `lazy_metadata=True` (or `lazy_metadata: True` in the file type
+    configuration) the file isn't walked when the file handler is created,
+    each item is read from the file the first time it is requested instead.
+    This is much faster for files with a lot of variables or attributes when
+    only a few of them are used.
+
+    The netCDF4 objects of the file content can't be pickled: the file
+    content is left out of the pickled state and read lazily from the file
+    once the file handler is unpickled.
+
     """
 
+    file_handle_attributes = ('file_content', )
+
     def __init__(self, filename, filename_info, filetype_info,
-                 auto_maskandscale=False, xarray_kwargs=None):
+                 auto_maskandscale=False, xarray_kwargs=None,
+                 lazy_metadata=None):
         super(NetCDF4FileHandler, self).__init__(
             filename, filename_info, filetype_info)
-        self.file_content = {}
+        if lazy_metadata is None and isinstance(filetype_info, dict):
+            lazy_metadata = filetype_info.get('lazy_metadata', False)
+        self.auto_maskandscale = auto_maskandscale
+        if lazy_metadata:
+            # fail early on unreadable files like the eager mode does
+            self._get_file_handle()
+            self.file_content = LazyFileContent(self._resolve_content_key,
+                                                self._collect_file_content)
+        else:
+            self.file_content = {}
+            file_handle = self._open_file()
+            self.collect_metadata("", file_handle)
+            self.collect_dimensions("", file_handle)
+            file_handle.close()
+        self._xarray_kwargs = xarray_kwargs or {}
+        self._xarray_kwargs.setdefault('chunks', CHUNK_SIZE)
+        self._xarray_kwargs.setdefault('mask_and_scale', self.auto_maskandscale)
+        # datasets opened with different options can't be shared
+        self._xarray_kwargs_key = repr(sorted(self._xarray_kwargs.items()))
+
+    def _open_file(self):
         try:
             file_handle = netCDF4.Dataset(self.filename, 'r')
         except IOError:
             LOG.exception(
                 'Failed reading file %s. Possibly corrupted file', self.filename)
             raise
-
-        self.auto_maskandscale = auto_maskandscale
         if hasattr(file_handle, "set_auto_maskandscale"):
-            file_handle.set_auto_maskandscale(auto_maskandscale)
-
+            file_handle.set_auto_maskandscale(self.auto_maskandscale)
+        return file_handle
+
+    def _get_file_handle(self):
+        return DATASET_POOL.get((self.filename, 'netCDF4'), self._open_file)
+
+    def reopen(self, refresh=False):
+        """Read the file content lazily from the file."""
+        if refresh:
+            DATASET_POOL.close(self.filename)
+        self.file_content = LazyFileContent(self._resolve_content_key,
+                                            self._collect_file_content)
+
+    def _collect_file_content(self):
+        """Store all the file content in the lazy `file_content` mapping."""
+        file_handle = self._get_file_handle()
         self.collect_metadata("", file_handle)
         self.collect_dimensions("", file_handle)
-        file_handle.close()
-        self._xarray_kwargs = xarray_kwargs or {}
-        self._xarray_kwargs.setdefault('chunks', CHUNK_SIZE)
-        self._xarray_kwargs.setdefault('mask_and_scale', self.auto_maskandscale)
+
+    @staticmethod
+    def _get_object(file_handle, name):
+        """Get the variable or group called *name*, None if it doesn't exist."""
+        obj = file_handle
+        parts = name.split('/')
+        for group_name in parts[:-1]:
+            obj = obj.groups.get(group_name)
+            if obj is None:
+                return None
+        if parts[-1] in obj.variables:
+            return obj.variables[parts[-1]]
+        return obj.groups.get(parts[-1])
+
+    def _resolve_content_key(self, key):
+        """Read the file content item *key* from the file."""
+        file_handle = self._get_file_handle()
+        if key.startswith('/dimension/'):
+            return len(file_handle.dimensions[key[len('/dimension/'):]])
+        obj = self._get_object(file_handle, key)
+        if isinstance(obj, netCDF4.Variable):
+            return obj
+        for suffix in ('/dtype', '/shape'):
+            if key.endswith(suffix):
+                obj = self._get_object(file_handle, key[:-len(suffix)])
+                if isinstance(obj, netCDF4.Variable):
+                    return getattr(obj, suffix[1:])
+        if '/attr/' in key:
+            name, attr_name = key.rsplit('/attr/', 1)
+            obj = self._get_object(file_handle, name) if name else file_handle
+            if obj is not None and attr_name in obj.ncattrs():
+                value = getattr(obj, attr_name)
+                try:
+                    return np2str(value)
+                except ValueError:
+                    return value
+        raise KeyError(key)
 
     def _collect_attrs(self, name, obj):
         """Collect all the attributes for the provided file object.
@@ -132,11 +220,16 @@ class NetCDF4FileHandler(BaseFileHandler):
                 group, key = parts
             else:
                 group = None
-            with xr.open_dataset(self.filename, group=group,
-                                 **self._xarray_kwargs) as nc:
-                val = nc[key]
+            nc = DATASET_POOL.get((self.filename, group, self._xarray_kwargs_key),
+                                  lambda: xr.open_dataset(self.filename, group=group,
+                                                          **self._xarray_kwargs))
+            val = nc[key]
         return val
 
+    def close(self):
+        """Close the datasets opened from this file."""
+        DATASET_POOL.close(self.filename)
+
     def __contains__(self, item):
         return item in self.file_content
 
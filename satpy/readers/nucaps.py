@@ -199,9 +199,13 @@ class NUCAPSReader(FileYAMLReader):
             mask_quality (boolean): mask anything where the `Quality_Flag` metadata is ``!= 1``.
 
         """
-        self.pressure_dataset_names = defaultdict(list)
         super(NUCAPSReader, self).__init__(config_files,
                                            **kwargs)
+        self.pressure_dataset_names = defaultdict(list)
+        for ds_info in sorted((ds_info for ds_info in self.ids.values()
+                               if 'pressure_index' in ds_info),
+                              key=lambda ds_info: ds_info['pressure_index']):
+            self.pressure_dataset_names[ds_info['file_key']].append(ds_info['name'])
         self.mask_surface = self.info.get('mask_surface', mask_surface)
         self.mask_quality = self.info.get('mask_quality', mask_quality)
 
@@ -232,9 +236,9 @@ class NUCAPSReader(FileYAMLReader):
                     new_ds_id = ds_id._replace(name=new_info['name'])
                     new_info['id'] = new_ds_id
                     self.ids[new_ds_id] = new_info
-                    self.pressure_dataset_names[ds_id.name].append(new_info['name'])
 
-    def load(self, dataset_keys, previous_datasets=None, pressure_levels=None):
+    def load(self, dataset_keys, previous_datasets=None, pressure_levels=None,
+             area=None):
         """Load data from one or more set of files.
 
         :param pressure_levels: mask out certain pressure levels:
@@ -273,7 +277,7 @@ class NUCAPSReader(FileYAMLReader):
                 remove_plevels = True
 
         datasets_loaded = super(NUCAPSReader, self).load(
-            dataset_keys, previous_datasets=previous_datasets)
+            dataset_keys, previous_datasets=previous_datasets, area=area)
 
         if pressure_levels is not None:
             if remove_plevels:
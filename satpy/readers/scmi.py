@@ -60,20 +60,39 @@ logger = logging.getLogger(__name__)
 class SCMIFileHandler(BaseFileHandler):
     """Handle a single SCMI NetCDF4 file."""
 
+    file_handle_attributes = ('nc', )
+
     def __init__(self, filename, filename_info, filetype_info):
         super(SCMIFileHandler, self).__init__(filename, filename_info,
                                               filetype_info)
-        # xarray's default netcdf4 engine
-        self.nc = xr.open_dataset(self.filename,
-                                  decode_cf=True,
-                                  mask_and_scale=False,
-                                  chunks={'x': LOAD_CHUNK_SIZE, 'y': LOAD_CHUNK_SIZE})
+        self.reopen(refresh=True)
         self.platform_name = self.nc.attrs['satellite_id']
         self.sensor = self._get_sensor()
         self.nlines = self.nc.dims['y']
         self.ncols = self.nc.dims['x']
         self.coords = {}
 
+    def _open_dataset(self):
+        # xarray's default netcdf4 engine
+        return xr.open_dataset(self.filename,
+                               decode_cf=True,
+                               mask_and_scale=False,
+                               chunks={'x': LOAD_CHUNK_SIZE, 'y': LOAD_CHUNK_SIZE})
+
+    def reopen(self, refresh=False):
+        """Open the file, or get it if it is open in this process already."""
+        self.nc = self.open_shared('scmi', self._open_dataset, refresh)
+
+    def close(self):
+        """Release the file, it is opened again if the file handler is used.
+
+        The file is closed once the data loaded from it is gone.
+        """
+        nc = self.__dict__.pop('nc', None)
+        if nc is not None:
+            self.release_shared('scmi', nc)
+        self.coords = {}
+
     def _get_sensor(self):
         """Determine the sensor for this file."""
         # sometimes Himawari-8 (or 9) data is stored in SCMI format
@@ -126,7 +145,7 @@ class SCMIFileHandler(BaseFileHandler):
         """Get the shape of the data."""
         return self.nlines, self.ncols
 
-    def get_dataset(self, key, info):
+    def get_dataset(self, key, info, xslice=slice(None), yslice=slice(None)):
         """Load a dataset."""
         logger.debug('Reading in get_dataset %s.', key.name)
         var_name = info.get('file_key', self.filetype_info.get('file_key'))
@@ -136,6 +155,7 @@ class SCMIFileHandler(BaseFileHandler):
             data = self['Sectorized_CMI']
         elif 'data' in self.nc:
             data = self['data']
+        data = data[yslice, xslice]
         # NetCDF doesn't support multi-threaded reading, trick it by opening
         # as one whole chunk then split it up before we do any calculations
         data = data.chunk({'x': CHUNK_SIZE, 'y': CHUNK_SIZE})
@@ -272,9 +292,3 @@ class SCMIFileHandler(BaseFileHandler):
     @property
     def end_time(self):
         return self.start_time
-
-    def __del__(self):
-        try:
-            self.nc.close()
-        except (IOError, OSError):
-            pass
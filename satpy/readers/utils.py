@@ -30,7 +30,7 @@ import tempfile
 import bz2
 import os
 import numpy as np
-from pyresample.geometry import AreaDefinition
+from pyresample.geometry import AreaDefinition, StackedAreaDefinition
 from pyresample.boundary import AreaDefBoundary, Boundary
 
 LOGGER = logging.getLogger(__name__)
@@ -124,6 +124,87 @@ def get_geostationary_bounding_box(geos_area, nb_points=50):
     return _lonlat_from_geos_angle(x, y, geos_area)
 
 
+def _get_geos_extent(geos_area):
+    """Get the first area and the extent of all the parts of *geos_area*."""
+    areas = [geos_area]
+    if isinstance(geos_area, StackedAreaDefinition):
+        areas = geos_area.defs
+    extents = np.array([area.area_extent for area in areas])
+    return areas[0], (extents[:, [0, 2]].min(), extents[:, [1, 3]].min(),
+                      extents[:, [0, 2]].max(), extents[:, [1, 3]].max())
+
+
+def get_geostationary_segment_bounding_box(geos_area, nb_points=50):
+    """Get the bbox in lon/lats of the valid pixels of a disk segment.
+
+    Contrary to :func:`get_geostationary_bounding_box`, the polygon follows
+    the edges of *geos_area* where they cut through the disk, so that it is
+    also valid for segments covering only some lines of the disk. The parts
+    of a `StackedAreaDefinition` are bounded together.
+
+    Args:
+      nb_points: Number of points on the polygon
+    """
+    geos_area, extent = _get_geos_extent(geos_area)
+    xmax, ymax = get_geostationary_angle_extent(geos_area)
+    # make it a bit smaller so that we stay inside the valid area
+    xmax -= 0.001
+    ymax -= 0.001
+    min_x, min_y, max_x, max_y = np.array(extent) / geos_area.proj_dict['h']
+
+    # west edge going north, north edge, east edge going south, south edge
+    nb_side = max(nb_points // 4, 2)
+    y = np.linspace(max(min_y, -ymax), min(max_y, ymax), nb_side)
+    half_width = xmax * np.sqrt(np.clip(1 - (y / ymax) ** 2, 0, 1))
+    west = np.maximum(min_x, -half_width)
+    east = np.minimum(max_x, half_width)
+    valid = west <= east
+    y, west, east = y[valid], west[valid], east[valid]
+    # the cuts through the disk are densified not to follow great circles
+    north = np.linspace(west[-1], east[-1], nb_side)[1:-1]
+    south = np.linspace(east[0], west[0], nb_side)[1:-1]
+    x = np.concatenate([west, north, east[::-1], south])
+    y = np.concatenate([y, np.full(north.shape, y[-1]), y[::-1],
+                        np.full(south.shape, y[0])])
+    # drop the points repeated where the segment reaches the disk poles
+    keep = (x != np.roll(x, 1)) | (y != np.roll(y, 1))
+
+    return _lonlat_from_geos_angle(x[keep], y[keep], geos_area)
+
+
+def _same_geos_projection(area1, area2):
+    """Check if *area1* and *area2* are in the same geos projection."""
+    proj1, proj2 = area1.proj_dict, area2.proj_dict
+    if not proj1.get('proj') == proj2.get('proj') == 'geos':
+        return False
+    if proj1.get('sweep', 'y') != proj2.get('sweep', 'y'):
+        return False
+    try:
+        return all(np.isclose(float(proj1.get(key, 0)),
+                              float(proj2.get(key, 0)))
+                   for key in ('a', 'b', 'h', 'lon_0'))
+    except (TypeError, ValueError):
+        return False
+
+
+def geos_extents_overlap(data_area, area_to_cover):
+    """Check if the extents of *data_area* and *area_to_cover* overlap.
+
+    This is an exact test which doesn't need any lon/lat computation, for
+    areas in the same geos projection.
+
+    Raises:
+        NotImplementedError: if the areas are not in the same geos projection.
+    """
+    data_area, (llx, lly, urx, ury) = _get_geos_extent(data_area)
+    if not _same_geos_projection(data_area, area_to_cover):
+        raise NotImplementedError('Only areas in the same geos projection '
+                                  'supported')
+    cllx, clly, curx, cury = area_to_cover.area_extent
+    return (llx < max(cllx, curx) and min(cllx, curx) < urx and
+            lly < max(clly, cury) and min(clly, cury) < ury)
+
+
 def get_area_slices(data_area, area_to_cover):
     """Compute the slice to read from an *area* based on an *area_to_cover*."""
 
@@ -138,7 +219,13 @@ def get_area_slices(data_area, area_to_cover):
         llx, lly, urx, ury = area_to_cover.area_extent
         x, y = data_area.get_xy_from_proj_coords([llx, urx], [lly, ury])
 
-        return slice(x[0], x[1] + 1), slice(y[1], y[0] + 1)
+        # corners outside of the data area are masked
+        xstart = 0 if x[0] is np.ma.masked else x[0]
+        ystart = 0 if y[1] is np.ma.masked else y[1]
+        xstop = data_area.x_size if x[1] is np.ma.masked else x[1] + 1
+        ystop = data_area.y_size if y[0] is np.ma.masked else y[0] + 1
+
+        return slice(xstart, xstop), slice(ystart, ystop)
 
     data_boundary = Boundary(*get_geostationary_bounding_box(data_area))
 
@@ -32,6 +32,7 @@ import xarray.ufuncs as xu
 import dask.array as da
 
 from satpy.readers.file_handlers import BaseFileHandler
+from satpy.readers.hdf5_utils import HDF5DatasetProxy
 from satpy.readers.utils import np2str
 from satpy.utils import angle2xyz, lonlat2xyz, xyz2angle, xyz2lonlat
 from satpy import CHUNK_SIZE
@@ -70,19 +71,17 @@ short_names = {'NPP': 'Suomi-NPP'}
 
 class VIIRSCompactFileHandler(BaseFileHandler):
 
+    file_handle_attributes = ('h5f', 'geostuff')
+
     def __init__(self, filename, filename_info, filetype_info):
         super(VIIRSCompactFileHandler, self).__init__(filename, filename_info,
                                                       filetype_info)
-        self.h5f = h5py.File(self.filename, "r")
+        self.reopen(refresh=True)
         self.finfo = filename_info
         self.lons = None
         self.lats = None
 
         self.scans = self.h5f["All_Data"]["NumberOfScans"][0]
-        for key in self.h5f["All_Data"].keys():
-            if key.startswith("VIIRS") and key.endswith("GEO_All"):
-                self.geostuff = self.h5f["All_Data"][key]
-                break
 
         self.c_align = self.geostuff["AlignmentCoefficient"].value[
             np.newaxis, np.newaxis, :, np.newaxis]
@@ -121,6 +120,16 @@ class VIIRSCompactFileHandler(BaseFileHandler):
         self.mda['platform_name'] = short_names.get(short_name, short_name)
         self.mda['sensor'] = 'viirs'
 
+    def reopen(self, refresh=False):
+        """Open the file, or get it if it is open in this process already."""
+        self.h5f = self.open_shared('h5py',
+                                    lambda: h5py.File(self.filename, "r"),
+                                    refresh)
+        for key in self.h5f["All_Data"].keys():
+            if key.startswith("VIIRS") and key.endswith("GEO_All"):
+                self.geostuff = self.h5f["All_Data"][key]
+                break
+
     def get_dataset(self, key, info):
         """Load a dataset
         """
@@ -208,7 +217,8 @@ class VIIRSCompactFileHandler(BaseFileHandler):
 
         h5rads = h5f["All_Data"][chan_dict[channel]]["Radiance"]
         chunks = h5rads.chunks or CHUNK_SIZE
-        rads = xr.DataArray(da.from_array(h5rads, chunks=chunks),
+        rads = xr.DataArray(da.from_array(HDF5DatasetProxy(h5rads),
+                                          chunks=chunks),
                             name=dataset_key.name,
                             dims=['y', 'x']).astype(np.float32)
         h5attrs = h5rads.attrs
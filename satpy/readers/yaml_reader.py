@@ -26,22 +26,31 @@ import glob
 import itertools
 import logging
 import os
+import sys
 from abc import ABCMeta, abstractmethod, abstractproperty
 from collections import deque, OrderedDict
 from fnmatch import fnmatch
+from multiprocessing.pool import ThreadPool
 
 import six
 import xarray as xr
 import yaml
 from weakref import WeakValueDictionary
 
+try:
+    from inspect import getfullargspec as getargspec
+except ImportError:
+    from inspect import getargspec
+
 from pyresample.geometry import StackedAreaDefinition, SwathDefinition
 from pyresample.boundary import AreaDefBoundary, Boundary
 from satpy.resample import get_area_def
-from satpy.config import recursive_dict_update
+from satpy.config import CONFIG_CACHE, recursive_dict_update
 from satpy.dataset import DATASET_KEYS, DatasetID
-from satpy.readers import DatasetDict, get_key
-from satpy.readers.utils import get_area_slices, get_sub_area
+from satpy.readers import DatasetDict, DatasetIDIndex, get_key
+from satpy.readers.utils import (geos_extents_overlap, get_area_slices,
+                                 get_geostationary_segment_bounding_box,
+                                 get_sub_area)
 from trollsift.parser import globify, parse
 from satpy import CHUNK_SIZE
 
@@ -70,43 +79,102 @@ def get_filebase(path, pattern):
     return os.path.join(*str(path).split(os.path.sep)[-tail_len:])
 
 
+_GLOB_PATTERNS = {}
+
+
+def _globify(pattern):
+    """Get the (memoized) glob pattern corresponding to trollsift *pattern*."""
+    try:
+        return _GLOB_PATTERNS[pattern]
+    except KeyError:
+        glob_pattern = _GLOB_PATTERNS[pattern] = globify(pattern)
+        return glob_pattern
+
+
 def match_filenames(filenames, pattern):
     """Get the filenames matching *pattern*."""
     matching = []
+    glob_pattern = _globify(pattern)
 
     for filename in filenames:
-        if fnmatch(get_filebase(filename, pattern), globify(pattern)):
+        if fnmatch(get_filebase(filename, pattern), glob_pattern):
             matching.append(filename)
 
     return matching
 
 
+_SLICE_SUPPORT = {}
+
+
+def _accepts_slices(file_handler):
+    """Check if the `get_dataset` method of *file_handler* takes slices."""
+    cls = file_handler.__class__
+    try:
+        return _SLICE_SUPPORT[cls]
+    except KeyError:
+        args = getargspec(cls.get_dataset).args
+        res = _SLICE_SUPPORT[cls] = 'xslice' in args and 'yslice' in args
+        return res
+
+
+def _get_dataset_window(file_handler, dsid, ds_info, xslice, yslice):
+    """Load the *yslice*, *xslice* window of *dsid* from *file_handler*.
+
+    File handlers whose `get_dataset` doesn't take slices load the whole
+    dataset which is sliced afterwards.
+    """
+    if _accepts_slices(file_handler):
+        return file_handler.get_dataset(dsid, ds_info,
+                                        xslice=xslice, yslice=yslice)
+    res = file_handler.get_dataset(dsid, ds_info)
+    if res is not None:
+        res = res.isel(x=xslice, y=yslice)
+    return res
+
+
 class AbstractYAMLReader(six.with_metaclass(ABCMeta, object)):
 
     def __init__(self, config_files):
-        self.config = {}
         self.config_files = config_files
-        for config_file in config_files:
-            with open(config_file) as fd:
-                self.config = recursive_dict_update(self.config, yaml.load(fd))
+        # parsing the YAML and building the IDs is expensive, reuse the
+        # results from previous instances if the files haven't changed
+        self.config, self.ids = CONFIG_CACHE.get(self.__class__, config_files,
+                                                 self._load_config)
 
         self.info = self.config['reader']
         self.name = self.info['name']
         self.file_patterns = []
+        for filetype_info in self.config['file_types'].values():
+            self.file_patterns.extend(filetype_info['file_patterns'])
+        self.datasets = self.config.get('datasets', {})
+        self.info['filenames'] = []
+        self._ids_index = DatasetIDIndex(self.ids)
+
+    def _load_config(self):
+        """Read the configuration files and create the dataset IDs.
+
+        Returns: the configuration dictionary and the dataset IDs dictionary
+
+        """
+        self.config = {}
+        for config_file in self.config_files:
+            with open(config_file) as fd:
+                self.config = recursive_dict_update(self.config, yaml.load(fd))
+
         for file_type, filetype_info in self.config['file_types'].items():
             filetype_info.setdefault('file_type', file_type)
             # correct separator if needed
             file_patterns = [os.path.join(*pattern.split('/'))
                              for pattern in filetype_info['file_patterns']]
             filetype_info['file_patterns'] = file_patterns
-            self.file_patterns.extend(file_patterns)
 
-        if 'sensors' in self.info and not isinstance(self.info['sensors'], (list, tuple)):
-            self.info['sensors'] = [self.info['sensors']]
+        info = self.config['reader']
+        if 'sensors' in info and not isinstance(info['sensors'], (list, tuple)):
+            info['sensors'] = [info['sensors']]
         self.datasets = self.config.get('datasets', {})
-        self.info['filenames'] = []
         self.ids = {}
         self.load_ds_ids_from_config()
+        return self.config, self.ids
 
     @property
     def sensor_names(self):
@@ -148,8 +216,8 @@ class AbstractYAMLReader(six.with_metaclass(ABCMeta, object)):
         """
 
     @abstractmethod
-    def load(self, dataset_keys):
-        """Load *dataset_keys*."""
+    def load(self, dataset_keys, area=None):
+        """Load *dataset_keys*, limited to *area* if provided."""
 
     def supports_sensor(self, sensor):
         """Check if *sensor* is supported.
@@ -171,7 +239,7 @@ class AbstractYAMLReader(six.with_metaclass(ABCMeta, object)):
         if directory is None:
             directory = ''
         for pattern in self.file_patterns:
-            matching = glob.iglob(os.path.join(directory, globify(pattern)))
+            matching = glob.iglob(os.path.join(directory, _globify(pattern)))
             filenames.extend(matching)
         return filenames
 
@@ -194,7 +262,7 @@ class AbstractYAMLReader(six.with_metaclass(ABCMeta, object)):
         See `satpy.readers.get_key` for more information about kwargs.
 
         """
-        return get_key(key, self.ids.keys(), **kwargs)
+        return get_key(key, self._ids_index, **kwargs)
 
     def load_ds_ids_from_config(self):
         """Get the dataset ids from the config."""
@@ -253,16 +321,41 @@ class FileYAMLReader(AbstractYAMLReader):
                  config_files,
                  filter_parameters=None,
                  filter_filenames=True,
+                 filehandler_workers=None,
                  **kwargs):
+        """Set up the reader.
+
+        Args:
+            config_files (list): YAML configuration files for the reader.
+            filter_parameters (dict): Metadata used to filter the files to
+                load (ex. `start_time`, `end_time`, `area`).
+            filter_filenames (bool): Filter files by the metadata in their
+                filenames before opening them (default: True).
+            filehandler_workers (int): Number of threads used to create the
+                file handlers of each file type. File handlers are created
+                one after the other if `None` (default) or less than 2.
+
+        """
         super(FileYAMLReader, self).__init__(config_files)
 
         self.file_handlers = {}
         self.filter_filenames = self.info.get('filter_filenames', filter_filenames)
         self.filter_parameters = filter_parameters or {}
+        self.filehandler_workers = filehandler_workers
         if kwargs:
             logger.warning("Unrecognized/unused reader keyword argument(s) '{}'".format(kwargs))
         self.coords_cache = WeakValueDictionary()
 
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # the weak cache can't be pickled, it is started over when unpickled
+        del state['coords_cache']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.coords_cache = WeakValueDictionary()
+
     @property
     def sensor_names(self):
         if not self.file_handlers:
@@ -307,20 +400,42 @@ class FileYAMLReader(AbstractYAMLReader):
 
         If the file doesn't provide any bounding box information or 'area'
         was not provided in `filter_parameters`, the check returns True.
+        *check_area* is an area definition or the name of one. Segments of
+        geostationary data are checked from their header only, without any
+        lon/lat computation when *check_area* is in the same projection.
         """
+        if isinstance(check_area, six.string_types):
+            check_area = get_area_def(check_area)
+        try:
+            return geos_extents_overlap(file_handler.get_segment_area_def(),
+                                        check_area)
+        except NotImplementedError:
+            pass
+
         try:
             gbb = Boundary(*file_handler.get_bounding_box())
         except NotImplementedError as err:
             logger.debug("Bounding box computation not implemented: %s",
                          str(err))
         else:
-            abb = AreaDefBoundary(get_area_def(check_area), frequency=1000)
+            if check_area.proj_dict.get('proj') == 'geos':
+                # only the valid pixels of the disk have lon/lats
+                abb = Boundary(
+                    *get_geostationary_segment_bounding_box(check_area))
+            else:
+                abb = AreaDefBoundary(check_area, frequency=1000)
 
             intersection = gbb.contour_poly.intersection(abb.contour_poly)
             if not intersection:
                 return False
         return True
 
+    def close(self):
+        """Close the files kept open by the file handlers."""
+        for file_handlers in self.file_handlers.values():
+            for fh in file_handlers:
+                fh.close()
+
     def find_required_filehandlers(self, requirements, filename_info):
         """Find the necessary fhs for the current filehandler.
 
@@ -378,10 +493,9 @@ class FileYAMLReader(AbstractYAMLReader):
                 matched_files.append(filename)
                 yield filename, filename_info
 
-    def new_filehandler_instances(self, filetype_info, filename_items):
-        """Generate new filehandler instances."""
+    def _filehandler_args(self, filetype_info, filename_items):
+        """Generate the arguments of the filehandlers to create."""
         requirements = filetype_info.get('requires')
-        filetype_cls = filetype_info['file_reader']
         for filename, filename_info in filename_items:
             try:
                 req_fh = self.find_required_filehandlers(requirements,
@@ -393,7 +507,43 @@ class FileYAMLReader(AbstractYAMLReader):
                 logger.warning("Missing requirements for %s", filename)
                 continue
 
-            yield filetype_cls(filename, filename_info, filetype_info, *req_fh)
+            yield (filename, filename_info, filetype_info) + tuple(req_fh)
+
+    def new_filehandler_instances(self, filetype_info, filename_items):
+        """Generate new filehandler instances."""
+        filetype_cls = filetype_info['file_reader']
+        fh_args = self._filehandler_args(filetype_info, filename_items)
+        workers = self.filehandler_workers or 1
+        if workers > 1:
+            fh_args = list(fh_args)
+        if workers < 2 or len(fh_args) < 2:
+            for args in fh_args:
+                yield filetype_cls(*args)
+            return
+
+        def _create_filehandler(args):
+            try:
+                return filetype_cls(*args), None
+            except Exception:
+                return None, sys.exc_info()
+
+        pool = ThreadPool(min(workers, len(fh_args)))
+        try:
+            # map keeps the results in the order of the files
+            results = pool.map(_create_filehandler, fh_args)
+        finally:
+            pool.close()
+            pool.join()
+        errors = [exc_info for _, exc_info in results if exc_info is not None]
+        if errors:
+            # the file handlers created for the other files are lost
+            for filehandler, _ in results:
+                if filehandler is not None:
+                    filehandler.close()
+            # fail on the first bad file like the sequential creation
+            six.reraise(*errors[0])
+        for filehandler, _ in results:
+            yield filehandler
 
     def time_matches(self, fstart, fend):
         start_time = self.filter_parameters.get('start_time')
@@ -527,6 +677,8 @@ class FileYAMLReader(AbstractYAMLReader):
                 new_id = DatasetID.from_dict(ds_info)
                 self.ids[new_id] = ds_info
                 del self.ids[ds_id]
+                self._ids_index.discard(ds_id)
+                self._ids_index.add(new_id)
 
     def add_ds_ids_from_files(self):
         """Check files for more dynamically discovered datasets."""
@@ -547,15 +699,27 @@ class FileYAMLReader(AbstractYAMLReader):
                     # lists: https://github.com/pydata/xarray/issues/2060
                     ds_info['coordinates'] = tuple(ds_info['coordinates'])
                 self.ids.setdefault(ds_id, ds_info)
+                self._ids_index.add(ds_id)
 
     @staticmethod
-    def _load_dataset(dsid, ds_info, file_handlers, dim='y'):
-        """Load only a piece of the dataset."""
+    def _load_dataset(dsid, ds_info, file_handlers, dim='y', windows=None):
+        """Load only a piece of the dataset.
+
+        Args:
+            windows (list): `(xslice, yslice)` of the data to load from each
+                            file handler. Defaults to all the data.
+        """
         slice_list = []
         failure = True
-        for fh in file_handlers:
+        if windows is None:
+            windows = [None] * len(file_handlers)
+        for fh, window in zip(file_handlers, windows):
             try:
-                projectable = fh.get_dataset(dsid, ds_info)
+                if window is None:
+                    projectable = fh.get_dataset(dsid, ds_info)
+                else:
+                    projectable = _get_dataset_window(fh, dsid, ds_info,
+                                                      *window)
                 if projectable is not None:
                     slice_list.append(projectable)
                     failure = False
@@ -577,13 +741,49 @@ class FileYAMLReader(AbstractYAMLReader):
         res.attrs = combined_info
         return res
 
+    @staticmethod
+    def _get_file_handler_windows(dsid, file_handlers, xslice, yslice):
+        """Get the part of *xslice*, *yslice* covered by each file handler.
+
+        The data of the file handlers are stacked vertically. File handlers
+        not covering any line of *yslice* are left out.
+
+        Returns:
+            The file handlers to load from and their `(xslice, yslice)`
+            windows.
+        """
+        fh_list = []
+        windows = []
+        first_line = 0
+        for fh in file_handlers:
+            nlines = fh.get_area_def(dsid).y_size
+            start = max(yslice.start - first_line, 0)
+            stop = min(yslice.stop - first_line, nlines)
+            first_line += nlines
+            if start >= stop:
+                continue
+            if (start, stop) == (0, nlines):
+                window = (xslice, slice(None))
+            else:
+                window = (xslice, slice(start, stop))
+            fh_list.append(fh)
+            windows.append(window)
+        return fh_list, windows
+
     def _load_dataset_data(self,
                            file_handlers,
                            dsid,
                            xslice=slice(None),
                            yslice=slice(None)):
         ds_info = self.ids[dsid]
-        proj = self._load_dataset(dsid, ds_info, file_handlers)
+        windows = None
+        if yslice != slice(None):
+            file_handlers, windows = self._get_file_handler_windows(
+                dsid, file_handlers, xslice, yslice)
+        elif xslice != slice(None):
+            windows = [(xslice, slice(None))] * len(file_handlers)
+        proj = self._load_dataset(dsid, ds_info, file_handlers,
+                                  windows=windows)
         # FIXME: areas could be concatenated here
         # Update the metadata
         proj.attrs['start_time'] = file_handlers[0].start_time
@@ -696,11 +896,13 @@ class FileYAMLReader(AbstractYAMLReader):
             return area
 
     # TODO: move this out of here.
-    def _get_slices(self, area):
+    def _get_slices(self, area, area_to_cover=None):
         """Get the slices of raw data covering area.
 
         Args:
             area: the area to slice.
+            area_to_cover: the area to cover. Defaults to the `area` filter
+                parameter.
 
         Returns:
             slice_kwargs: kwargs to pass on to loading giving the span of the
@@ -709,24 +911,36 @@ class FileYAMLReader(AbstractYAMLReader):
         """
         slice_kwargs = {}
 
-        if area is not None and self.filter_parameters.get('area') is not None:
+        if area_to_cover is None:
+            area_to_cover = self.filter_parameters.get('area')
+        if area is not None and area_to_cover is not None:
             try:
-                slices = get_area_slices(area, self.filter_parameters['area'])
-                area = get_sub_area(area, *slices)
-                slice_kwargs['xslice'], slice_kwargs['yslice'] = slices
-            except (NotImplementedError, AttributeError):
+                xslice, yslice = get_area_slices(area, area_to_cover)
+                xslice = slice(max(xslice.start, 0),
+                               min(xslice.stop, area.x_size))
+                yslice = slice(max(yslice.start, 0),
+                               min(yslice.stop, area.y_size))
+                if (xslice.start >= xslice.stop or
+                        yslice.start >= yslice.stop):
+                    raise ValueError("No data covering the area")
+                if (xslice.stop - xslice.start, yslice.stop - yslice.start) \
+                        != (area.x_size, area.y_size):
+                    area = get_sub_area(area, xslice, yslice)
+                    slice_kwargs['xslice'] = xslice
+                    slice_kwargs['yslice'] = yslice
+            except (NotImplementedError, AttributeError, ValueError):
                 logger.info("Cannot compute specific slice of data to load.")
 
         return slice_kwargs, area
 
-    def _load_dataset_with_area(self, dsid, coords):
+    def _load_dataset_with_area(self, dsid, coords, area_to_cover=None):
         """Loads *dsid* and it's area if available."""
         file_handlers = self._get_file_handlers(dsid)
         if not file_handlers:
             return
 
         area = self._load_dataset_area(dsid, file_handlers, coords)
-        slice_kwargs, area = self._get_slices(area)
+        slice_kwargs, area = self._get_slices(area, area_to_cover)
 
         try:
             ds = self._load_dataset_data(file_handlers, dsid, **slice_kwargs)
@@ -741,7 +955,7 @@ class FileYAMLReader(AbstractYAMLReader):
                 ds['x'], ds['y'] = area.get_proj_vectors_dask(CHUNK_SIZE)
         return ds
 
-    def _load_ancillary_variables(self, datasets):
+    def _load_ancillary_variables(self, datasets, area=None):
         """Load the ancillary variables of `datasets`."""
         all_av_ids = set()
         for dataset in datasets.values():
@@ -761,7 +975,7 @@ class FileYAMLReader(AbstractYAMLReader):
         if not all_av_ids:
             return
         if loadable_av_ids:
-            self.load(loadable_av_ids, previous_datasets=datasets)
+            self.load(loadable_av_ids, previous_datasets=datasets, area=area)
 
         for dataset in datasets.values():
             new_vars = []
@@ -772,10 +986,14 @@ class FileYAMLReader(AbstractYAMLReader):
                     new_vars.append(av_id)
             dataset.attrs['ancillary_variables'] = new_vars
 
-    def load(self, dataset_keys, previous_datasets=None):
+    def load(self, dataset_keys, previous_datasets=None, area=None):
         """Load `dataset_keys`.
 
-        If `previous_datasets` is provided, do not reload those."""
+        If `previous_datasets` is provided, do not reload those. If `area` is
+        provided, only the part of the datasets covering it is read when the
+        datasets are on a geostationary area. The other datasets are loaded
+        completely.
+        """
         all_datasets = previous_datasets or DatasetDict()
         datasets = DatasetDict()
 
@@ -789,11 +1007,12 @@ class FileYAMLReader(AbstractYAMLReader):
                 continue
             coords = [all_datasets.get(cid, None)
                       for cid in coordinates.get(dsid, [])]
-            ds = self._load_dataset_with_area(dsid, coords)
+            ds = self._load_dataset_with_area(dsid, coords,
+                                              area_to_cover=area)
             if ds is not None:
                 all_datasets[dsid] = ds
                 if dsid in dsids:
                     datasets[dsid] = ds
-        self._load_ancillary_variables(all_datasets)
+        self._load_ancillary_variables(all_datasets, area=area)
 
         return datasets
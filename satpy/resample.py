@@ -37,6 +37,7 @@ Resampling algorithms
     "Resampler", "Description", "Related"
     "nearest", "Nearest Neighbor", :class:`~satpy.resample.KDTreeResampler`
     "ewa", "Elliptical Weighted Averaging", :class:`~satpy.resample.EWAResampler`
+    "bilinear", "Bilinear", :class:`~satpy.resample.BilinearResampler`
     "native", "Native", :class:`~satpy.resample.NativeResampler`
 
 The resampling algorithm used can be specified with the ``resampler`` keyword
@@ -94,6 +95,18 @@ target pixels don't change over time.
 See the documentation for specific algorithms to see availability and
 limitations of caching for that algorithm.
 
+Precomputed parameters are also kept in memory in
+:data:`satpy.resample.RESAMPLE_CACHE` so that resampling the same areas in
+another `Scene` of the same process reuses them. The size of the in-memory
+and on-disk tiers of this cache can be limited and its hit and miss counts
+are available in its `stats` attribute:
+
+    >>> from satpy.resample import RESAMPLE_CACHE
+    >>> RESAMPLE_CACHE.max_entries = 4
+    >>> RESAMPLE_CACHE.max_disk_bytes = 2 * 1024 ** 3
+    >>> RESAMPLE_CACHE.stats
+    {'memory_hits': 12, 'disk_hits': 1, 'misses': 1}
+
 Create custom area definition
 -----------------------------
 
@@ -129,15 +142,21 @@ Examples coming soon...
 import hashlib
 import json
 import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from glob import glob
 from logging import getLogger
 from weakref import WeakValueDictionary
 
 import numpy as np
+import six
 import xarray as xr
 import dask
 import dask.array as da
 
-from pyresample.bilinear import get_bil_info, get_sample_from_bil_info
+from pyresample.bilinear import get_bil_info
 from pyresample.ewa import fornav, ll2cr
 from pyresample.geometry import SwathDefinition, AreaDefinition
 from pyresample.kd_tree import XArrayResamplerNN
@@ -150,6 +169,16 @@ CACHE_SIZE = 10
 
 resamplers_cache = WeakValueDictionary()
 
+CACHE_FILE_PREFIX = 'resample_lut-'
+
+# seconds after which the temporary cache files of a writer are considered
+# left over by a crashed process
+CACHE_TMP_MAX_AGE = 24 * 3600
+
+MASK_HASHES_SIZE = 100
+
+_mask_hashes = OrderedDict()
+
 
 def hash_dict(the_dict, the_hash=None):
     if the_hash is None:
@@ -158,6 +187,27 @@ def hash_dict(the_dict, the_hash=None):
     return the_hash
 
 
+def get_mask_hash(mask):
+    """Get a digest of the content of the boolean *mask* array.
+
+    The mask is computed the first time its digest is requested. Digests are
+    remembered by dask array name so they are only computed once per mask.
+    """
+    name = getattr(getattr(mask, 'data', mask), 'name', None)
+    if name is not None and name in _mask_hashes:
+        return _mask_hashes[name]
+    mask = np.asarray(mask, dtype=bool)
+    the_hash = hashlib.sha1()
+    the_hash.update(np.array(mask.shape))
+    the_hash.update(np.packbits(mask).tobytes())
+    digest = the_hash.hexdigest()
+    if name is not None:
+        _mask_hashes[name] = digest
+        while len(_mask_hashes) > MASK_HASHES_SIZE:
+            _mask_hashes.popitem(last=False)
+    return digest
+
+
 def get_area_file():
     """Find area file(s) to use.
 
@@ -180,6 +230,275 @@ def get_area_def(area_name):
     return parse_area_file(get_area_file(), area_name)[0]
 
 
+def _cache_entry_nbytes(value):
+    return sum(getattr(arr, 'nbytes', 0) for arr in value.values())
+
+
+class ResampleCache(object):
+    """Cache of precomputed resampling parameters shared by all resamplers.
+
+    Resampling parameters (kd-tree neighbour indexes, EWA columns and rows,
+    ...) are dictionaries of arrays identified by the hash of the source and
+    target geometries and of the resampling options (see
+    :meth:`BaseResampler.get_hash`). They are kept in an in-memory tier
+    holding at most `max_entries` entries and `max_bytes` bytes and, when a
+    filename is provided, on disk. Filenames ending in ``.npz`` are numpy
+    archives, other filenames are directories with one ``.npy`` file per
+    array and the chunk sizes of the dask arrays saved in them, which are
+    memory-mapped back lazily as dask arrays with the same chunks. The
+    directories of these files are limited to `max_disk_entries` entries and
+    `max_disk_bytes` bytes of ``resample_lut-*`` files. In both tiers the least recently used entries
+    are removed first. Temporary files left over by crashed processes are
+    removed once they are `CACHE_TMP_MAX_AGE` seconds old. Since the cache is shared, resampling the same
+    source and target areas from a new `Scene` reuses the parameters
+    computed previously.
+
+    The number of hits in each tier and of misses are counted in `stats`.
+
+    """
+
+    def __init__(self, max_entries=CACHE_SIZE, max_bytes=None,
+                 max_disk_entries=None, max_disk_bytes=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_disk_entries = max_disk_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.stats = {}
+        self.reset_stats()
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def reset_stats(self):
+        """Reset the hit and miss counters."""
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+
+    def clear(self):
+        """Remove all the entries of the in-memory tier."""
+        with self._lock:
+            self._entries.clear()
+
+    def get(self, key, filename=None):
+        """Get the parameters cached for *key*.
+
+        Args:
+            key: Hash identifying the parameters.
+            filename (str): File where the parameters may have been saved.
+                If not provided only the in-memory tier is looked up.
+
+        Returns:
+            The dictionary of cached arrays or None if *key* isn't cached.
+
+        """
+        with self._lock:
+            if key in self._entries:
+                # mark the entry as recently used
+                value = self._entries[key] = self._entries.pop(key)
+                self.stats['memory_hits'] += 1
+                LOG.debug("Resampling parameters found in memory")
+                return value
+        value = self._load(filename) if filename else None
+        if value is None:
+            self.stats['misses'] += 1
+            return None
+        self.stats['disk_hits'] += 1
+        LOG.debug("Resampling parameters read from %s", filename)
+        self._store(key, value)
+        return value
+
+    def put(self, key, value, filename=None):
+        """Cache the *value* dictionary of arrays for *key*.
+
+        If *filename* is provided the arrays are also saved to it and the
+        oldest cache files in its directory are removed if there are too
+        many of them. Dask arrays saved to a directory are computed chunk by
+        chunk and are replaced by lazy arrays reading the saved files.
+
+        Returns:
+            The cached dictionary of arrays.
+
+        """
+        if filename and not filename.endswith('.npz'):
+            value = self._save_dir(filename, value)
+        self._store(key, value)
+        if filename:
+            if filename.endswith('.npz'):
+                np.savez(filename, **value)
+            self._evict_files(filename)
+        return value
+
+    def _store(self, key, value):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = value
+            nbytes = sum(_cache_entry_nbytes(val)
+                         for val in self._entries.values())
+            while len(self._entries) > 1 and (
+                    (self.max_entries is not None and
+                     len(self._entries) > self.max_entries) or
+                    (self.max_bytes is not None and nbytes > self.max_bytes)):
+                _, old_value = self._entries.popitem(last=False)
+                nbytes -= _cache_entry_nbytes(old_value)
+
+    @staticmethod
+    def _save_dir(dirname, value):
+        """Save the arrays of *value* as ``.npy`` files in *dirname*."""
+        # write to a temporary directory first so that other processes never
+        # see incomplete files
+        tmp_dirname = '{}.tmp{}-{}'.format(dirname, os.getpid(),
+                                           threading.current_thread().ident)
+        if os.path.isdir(tmp_dirname):
+            # left over by a crashed process which had the same pid
+            shutil.rmtree(tmp_dirname)
+        os.makedirs(tmp_dirname)
+        try:
+            chunks = {}
+            sources = []
+            targets = []
+            for name, arr in value.items():
+                arr_chunks = getattr(arr, 'chunks', None)
+                if arr_chunks is not None:
+                    chunks[name] = arr_chunks
+                target = np.lib.format.open_memmap(
+                    os.path.join(tmp_dirname, name + '.npy'), mode='w+',
+                    dtype=arr.dtype, shape=arr.shape)
+                if arr_chunks is None:
+                    target[:] = arr
+                else:
+                    sources.append(arr)
+                    targets.append(target)
+            if sources:
+                da.store(sources, targets)
+            for target in targets:
+                target.flush()
+            with open(os.path.join(tmp_dirname, 'chunks.json'), 'w') as fd:
+                json.dump(chunks, fd)
+        except Exception:
+            shutil.rmtree(tmp_dirname, ignore_errors=True)
+            raise
+        try:
+            os.rename(tmp_dirname, dirname)
+        except OSError:
+            # another process saved the same parameters in the meantime
+            shutil.rmtree(tmp_dirname, ignore_errors=True)
+        return ResampleCache._load_dir(dirname)
+
+    @staticmethod
+    def _load_dir(dirname):
+        """Load the arrays saved in *dirname* by :meth:`_save_dir`."""
+        with open(os.path.join(dirname, 'chunks.json')) as fd:
+            chunks = json.load(fd)
+        value = {}
+        for filename in glob(os.path.join(dirname, '*.npy')):
+            name = os.path.splitext(os.path.basename(filename))[0]
+            arr = np.load(filename, mmap_mode='r')
+            if name in chunks:
+                arr = da.from_array(arr, chunks=tuple(
+                    tuple(dim_chunks) for dim_chunks in chunks[name]))
+            value[name] = arr
+        return value
+
+    @staticmethod
+    def _load(filename):
+        if os.path.isdir(filename):
+            try:
+                value = ResampleCache._load_dir(filename)
+            except (IOError, OSError, ValueError):
+                return None
+            try:
+                os.utime(filename, None)
+            except OSError:
+                pass
+            return value
+        try:
+            cache = np.load(filename, mmap_mode='r')
+        except (IOError, OSError):
+            return None
+        # copy the dict so we can modify it's keys
+        value = dict(cache.items())
+        cache.close()
+        try:
+            # mark the file as recently used
+            os.utime(filename, None)
+        except OSError:
+            pass
+        return value
+
+    @staticmethod
+    def _remove_stale_tmp(filename):
+        """Remove the temporary *filename* if it wasn't modified recently.
+
+        Temporary files and directories (see `_save_dir`) are being written
+        by other processes, unless these crashed before renaming them.
+        """
+        try:
+            mtime = max(os.path.getmtime(sub_filename) for sub_filename
+                        in [filename] + glob(os.path.join(filename, '*')))
+            if time.time() - mtime < CACHE_TMP_MAX_AGE:
+                return
+            LOG.debug("Removing stale resampling cache file %s", filename)
+            if os.path.isdir(filename):
+                shutil.rmtree(filename)
+            else:
+                os.remove(filename)
+        except OSError:
+            pass
+
+    def _evict_files(self, new_filename):
+        """Remove the least recently used cache files next to *new_filename*."""
+        if self.max_disk_entries is None and self.max_disk_bytes is None:
+            return
+        cache_dir = os.path.dirname(new_filename) or '.'
+        files = []
+        for filename in glob(os.path.join(cache_dir, CACHE_FILE_PREFIX + '*')):
+            if '.tmp' in os.path.basename(filename):
+                self._remove_stale_tmp(filename)
+                continue
+            try:
+                stat = os.stat(filename)
+                size = stat.st_size
+                if os.path.isdir(filename):
+                    size = sum(os.path.getsize(sub_filename) for sub_filename
+                               in glob(os.path.join(filename, '*')))
+            except OSError:
+                continue
+            files.append((stat.st_mtime, size, filename))
+        files.sort()
+        nbytes = sum(size for _, size, _ in files)
+        while len(files) > 1 and (
+                (self.max_disk_entries is not None and
+                 len(files) > self.max_disk_entries) or
+                (self.max_disk_bytes is not None and
+                 nbytes > self.max_disk_bytes)):
+            _, size, filename = files.pop(0)
+            LOG.debug("Removing old resampling cache file %s", filename)
+            try:
+                if os.path.isdir(filename):
+                    shutil.rmtree(filename)
+                else:
+                    os.remove(filename)
+            except OSError:
+                continue
+            nbytes -= size
+
+
+RESAMPLE_CACHE = ResampleCache()
+
+
 class BaseResampler(object):
     """Base abstract resampler class."""
 
@@ -198,7 +517,14 @@ class BaseResampler(object):
         self.target_geo_def = target_geo_def
 
     def get_hash(self, source_geo_def=None, target_geo_def=None, **kwargs):
-        """Get hash for the current resample with the given *kwargs*."""
+        """Get hash for the current resample with the given *kwargs*.
+
+        A `mask` array in *kwargs* is replaced by a digest of its content
+        (see :func:`get_mask_hash`).
+        """
+        mask = kwargs.get('mask')
+        if mask is not None and not isinstance(mask, six.string_types):
+            kwargs['mask'] = get_mask_hash(mask)
         if source_geo_def is None:
             source_geo_def = self.source_geo_def
         if target_geo_def is None:
@@ -268,18 +594,25 @@ class BaseResampler(object):
         cache_dir = cache_dir or '.'
         hash_str = self.get_hash(**kwargs)
 
-        return os.path.join(cache_dir, 'resample_lut-' + hash_str + '.npz')
+        return os.path.join(cache_dir, CACHE_FILE_PREFIX + hash_str + '.npz')
 
 
 class KDTreeResampler(BaseResampler):
     """Resample using a KDTree-based nearest neighbor algorithm.
 
-    This resampler implements on-disk caching when the `cache_dir` argument
-    is provided to the `resample` method. This should provide significant
-    performance improvements on consecutive resampling of geostationary data.
-    It is not recommended to provide `cache_dir` when the `mask` keyword
-    argument is provided to `precompute` which occurs by default for
-    `SwathDefinition` source areas.
+    The neighbour indexes are kept in the shared `RESAMPLE_CACHE` and
+    saved to disk when the `cache_dir` argument is provided to the
+    `resample` method. This should provide significant performance
+    improvements on consecutive resampling of geostationary data. The
+    indexes are only computed when `resample` is called if they are saved
+    to `cache_dir`, they are kept as lazy dask arrays in memory otherwise.
+
+    The `mask` provided to `precompute`, which is the default for
+    `SwathDefinition` source areas, is part of the cache key. When a
+    `cache_dir` is provided the mask is computed to key the cache by a
+    digest of its content, so the same granule reprocessed or resampled to
+    several areas reuses the cached indexes. Otherwise the in-memory cache
+    is keyed by the dask name of the mask, which stays lazy.
 
     Args:
         cache_dir (str): Long term storage directory for intermediate
@@ -298,7 +631,6 @@ class KDTreeResampler(BaseResampler):
     def __init__(self, source_geo_def, target_geo_def):
         super(KDTreeResampler, self).__init__(source_geo_def, target_geo_def)
         self.resampler = None
-        self._index_caches = {}
 
     def precompute(self, mask=None, radius_of_influence=None, epsilon=0,
                    cache_dir=None, **kwargs):
@@ -311,12 +643,6 @@ class KDTreeResampler(BaseResampler):
         del kwargs
         source_geo_def = self.source_geo_def
 
-        if mask is not None and cache_dir is not None:
-            LOG.warning("Mask and cache_dir both provided to nearest "
-                        "resampler. Cached parameters are affected by "
-                        "masked pixels. Will not cache results.")
-            cache_dir = None
-
         if radius_of_influence is None:
             try:
                 radius_of_influence = source_geo_def.lons.resolution * 3
@@ -343,47 +669,59 @@ class KDTreeResampler(BaseResampler):
 
     def _apply_cached_indexes(self, cached_indexes, persist=False):
         """Reassign various resampler index attributes."""
-        # cacheable_dict = {}
-        for elt in ['valid_input_index', 'valid_output_index',
-                    'index_array', 'distance_array']:
+        elts = ['valid_input_index', 'valid_output_index',
+                'index_array', 'distance_array']
+        if persist:
+            # persist all arrays at once so shared tasks are computed once
+            to_persist = [elt for elt in elts
+                          if isinstance(cached_indexes[elt], da.Array)]
+            persisted = dask.persist(*[cached_indexes[elt]
+                                       for elt in to_persist])
+            cached_indexes.update(zip(to_persist, persisted))
+        for elt in elts:
             val = cached_indexes[elt]
             if isinstance(val, tuple):
                 val = cached_indexes[elt][0]
             elif isinstance(val, np.ndarray):
                 val = da.from_array(val, chunks=CHUNK_SIZE)
-            elif persist and isinstance(val, da.Array):
-                cached_indexes[elt] = val = val.persist()
             setattr(self.resampler, elt, val)
 
+    def _get_cache_key_and_filename(self, cache_dir, mask=None, **kwargs):
+        mask_name = getattr(getattr(mask, 'data', mask), 'name', None)
+        if mask is not None and (cache_dir or mask_name is None):
+            # files can be reused by other processes where the mask is a
+            # different dask array, so the mask content identifies them
+            mask_key = mask
+        else:
+            # in memory the dask name (token) of the mask identifies it
+            mask_key = mask_name
+        cache_key = self.get_hash(mask=mask_key, **kwargs)
+        filename = None
+        if cache_dir:
+            filename = self._create_cache_filename(cache_dir,
+                                                   mask=mask_key, **kwargs)
+        return cache_key, filename
+
     def load_neighbour_info(self, cache_dir, mask=None, **kwargs):
         """Read index arrays from either the in-memory or disk cache."""
-        mask_name = getattr(mask, 'name', None)
-        filename = self._create_cache_filename(cache_dir,
-                                               mask=mask_name, **kwargs)
-        if kwargs.get('mask') in self._index_caches:
-            self._apply_cached_indexes(self._index_caches[kwargs.get('mask')])
-        elif cache_dir:
-            cache = np.load(filename, mmap_mode='r')
-            # copy the dict so we can modify it's keys
-            new_cache = dict(cache.items())
-            cache.close()
-            self._apply_cached_indexes(new_cache)  # modifies cache dict in-place
-            self._index_caches[mask_name] = new_cache
-        else:
+        cache_key, filename = self._get_cache_key_and_filename(
+            cache_dir, mask=mask, **kwargs)
+        cache = RESAMPLE_CACHE.get(cache_key, filename)
+        if cache is None:
             raise IOError
+        self._apply_cached_indexes(cache)
 
     def save_neighbour_info(self, cache_dir, mask=None, **kwargs):
-        """Cache resampler's index arrays if there is a cache dir."""
-        if cache_dir:
-            mask_name = getattr(mask, 'name', None)
-            filename = self._create_cache_filename(
-                cache_dir, mask=mask_name, **kwargs)
+        """Cache resampler's index arrays in memory and in the cache dir."""
+        cache_key, filename = self._get_cache_key_and_filename(
+            cache_dir, mask=mask, **kwargs)
+        cache = self._read_resampler_attrs()
+        if filename:
             LOG.info('Saving kd_tree neighbour info to %s', filename)
-            cache = self._read_resampler_attrs()
-            # update the cache in place with persisted dask arrays
+            # update the cache in place with persisted dask arrays so that
+            # the indexes are only computed once when written to the file
             self._apply_cached_indexes(cache, persist=True)
-            self._index_caches[mask_name] = cache
-            np.savez(filename, **cache)
+        RESAMPLE_CACHE.put(cache_key, cache, filename)
 
     def _read_resampler_attrs(self):
         """Read certain attributes from the resampler for caching."""
@@ -403,8 +741,12 @@ class KDTreeResampler(BaseResampler):
 class EWAResampler(BaseResampler):
     """Resample using an elliptical weighted averaging algorithm.
 
-    This algorithm does **not** use caching or any externally provided data
-    mask (unlike the 'nearest' resampler).
+    This algorithm does **not** use any externally provided data mask
+    (unlike the 'nearest' resampler). The columns and rows computed for a
+    source and target area are kept in the shared `RESAMPLE_CACHE` in memory
+    and, when `cache_dir` is provided, saved in a ``resample_lut-*``
+    directory of `cache_dir`. They are read back lazily from there, with the
+    chunks of the source area, the next time the same areas are resampled.
 
     This algorithm works under the assumption that the data is observed
     one scan line at a time. However, good results can still be achieved
@@ -441,6 +783,9 @@ class EWAResampler(BaseResampler):
             If True, the swath cell having the maximum weight of all
             swath cells that map to a particular grid cell is used. This
             option should be used for coded/category data, i.e. snow cover.
+        tile_size (int, tuple):
+            Compute the target area in independent tiles of this size
+            instead of in one task (see :meth:`EWAResampler.compute`).
 
     """
 
@@ -492,26 +837,30 @@ class EWAResampler(BaseResampler):
         source_geo_def = self.source_geo_def
         target_geo_def = self.target_geo_def
 
+        cache_key = self.get_hash(mode='ewa', swath_usage=swath_usage)
+        filename = None
         if cache_dir:
-            LOG.warning("'cache_dir' is not used by EWA resampling")
-
-        # SatPy/PyResample don't support dynamic grids out of the box yet
-        lons, lats = source_geo_def.get_lonlats()
-        # we are remapping to a static unchanging grid/area with all of
-        # its parameters specified
-        chunks = (2,) + lons.chunks
-        res = da.map_blocks(self._call_ll2cr, lons.data, lats.data,
-                            target_geo_def, swath_usage,
-                            dtype=lons.dtype, chunks=chunks, new_axis=[0])
-        cols = res[0]
-        rows = res[1]
-
-        # save the dask arrays in the class instance cache
-        # the on-disk cache will store the numpy arrays
-        self.cache = {
-            "rows": rows,
-            "cols": cols,
-        }
+            filename = os.path.splitext(self._create_cache_filename(
+                cache_dir, mode='ewa', swath_usage=swath_usage))[0]
+        cache = RESAMPLE_CACHE.get(cache_key, filename)
+        if cache is None:
+            # SatPy/PyResample don't support dynamic grids out of the box yet
+            lons, lats = source_geo_def.get_lonlats()
+            # we are remapping to a static unchanging grid/area with all of
+            # its parameters specified
+            chunks = (2,) + lons.chunks
+            res = da.map_blocks(self._call_ll2cr, lons.data, lats.data,
+                                target_geo_def, swath_usage,
+                                dtype=lons.dtype, chunks=chunks, new_axis=[0])
+            cache = {
+                "rows": res[1],
+                "cols": res[0],
+            }
+            cache = RESAMPLE_CACHE.put(cache_key, cache, filename)
+
+        # the dask arrays are shared with other resamplers for the same
+        # source and target areas
+        self.cache = cache
 
         return None
 
@@ -538,11 +887,120 @@ class EWAResampler(BaseResampler):
 
         return res
 
+    @staticmethod
+    def _get_scan_extents(cols, rows, rows_per_scan):
+        """Get the min/max columns and rows of the pixels of every scan.
+
+        Scans without any valid pixel have NaN extents.
+        """
+        nscans = int(np.ceil(cols.shape[0] / float(rows_per_scan)))
+        extents = np.full((nscans, 4), np.nan)
+        for scan_idx in range(nscans):
+            scan_slice = slice(scan_idx * rows_per_scan,
+                               (scan_idx + 1) * rows_per_scan)
+            scan_cols = cols[scan_slice]
+            scan_rows = rows[scan_slice]
+            valid = ~(np.isnan(scan_cols) | np.isnan(scan_rows))
+            if valid.any():
+                extents[scan_idx] = (scan_cols[valid].min(),
+                                     scan_cols[valid].max(),
+                                     scan_rows[valid].min(),
+                                     scan_rows[valid].max())
+        return extents
+
+    def _call_fornav_tile(self, cols, rows, data, extents, y_slice, x_slice,
+                          rows_per_scan, weight_distance_max=1.0,
+                          weight_delta_max=1.0, **kwargs):
+        """Run fornav for one tile of the target area.
+
+        Only the scans that can reach the tile are used and the columns and
+        rows are shifted to the tile's origin.
+        """
+        data = data if isinstance(data, tuple) else (data, )
+        # the footprint of a swath pixel spreads over at most this many grid
+        # cells around it
+        margin = max(weight_delta_max, weight_distance_max) + 1
+        with np.errstate(invalid='ignore'):
+            use_scan = ((extents[:, 0] - margin < x_slice.stop) &
+                        (extents[:, 1] + margin >= x_slice.start) &
+                        (extents[:, 2] - margin < y_slice.stop) &
+                        (extents[:, 3] + margin >= y_slice.start))
+        # fornav ignores pixels left of or above its grid, so the tile is
+        # computed in a grid padded on these sides (but not beyond the
+        # edges of the target area)
+        y_pad = min(int(np.ceil(margin)), y_slice.start)
+        x_pad = min(int(np.ceil(margin)), x_slice.start)
+        grid_shape = (y_slice.stop - y_slice.start + y_pad,
+                      x_slice.stop - x_slice.start + x_pad)
+        res = tuple(np.full(grid_shape, np.nan, dtype=arr.dtype)
+                    for arr in data)
+        if use_scan.any():
+            swath_rows = np.concatenate([
+                np.arange(scan_idx * rows_per_scan,
+                          min((scan_idx + 1) * rows_per_scan, cols.shape[0]))
+                for scan_idx in np.nonzero(use_scan)[0]])
+            try:
+                _, res = fornav(cols[swath_rows] - (x_slice.start - x_pad),
+                                rows[swath_rows] - (y_slice.start - y_pad),
+                                self.target_geo_def,
+                                tuple(arr[swath_rows] for arr in data),
+                                rows_per_scan=rows_per_scan, out=res,
+                                weight_distance_max=weight_distance_max,
+                                weight_delta_max=weight_delta_max, **kwargs)
+                res = res if isinstance(res, tuple) else (res, )
+            except RuntimeError:
+                # the scans only come close to the tile, it stays empty
+                LOG.debug("No swath pixels found in tile %s, %s",
+                          y_slice, x_slice)
+        res = tuple(arr[y_pad:, x_pad:] for arr in res)
+        if len(data) == 1:
+            return res[0]
+        return np.stack(res)
+
+    def _compute_tiled(self, cols, rows, data_in, dtype, tile_size,
+                       rows_per_scan, **kwargs):
+        """Resample *data_in* tile by tile of the target area."""
+        extents = dask.delayed(self._get_scan_extents)(cols, rows,
+                                                       rows_per_scan)
+        y_chunks, x_chunks = da.core.normalize_chunks(
+            tile_size, self.target_geo_def.shape)
+        y_bounds = np.cumsum((0, ) + y_chunks)
+        x_bounds = np.cumsum((0, ) + x_chunks)
+        blocks = []
+        for y_start, y_stop in zip(y_bounds[:-1], y_bounds[1:]):
+            block_row = []
+            for x_start, x_stop in zip(x_bounds[:-1], x_bounds[1:]):
+                y_slice = slice(int(y_start), int(y_stop))
+                x_slice = slice(int(x_start), int(x_stop))
+                tile = dask.delayed(self._call_fornav_tile)(
+                    cols, rows, data_in, extents, y_slice, x_slice,
+                    rows_per_scan, **kwargs)
+                tile_shape = (y_stop - y_start, x_stop - x_start)
+                if isinstance(data_in, tuple):
+                    tile_shape = (len(data_in), ) + tile_shape
+                block_row.append(da.from_delayed(tile, tile_shape, dtype))
+            blocks.append(block_row)
+        if isinstance(data_in, tuple):
+            # the bands are one block deep
+            blocks = [blocks]
+        return da.block(blocks)
+
     def compute(self, data, cache_id=None, fill_value=0, weight_count=10000,
                 weight_min=0.01, weight_distance_max=1.0,
                 weight_delta_max=1.0, weight_sum_min=-1.0,
-                maximum_weight_mode=False, grid_coverage=0, **kwargs):
-        """Resample the data according to the precomputed X/Y coordinates."""
+                maximum_weight_mode=False, grid_coverage=0, tile_size=None,
+                **kwargs):
+        """Resample the data according to the precomputed X/Y coordinates.
+
+        By default `fornav` is called once for the whole swath and target
+        area. If `tile_size` is provided (an int or a `(rows, cols)` tuple)
+        the target area is split in tiles of this size instead and every
+        tile is computed as an independent dask chunk from the scans that
+        overlap it. The results are the same, but the tiles can be computed
+        in parallel and the whole target area doesn't have to be held in
+        memory by one task. `grid_coverage` is not checked in tiled mode.
+
+        """
         rows = self.cache["rows"]
         cols = self.cache["cols"]
 
@@ -561,20 +1019,30 @@ class EWAResampler(BaseResampler):
         else:
             raise ValueError("Unsupported data shape for EWA resampling.")
 
-        res = dask.delayed(self._call_fornav)(
-            cols, rows, self.target_geo_def, data_in,
-            grid_coverage=grid_coverage,
-            rows_per_scan=rows_per_scan, weight_count=weight_count,
-            weight_min=weight_min, weight_distance_max=weight_distance_max,
+        fornav_kwargs = dict(
+            weight_count=weight_count, weight_min=weight_min,
+            weight_distance_max=weight_distance_max,
             weight_delta_max=weight_delta_max, weight_sum_min=weight_sum_min,
             maximum_weight_mode=maximum_weight_mode)
-        if isinstance(data_in, tuple):
-            new_shape = (len(data_in),) + self.target_geo_def.shape
+        if tile_size is not None:
+            if grid_coverage:
+                LOG.warning("'grid_coverage' is not checked by tiled EWA "
+                            "resampling")
+            data_arr = self._compute_tiled(cols, rows, data_in, data.dtype,
+                                           tile_size, rows_per_scan,
+                                           **fornav_kwargs)
         else:
-            new_shape = self.target_geo_def.shape
-        data_arr = da.from_delayed(res, new_shape, data.dtype)
-        # from delayed creates one large chunk, break it up a bit if we can
-        data_arr = data_arr.rechunk([CHUNK_SIZE] * data_arr.ndim)
+            res = dask.delayed(self._call_fornav)(
+                cols, rows, self.target_geo_def, data_in,
+                grid_coverage=grid_coverage, rows_per_scan=rows_per_scan,
+                **fornav_kwargs)
+            if isinstance(data_in, tuple):
+                new_shape = (len(data_in),) + self.target_geo_def.shape
+            else:
+                new_shape = self.target_geo_def.shape
+            data_arr = da.from_delayed(res, new_shape, data.dtype)
+            # from delayed creates one large chunk, break it up a bit if we can
+            data_arr = data_arr.rechunk([CHUNK_SIZE] * data_arr.ndim)
         if data.ndim == 3 and data.dims[0] == 'bands':
             dims = ('bands', 'y', 'x')
         elif data.ndim == 2:
@@ -587,78 +1055,188 @@ class EWAResampler(BaseResampler):
 
 
 class BilinearResampler(BaseResampler):
-    """Resample using bilinear."""
+    """Resample using bilinear interpolation.
 
-    def precompute(self, mask=None, radius_of_influence=50000,
-                   cache_dir=None, **kwargs):
-        """Create bilinear coefficients and store them for later use.
+    The interpolation coefficients are computed independently for every
+    chunk of the target area, as dask arrays chunked like the resampled
+    data. They are kept in the shared `RESAMPLE_CACHE` and, when `cache_dir`
+    is provided, saved in a ``resample_lut-*`` directory of `cache_dir` from
+    which they are read back lazily the next time the same areas are
+    resampled.
+
+    The coefficients of each target chunk come from their own call to
+    pyresample's `get_bil_info`, so the KD-tree isn't shared between the
+    chunks: every chunk scans the coordinates of the whole source area to
+    select the source pixels within reach, then builds a KD-tree of these
+    pixels only. The total cost grows with the number of target chunks
+    times the size of the source area.
+
+    Like the 'ewa' resampler, this resampler does not use the `mask` of
+    invalid data: invalid source pixels give invalid resampled pixels.
+
+    Args:
+        radius_of_influence (float): Search radius cut off distance in meters
+        neighbours (int): Number of neighbours to consider for each target
+                          pixel when searching the four corner points
+                          around it.
+
+    """
+
+    def __init__(self, source_geo_def, target_geo_def):
+        super(BilinearResampler, self).__init__(source_geo_def,
+                                                target_geo_def)
+        self.cache = {}
+
+    def resample(self, *args, **kwargs):
+        """Run precompute and compute methods.
+
+        .. note::
+
+            This sets the default of 'mask_area' to False since the mask
+            is not used in bilinear resampling.
 
-        Note: The `mask` keyword should be provided if geolocation may be valid
-        where data points are invalid. This defaults to the `mask` attribute of
-        the `data` numpy masked array passed to the `resample` method.
         """
+        kwargs.setdefault('mask_area', False)
+        return super(BilinearResampler, self).resample(*args, **kwargs)
 
-        raise NotImplementedError("Bilinear interpolation has not been "
-                                  "converted to XArray/Dask yet.")
+    @staticmethod
+    def _get_block_bil_info(source_geo_def, target_geo_def,
+                            radius_of_influence, neighbours, *lonlats):
+        """Get the coefficients for the *target_geo_def* block.
 
+        The source indexes returned are indexes in the flattened source
+        area. If `lonlats` are provided they replace the (dask-based)
+        coordinates of `source_geo_def`.
+        """
+        if lonlats:
+            source_geo_def = SwathDefinition(*lonlats)
+        shape = target_geo_def.shape
+        try:
+            bilinear_t, bilinear_s, input_idxs, idx_ref = get_bil_info(
+                source_geo_def, target_geo_def, radius_of_influence,
+                neighbours=neighbours, masked=False)
+        except IndexError:
+            # no source pixel within reach of this block
+            return (np.full(shape, np.nan), np.full(shape, np.nan),
+                    np.zeros(shape + (4, ), dtype=np.int64))
+        idx_arr = np.flatnonzero(input_idxs)[idx_ref]
+        return (bilinear_t.reshape(shape), bilinear_s.reshape(shape),
+                idx_arr.reshape(shape + (4, )))
+
+    def precompute(self, mask=None, radius_of_influence=50000, neighbours=32,
+                   cache_dir=None, **kwargs):
+        """Create bilinear coefficients and store them for later use."""
+        if mask is not None:
+            LOG.warning("'mask' parameter has no affect during bilinear "
+                        "resampling")
         del kwargs
         source_geo_def = self.source_geo_def
+        target_geo_def = self.target_geo_def
 
-        bil_hash = self.get_hash(source_geo_def=source_geo_def,
-                                 radius_of_influence=radius_of_influence,
-                                 mode="bilinear")
-
-        filename = self._create_cache_filename(cache_dir, bil_hash)
-        self._read_params_from_cache(cache_dir, bil_hash, filename)
-
-        if self.cache is not None:
-            LOG.debug("Loaded bilinear parameters")
-            return self.cache
-        else:
+        cache_key = self.get_hash(radius_of_influence=radius_of_influence,
+                                  neighbours=neighbours, mode='bilinear')
+        filename = None
+        if cache_dir:
+            filename = os.path.splitext(self._create_cache_filename(
+                cache_dir, radius_of_influence=radius_of_influence,
+                neighbours=neighbours, mode='bilinear'))[0]
+        cache = RESAMPLE_CACHE.get(cache_key, filename)
+        if cache is None:
             LOG.debug("Computing bilinear parameters")
+            lonlats = ()
+            if isinstance(source_geo_def, SwathDefinition):
+                # the coordinates are computed once for all blocks
+                lonlats = tuple(getattr(arr, 'data', arr) for arr in
+                                (source_geo_def.lons, source_geo_def.lats))
+            y_chunks, x_chunks = da.core.normalize_chunks(
+                CHUNK_SIZE, target_geo_def.shape)
+            y_bounds = np.cumsum((0, ) + y_chunks)
+            x_bounds = np.cumsum((0, ) + x_chunks)
+            blocks = {'bilinear_t': [], 'bilinear_s': [], 'idx_arr': []}
+            for y_start, y_stop in zip(y_bounds[:-1], y_bounds[1:]):
+                block_rows = {name: [] for name in blocks}
+                for x_start, x_stop in zip(x_bounds[:-1], x_bounds[1:]):
+                    block_area = target_geo_def[int(y_start):int(y_stop),
+                                                int(x_start):int(x_stop)]
+                    res = dask.delayed(self._get_block_bil_info, nout=3)(
+                        source_geo_def, block_area, radius_of_influence,
+                        neighbours, *lonlats)
+                    shape = block_area.shape
+                    block_rows['bilinear_t'].append(
+                        da.from_delayed(res[0], shape, np.float64))
+                    block_rows['bilinear_s'].append(
+                        da.from_delayed(res[1], shape, np.float64))
+                    block_rows['idx_arr'].append(
+                        da.from_delayed(res[2], shape + (4, ), np.int64))
+                for name, block_row in block_rows.items():
+                    blocks[name].append(block_row)
+            cache = {}
+            for name, name_blocks in blocks.items():
+                if name == 'idx_arr':
+                    name_blocks = [[[block] for block in block_row]
+                                   for block_row in name_blocks]
+                cache[name] = da.block(name_blocks)
+            if filename is not None or not isinstance(source_geo_def,
+                                                      SwathDefinition):
+                # compute the coefficients once for all the datasets
+                cache = dict(zip(cache.keys(),
+                                 dask.persist(*cache.values())))
+            cache = RESAMPLE_CACHE.put(cache_key, cache, filename)
+        else:
+            LOG.debug("Loaded bilinear parameters")
 
-        bilinear_t, bilinear_s, input_idxs, idx_arr = get_bil_info(source_geo_def, self.target_geo_def,
-                                                                   radius_of_influence, neighbours=32,
-                                                                   masked=False)
-        self.cache = {'bilinear_s': bilinear_s,
-                      'bilinear_t': bilinear_t,
-                      'input_idxs': input_idxs,
-                      'idx_arr': idx_arr}
+        # the dask arrays are shared with other resamplers for the same
+        # source and target areas
+        self.cache = cache
 
-        self._update_caches(bil_hash, cache_dir, filename)
+        return None
 
-        return self.cache
+    @staticmethod
+    def _get_sample_block(data, bilinear_t, bilinear_s, idx_arr, dtype):
+        """Interpolate the flattened source *data* for one target block."""
+        corners = data[:, idx_arr]
+        res = (corners[..., 0] * (1 - bilinear_s) * (1 - bilinear_t) +
+               corners[..., 1] * bilinear_s * (1 - bilinear_t) +
+               corners[..., 2] * (1 - bilinear_s) * bilinear_t +
+               corners[..., 3] * bilinear_s * bilinear_t)
+        return res.astype(dtype)
 
     def compute(self, data, fill_value=None, **kwargs):
-        """Resample the given data using bilinear interpolation"""
+        """Resample the given data using bilinear interpolation."""
         del kwargs
-
-        target_shape = self.target_geo_def.shape
-        if data.ndim == 3:
-            output_shape = list(target_shape)
-            output_shape.append(data.shape[-1])
-            res = np.zeros(output_shape, dtype=data.dtype)
-            for i in range(data.shape[-1]):
-                res[:, :, i] = get_sample_from_bil_info(data[:, :, i].ravel(),
-                                                        self.cache[
-                                                            'bilinear_t'],
-                                                        self.cache[
-                                                            'bilinear_s'],
-                                                        self.cache[
-                                                            'input_idxs'],
-                                                        self.cache['idx_arr'],
-                                                        output_shape=target_shape)
-
+        if data.ndim == 3 and data.dims[0] == 'bands':
+            dims = ('bands', 'y', 'x')
+        elif data.ndim == 2:
+            dims = ('y', 'x')
         else:
-            res = get_sample_from_bil_info(data.ravel(),
-                                           self.cache['bilinear_t'],
-                                           self.cache['bilinear_s'],
-                                           self.cache['input_idxs'],
-                                           self.cache['idx_arr'],
-                                           output_shape=target_shape)
-        res = np.ma.masked_invalid(res)
-
-        return res
+            raise ValueError("Unsupported data shape for bilinear "
+                             "resampling.")
+        # the source data is flattened once and shared by all the blocks
+        flat_data = data.data.reshape((-1, np.prod(data.shape[-2:])))
+        dtype = np.result_type(data.dtype, np.float32)
+        # don't optimize the graphs separately, that would duplicate the
+        # computation of the coefficients shared by the three arrays
+        t_blocks = self.cache['bilinear_t'].to_delayed(optimize_graph=False)
+        s_blocks = self.cache['bilinear_s'].to_delayed(optimize_graph=False)
+        idx_blocks = self.cache['idx_arr'].to_delayed(optimize_graph=False)
+        y_chunks, x_chunks = self.cache['bilinear_t'].chunks
+        blocks = []
+        for i, y_size in enumerate(y_chunks):
+            block_row = []
+            for j, x_size in enumerate(x_chunks):
+                res = dask.delayed(self._get_sample_block)(
+                    flat_data, t_blocks[i, j], s_blocks[i, j],
+                    idx_blocks[i, j, 0], dtype)
+                block_row.append(da.from_delayed(
+                    res, (flat_data.shape[0], y_size, x_size), dtype))
+            blocks.append(block_row)
+        res = da.block([blocks])
+        if len(dims) == 2:
+            res = res[0]
+        if fill_value is not None:
+            res = da.where(da.isnan(res), fill_value, res)
+
+        return xr.DataArray(res, dims=dims, attrs=data.attrs.copy())
 
 
 class NativeResampler(BaseResampler):
@@ -796,7 +1374,7 @@ class NativeResampler(BaseResampler):
 RESAMPLERS = {"kd_tree": KDTreeResampler,
               "nearest": KDTreeResampler,
               "ewa": EWAResampler,
-              # "bilinear": BilinearResampler,
+              "bilinear": BilinearResampler,
               "native": NativeResampler,
               }
 
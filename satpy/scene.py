@@ -27,12 +27,13 @@
 import logging
 import os
 
-from satpy.composites import CompositorLoader, IncompatibleAreas
+from satpy.composites import (AngleProvider, CompositorLoader,
+                              IncompatibleAreas)
 from satpy.config import get_environ_config_dir
 from satpy.dataset import (DatasetID, MetadataObject, dataset_walker,
                            replace_anc)
 from satpy.node import DependencyTree
-from satpy.readers import DatasetDict, load_readers
+from satpy.readers import DatasetDict, DatasetIDIndex, load_readers
 from satpy.resample import (resample_dataset,
                             prepare_resampler, get_area_def)
 from satpy.writers import load_writer
@@ -156,7 +157,10 @@ class Scene(MetadataObject):
         comps, mods = self.cpl.load_compositors(self.attrs['sensor'])
         self.wishlist = set()
         self.dep_tree = DependencyTree(self.readers, comps, mods)
+        self._available_comps_cache = {}
         self.resamplers = {}
+        # sun/satellite angles shared by the compositors of this scene
+        self.angle_provider = AngleProvider()
 
     def _ipython_key_completions_(self):
         return [x.name for x in self.datasets.keys()]
@@ -186,6 +190,16 @@ class Scene(MetadataObject):
         else:
             return set(self.attrs['sensor'])
 
+    def close(self):
+        """Close the files kept open by the readers of this Scene.
+
+        Datasets already loaded can still be computed afterwards, the files
+        are reopened when needed.
+
+        """
+        for reader_instance in self.readers.values():
+            reader_instance.close()
+
     def create_reader_instances(self,
                                 filenames=None,
                                 reader=None,
@@ -344,6 +358,9 @@ class Scene(MetadataObject):
         """Get names of compositors that can be generated from the available
         datasets.
 
+        The result is cached in the Scene for the available datasets and the
+        compositor configurations loaded.
+
         :return: generator of available compositor's names
         """
         if available_datasets is None:
@@ -353,15 +370,29 @@ class Scene(MetadataObject):
                 raise ValueError(
                     "'available_datasets' must all be DatasetID objects")
 
+        sensor_names = sorted(self.attrs['sensor'])
+        cache_key = (frozenset(available_datasets),
+                     tuple((sensor_name,
+                            id(self.cpl.compositors.get(sensor_name)),
+                            id(self.cpl.modifiers.get(sensor_name)))
+                           for sensor_name in sensor_names))
+        try:
+            return list(self._available_comps_cache[cache_key])
+        except KeyError:
+            pass
+
         all_comps = self.all_composite_ids()
-        # recreate the dependency tree so it doesn't interfere with the user's
-        # wishlist
+        # use a separate dependency tree so it doesn't interfere with the
+        # user's wishlist
         comps, mods = self.cpl.load_compositors(self.attrs['sensor'])
         dep_tree = DependencyTree(self.readers, comps, mods)
-        dep_tree.find_dependencies(set(available_datasets + all_comps))
-        available_comps = set(x.name for x in dep_tree.trunk())
-        # get rid of modified composites that are in the trunk
-        return sorted(available_comps & set(all_comps))
+        available_ids = DatasetIDIndex(available_datasets)
+        checked = {}
+        available_comps = [comp_id for comp_id in all_comps
+                           if dep_tree.is_available(comp_id, available_ids,
+                                                    checked)]
+        self._available_comps_cache[cache_key] = available_comps
+        return list(available_comps)
 
     def available_composite_names(self, available_datasets=None):
         return sorted(set(x.name for x in self.available_composite_ids(
@@ -428,6 +459,7 @@ class Scene(MetadataObject):
         new_scn = self.__class__()
         new_scn.attrs = self.attrs.copy()
         new_scn.dep_tree = self.dep_tree.copy()
+        new_scn.angle_provider = self.angle_provider
 
         for ds_id in (datasets or self.keys()):
             # NOTE: Must use `.datasets` or side effects of `__setitem__`
@@ -744,9 +776,10 @@ class Scene(MetadataObject):
         )
 
         try:
-            composite = compositor(prereq_datasets,
-                                   optional_datasets=optional_datasets,
-                                   **self.attrs)
+            with self.angle_provider:
+                composite = compositor(prereq_datasets,
+                                       optional_datasets=optional_datasets,
+                                       **self.attrs)
 
             cid = DatasetID.from_dict(composite.attrs)
 
@@ -768,7 +801,14 @@ class Scene(MetadataObject):
             return
 
     def _read_composites(self, compositor_nodes):
-        """Read (generate) composites."""
+        """Read (generate) composites.
+
+        Composites are generated in the order of `compositor_nodes`. When
+        prerequisites come before the composites depending on them (see
+        `DependencyTree.trunk_order`) no composite has to be generated
+        recursively.
+
+        """
         keepables = set()
         for item in compositor_nodes:
             self._generate_composite(item, keepables)
@@ -795,8 +835,9 @@ class Scene(MetadataObject):
         """
         if nodes is None:
             required_nodes = self.wishlist - set(self.datasets.keys())
-            nodes = set(self.dep_tree.trunk(nodes=required_nodes)) - \
-                set(self.datasets.keys())
+            nodes = [node for node in
+                     self.dep_tree.trunk_order(nodes=required_nodes)
+                     if node.name not in self.datasets]
         return self._read_composites(nodes)
 
     def _remove_failed_datasets(self, keepables):
@@ -828,7 +869,7 @@ class Scene(MetadataObject):
 
     def load(self, wishlist, calibration=None, resolution=None,
              polarization=None, level=None, generate=True, unload=True,
-             **kwargs):
+             area=None, ll_bbox=None, **kwargs):
         """Read and generate requested datasets.
 
         When the `wishlist` contains `DatasetID` objects they can either be
@@ -865,8 +906,29 @@ class Scene(MetadataObject):
             unload (bool): Unload datasets that were required to generate
                            the requested datasets (composite dependencies)
                            but are no longer needed.
+            area (AreaDefinition or str): Only read the part of the data
+                                          covering this area (or area name).
+                                          This is only possible for data on
+                                          a geostationary projection, other
+                                          data is read completely and can be
+                                          cropped with `crop` afterwards.
+            ll_bbox (tuple, list): Same as `area` but a 4-element
+                                   ``(xmin, ymin, xmax, ymax)`` bounding box
+                                   in lon/lat degrees.
 
         """
+        if area is not None and ll_bbox is not None:
+            raise ValueError("Only one of 'area' or 'll_bbox' can be "
+                             "specified.")
+        if ll_bbox is not None:
+            area = AreaDefinition(
+                'load_area', 'load_area', 'load_latlong',
+                {'proj': 'latlong'}, 100, 100, ll_bbox)
+        elif isinstance(area, (str, six.text_type)):
+            area = get_area_def(area)
+        if area is not None:
+            kwargs['area'] = area
+
         dataset_keys = set(wishlist)
         needed_datasets = (self.wishlist | dataset_keys) - \
             set(self.datasets.keys())
@@ -897,7 +959,8 @@ class Scene(MetadataObject):
         if unload:
             self.unload(keepables=keepables)
 
-    def _resampled_scene(self, new_scn, destination_area, **resample_kwargs):
+    def _resampled_scene(self, new_scn, destination_area, reduce_data=True,
+                         **resample_kwargs):
         """Resample `datasets` to the `destination` area."""
         new_datasets = {}
         datasets = list(new_scn.datasets.values())
@@ -929,16 +992,17 @@ class Scene(MetadataObject):
                 continue
             LOG.debug("Resampling %s", ds_id)
             source_area = dataset.attrs['area']
-            try:
-                slice_x, slice_y = source_area.get_area_slices(
-                    destination_area)
-                source_area = source_area[slice_y, slice_x]
-                dataset = dataset.isel(x=slice_x, y=slice_y)
-                assert ('x', source_area.x_size) in dataset.sizes.items()
-                assert ('y', source_area.y_size) in dataset.sizes.items()
-                dataset.attrs['area'] = source_area
-            except NotImplementedError:
-                LOG.info("Not reducing data before resampling.")
+            if reduce_data:
+                try:
+                    slice_x, slice_y = source_area.get_area_slices(
+                        destination_area)
+                    source_area = source_area[slice_y, slice_x]
+                    dataset = dataset.isel(x=slice_x, y=slice_y)
+                    assert ('x', source_area.x_size) in dataset.sizes.items()
+                    assert ('y', source_area.y_size) in dataset.sizes.items()
+                    dataset.attrs['area'] = source_area
+                except NotImplementedError:
+                    LOG.info("Not reducing data before resampling.")
             if source_area not in resamplers:
                 key, resampler = prepare_resampler(
                     source_area, destination_area, **resample_kwargs)
@@ -955,7 +1019,8 @@ class Scene(MetadataObject):
                 replace_anc(res, pres)
 
     def resample(self, destination=None, datasets=None, generate=True,
-                 unload=True, resampler=None, **resample_kwargs):
+                 unload=True, resampler=None, reduce_data=True,
+                 **resample_kwargs):
         """Resample datasets and return a new scene.
 
         Args:
@@ -974,6 +1039,8 @@ class Scene(MetadataObject):
                 ('nearest'). Other possible values include 'native', 'ewa',
                 etc. See the :mod:`~satpy.resample` documentation for more
                 information.
+            reduce_data (bool): Reduce the data to the part of its area
+                covering the destination before resampling (default: True).
             resample_kwargs: Remaining keyword arguments to pass to individual
                 resampler classes. See the individual resampler class
                 documentation :mod:`here <satpy.resample>` for available
@@ -989,7 +1056,7 @@ class Scene(MetadataObject):
         # we may have some datasets we asked for but don't exist yet
         new_scn.wishlist = self.wishlist.copy()
         self._resampled_scene(new_scn, destination, resampler=resampler,
-                              **resample_kwargs)
+                              reduce_data=reduce_data, **resample_kwargs)
 
         # regenerate anything from the wishlist that needs it (combining
         # multiple resolutions, etc.)
@@ -1014,6 +1081,78 @@ class Scene(MetadataObject):
 
         return new_scn
 
+    def _reduce_data(self, destinations):
+        """Reduce the datasets to the part of their area used by all *destinations*."""
+        datasets_by_area = {}
+        for ds_id, dataset in self.datasets.items():
+            area = dataset.attrs.get('area')
+            if area is not None:
+                datasets_by_area.setdefault(area, []).append(ds_id)
+        for source_area, dataset_ids in datasets_by_area.items():
+            try:
+                slices = [source_area.get_area_slices(destination)
+                          for destination in destinations]
+            except NotImplementedError:
+                LOG.info("Not reducing data before resampling.")
+                continue
+            slice_x = slice(min(slice_x.start for slice_x, _ in slices),
+                            max(slice_x.stop for slice_x, _ in slices))
+            slice_y = slice(min(slice_y.start for _, slice_y in slices),
+                            max(slice_y.stop for _, slice_y in slices))
+            self._slice_datasets(dataset_ids, {'y': slice_y, 'x': slice_x},
+                                 source_area[slice_y, slice_x])
+
+    def resample_many(self, destinations, datasets=None, generate=True,
+                      unload=True, resampler=None, reduce_data=True,
+                      **resample_kwargs):
+        """Resample datasets to several destinations at once.
+
+        The work depending only on the source data is shared by all the
+        destinations: the datasets are reduced once to the part of their
+        area covering all the destinations, so the source coordinates, the
+        masks of invalid data and the KDTree over the source geometry are
+        the same tasks in the dask graphs of all the resampled datasets.
+        They are only computed once when the datasets of the returned scenes
+        are computed together, for example with :func:`dask.compute` or
+        by saving them with ``compute=False`` and
+        :func:`~satpy.writers.compute_writer_results`.
+
+        Args:
+            destinations (list): Area definitions (or area names) to
+                resample to.
+            datasets (list): Limit datasets to resample to these specified
+                `DatasetID` objects . By default all currently loaded
+                datasets are resampled.
+
+        The other arguments are the same as for :meth:`Scene.resample`.
+
+        Returns: list of new scenes, one per destination
+
+        """
+        to_resample_ids = [dsid for (dsid, dataset) in self.datasets.items()
+                           if (not datasets) or dsid in datasets]
+        src_scn = self.copy(datasets=to_resample_ids)
+        src_scn.wishlist = self.wishlist.copy()
+
+        new_destinations = []
+        for destination in destinations:
+            if isinstance(destination, (str, six.text_type)):
+                destination = get_area_def(destination)
+            if hasattr(destination, 'freeze'):
+                try:
+                    destination = destination.freeze(src_scn.max_area())
+                except ValueError:
+                    raise ValueError("No dataset areas available to freeze "
+                                     "DynamicAreaDefinition.")
+            new_destinations.append(destination)
+        if reduce_data:
+            src_scn._reduce_data(new_destinations)
+
+        return [src_scn.resample(destination, generate=generate,
+                                 unload=unload, resampler=resampler,
+                                 reduce_data=False, **resample_kwargs)
+                for destination in new_destinations]
+
     def show(self, dataset_id, overlay=None):
         """Show the *dataset* on screen as an image."""
         from satpy.writers import get_enhanced_image
@@ -180,6 +180,88 @@ class TestDayNightCompositor(unittest.TestCase):
         np.testing.assert_allclose(res.values[0], expected)
 
 
+class TestAngleProvider(unittest.TestCase):
+    """Test the provider of sun and satellite angles."""
+
+    def setUp(self):
+        """Create a test area."""
+        from datetime import datetime
+        from pyresample.geometry import AreaDefinition
+        self.area = AreaDefinition(
+            'test', 'test', 'test',
+            {'proj': 'geos', 'h': 35785831., 'lon_0': 0.,
+             'a': 6378137., 'b': 6356752.31414},
+            20, 10, (-2000000., 4000000., 2000000., 5000000.))
+        self.start_time = datetime(2018, 6, 21, 12, 0, 0)
+
+    def test_shared_angles(self):
+        """Test that the angles are only computed once."""
+        import numpy as np
+        from pyorbital.astronomy import cos_zen, sun_zenith_angle
+        from satpy.composites import AngleProvider
+        provider = AngleProvider()
+        coszen = provider.get_cos_sun_zenith(self.area, self.start_time, 5)
+        self.assertIs(provider.get_cos_sun_zenith(self.area, self.start_time,
+                                                  5), coszen)
+        rechunked = provider.get_cos_sun_zenith(self.area, self.start_time, 10)
+        self.assertEqual(rechunked.chunks, ((10, ), (10, 10)))
+        lons, lats = self.area.get_lonlats()
+        np.testing.assert_allclose(rechunked,
+                                   cos_zen(self.start_time, lons, lats))
+        # the sun zenith angle reuses the cosine
+        suna, sunz = provider.get_sun_angles(self.area, self.start_time, 5)
+        self.assertIn((coszen.name, 0, 0), dict(sunz.__dask_graph__()))
+        np.testing.assert_allclose(
+            sunz, sun_zenith_angle(self.start_time, lons, lats))
+        # a new provider computes them again
+        self.assertIsNot(AngleProvider().get_cos_sun_zenith(
+            self.area, self.start_time, 5), coszen)
+
+    def test_scene_provider(self):
+        """Test compositors use the angle provider of the scene."""
+        import dask.array as da
+        import xarray as xr
+        from satpy import Scene
+        from satpy.composites import SunZenithCorrector, get_angle_provider
+        scn = Scene()
+        vis = xr.DataArray(da.ones((10, 20), chunks=5), dims=('y', 'x'),
+                           attrs={'area': self.area, 'name': 'vis',
+                                  'start_time': self.start_time})
+        comp = SunZenithCorrector(name='sunz_corrected',
+                                  modifiers=('sunz_corrected', ))
+        with scn.angle_provider:
+            self.assertIs(get_angle_provider(), scn.angle_provider)
+            res1 = comp([vis])
+        self.assertIsNot(get_angle_provider(), scn.angle_provider)
+        with scn.angle_provider:
+            res2 = comp([vis.copy()])
+        self.assertEqual(res1.data.name, res2.data.name)
+
+    def test_cache_dir(self):
+        """Test saving the satellite angles of an area to disk."""
+        import os
+        import shutil
+        import tempfile
+        import numpy as np
+        from satpy.composites import AngleProvider
+        the_dir = tempfile.mkdtemp()
+        try:
+            provider = AngleProvider(cache_dir=the_dir)
+            sata, satz = provider.get_satellite_angles(
+                self.area, self.start_time, 0., 0., 35786., 5)
+            self.assertEqual(len(os.listdir(the_dir)), 2)
+            with mock.patch('pyorbital.orbital.get_observer_look') as gol:
+                provider = AngleProvider(cache_dir=the_dir)
+                new_sata, new_satz = provider.get_satellite_angles(
+                    self.area, self.start_time, 0., 0., 35786., 5)
+            self.assertFalse(gol.called)
+            self.assertEqual(new_satz.chunks, satz.chunks)
+            np.testing.assert_allclose(new_satz, satz)
+            np.testing.assert_allclose(new_sata, sata)
+        finally:
+            shutil.rmtree(the_dir)
+
+
 class TestFillingCompositor(unittest.TestCase):
 
     def test_fill(self):
@@ -296,6 +378,124 @@ class TestInlineComposites(unittest.TestCase):
                          ['IR_108', 'IR_087'])
 
 
+class TestCompositorLoaderCache(unittest.TestCase):
+    """Test sharing the loaded compositors between loaders."""
+
+    def setUp(self):
+        """Start every test with an empty cache."""
+        from satpy.config import CONFIG_CACHE
+        CONFIG_CACHE.clear()
+
+    def test_shared_compositors(self):
+        """Test that compositor configs are only loaded once."""
+        from satpy.composites import CompositorLoader
+        cl1 = CompositorLoader()
+        comps1, mods1 = cl1.load_compositors(['abi'])
+        with mock.patch('yaml.load') as load:
+            cl2 = CompositorLoader()
+            comps2, mods2 = cl2.load_compositors(['abi'])
+            load.assert_not_called()
+        self.assertIs(cl1.compositors['abi'], cl2.compositors['abi'])
+        self.assertIs(cl1.compositors['visir'], cl2.compositors['visir'])
+        self.assertIs(comps1['abi']['true_color'],
+                      comps2['abi']['true_color'])
+        # the returned dictionaries can be modified independently
+        self.assertIsNot(comps1['abi'], comps2['abi'])
+        self.assertIsNot(mods1['abi'], mods2['abi'])
+        del comps1['abi']['true_color']
+        self.assertIn('true_color', comps2['abi'])
+        self.assertIn('true_color', cl1.compositors['abi'])
+        self.assertEqual(len(comps2['abi'].index), len(comps2['abi']))
+
+    def test_modified_dependency(self):
+        """Test reloading compositors when an inherited config changes."""
+        import os
+        import shutil
+        import tempfile
+        from satpy.composites import CompositorLoader
+        base_config = ("sensor_name: fake_base\n"
+                       "composites:\n"
+                       "  fake_comp:\n"
+                       "    compositor: !!python/name:satpy.composites."
+                       "GenericCompositor\n"
+                       "    prerequisites: [{}]\n")
+        child_config = "sensor_name: fake_base/fake_child\n"
+        ppp_config_dir = tempfile.mkdtemp()
+        try:
+            os.mkdir(os.path.join(ppp_config_dir, 'composites'))
+            base_fn = os.path.join(ppp_config_dir, 'composites',
+                                   'fake_base.yaml')
+            with open(base_fn, 'w') as fd:
+                fd.write(base_config.format('1.0'))
+            with open(os.path.join(ppp_config_dir, 'composites',
+                                   'fake_child.yaml'), 'w') as fd:
+                fd.write(child_config)
+
+            comps, _ = CompositorLoader(ppp_config_dir).load_compositors(
+                ['fake_child'])
+            comp = comps['fake_child']['fake_comp']
+            self.assertEqual(comp.attrs['prerequisites'], [1.0])
+
+            with open(base_fn, 'w') as fd:
+                fd.write(base_config.format('2.0'))
+            stat = os.stat(base_fn)
+            os.utime(base_fn, (stat.st_atime, stat.st_mtime + 10))
+            comps, _ = CompositorLoader(ppp_config_dir).load_compositors(
+                ['fake_child'])
+            comp = comps['fake_child']['fake_comp']
+            self.assertEqual(comp.attrs['prerequisites'], [2.0])
+        finally:
+            shutil.rmtree(ppp_config_dir)
+
+    def test_shared_nir_reflectance(self):
+        """Test a shared NIR compositor keeps no per call calculator."""
+        import sys
+        from datetime import datetime
+        import numpy as np
+        import xarray as xr
+        from satpy.composites import NIRReflectance
+
+        def calculator(platform_name, sensor, name):
+            calc = mock.MagicMock(platform_name=platform_name)
+            calc.reflectance_from_tbs.return_value = np.ma.masked_array(
+                np.full((2, 2), 0.5 if platform_name == 'A' else 0.25))
+            return calc
+
+        def get_projectables(platform_name):
+            attrs = {'platform_name': platform_name, 'sensor': 'fake',
+                     'name': 'IR_039', 'area': None,
+                     'start_time': datetime(2018, 1, 1)}
+            return [xr.DataArray(np.zeros((2, 2)), dims=('y', 'x'),
+                                 attrs=attrs.copy()),
+                    xr.DataArray(np.zeros((2, 2)), dims=('y', 'x'),
+                                 attrs=attrs.copy())]
+
+        comp = NIRReflectance(name='nir_refl', modifiers=('nir_refl', ))
+        results = {}
+        nested = []
+
+        def get_sun_angles(*args):
+            # another scene uses the same compositor in the meantime
+            if not nested:
+                nested.append(True)
+                results['B'] = comp(get_projectables('B'),
+                                    optional_datasets=[])
+            return None, np.zeros((2, 2))
+
+        pyspectral = mock.MagicMock()
+        pyspectral.near_infrared_reflectance.Calculator = calculator
+        with mock.patch.dict(sys.modules, {
+                'pyspectral': pyspectral,
+                'pyspectral.near_infrared_reflectance':
+                    pyspectral.near_infrared_reflectance}), \
+                mock.patch('satpy.composites.get_angle_provider') as provider:
+            provider.return_value.get_sun_angles.side_effect = get_sun_angles
+            results['A'] = comp(get_projectables('A'), optional_datasets=[])
+        np.testing.assert_allclose(results['A'].values, 50.)
+        np.testing.assert_allclose(results['B'].values, 25.)
+        self.assertFalse(hasattr(comp, '_refl3x'))
+
+
 def suite():
     """Test suite for all reader tests"""
     loader = unittest.TestLoader()
@@ -305,6 +505,8 @@ def suite():
     mysuite.addTests(test_viirs.suite())
     mysuite.addTest(loader.loadTestsFromTestCase(TestCheckArea))
     mysuite.addTest(loader.loadTestsFromTestCase(TestDayNightCompositor))
+    mysuite.addTest(loader.loadTestsFromTestCase(TestAngleProvider))
+    mysuite.addTest(loader.loadTestsFromTestCase(TestCompositorLoaderCache))
     mysuite.addTest(loader.loadTestsFromTestCase(TestFillingCompositor))
     mysuite.addTest(loader.loadTestsFromTestCase(TestSandwichCompositor))
     mysuite.addTest(loader.loadTestsFromTestCase(TestLuminanceSharpeningCompositor))
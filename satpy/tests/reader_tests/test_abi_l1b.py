@@ -21,6 +21,7 @@
 """The abi_l1b reader tests package.
 """
 
+import os
 import sys
 import numpy as np
 import xarray as xr
@@ -241,6 +242,130 @@ class Test_NC_ABI_L1B_area(unittest.TestCase):
         self.assertEqual(call_args[5], self.reader.nlines)
         np.testing.assert_allclose(call_args[6], (-2, -2, 2, 2))
 
+    @mock.patch('satpy.readers.abi_l1b.xr')
+    def test_pickle(self, xr_):
+        """Test that unpickled file handlers reopen the file once per process."""
+        import pickle
+        state = pickle.dumps(self.reader)
+        new_reader = pickle.loads(state)
+        self.assertIs(new_reader.nc, self.reader.nc)
+        xr_.open_dataset.assert_not_called()
+        self.assertEqual(new_reader.ncols, self.reader.ncols)
+        with mock.patch('satpy.readers.file_handlers.os.getpid',
+                        return_value=-1):
+            new_reader = pickle.loads(state)
+        xr_.open_dataset.assert_called_once_with(
+            'filename', decode_cf=True, mask_and_scale=False,
+            chunks=mock.ANY)
+        self.assertIs(new_reader.nc, xr_.open_dataset.return_value.rename())
+
+    def test_close(self):
+        """Test that closing the file handler releases the file."""
+        from satpy.readers.file_handlers import FILE_HANDLES
+        nc = self.reader.nc
+        self.reader.close()
+        self.assertNotIn(('filename', 'abi_l1b'), FILE_HANDLES)
+        self.assertNotIn('nc', self.reader.__dict__)
+        self.assertEqual(self.reader.coords, {})
+        # the file is opened again when needed
+        with mock.patch('satpy.readers.abi_l1b.xr') as xr_:
+            self.assertIs(self.reader.nc, xr_.open_dataset.return_value.rename())
+        self.assertIsNot(self.reader.nc, nc)
+        self.reader.close()
+
+
+def _write_abi_file(dirname, channel, shape=(20, 30)):
+    """Write a small ABI L1b file for *channel* in *dirname*."""
+    from netCDF4 import Dataset
+    filename = os.path.join(
+        dirname, 'OR_ABI-L1b-RadC-M3{}_G16_s20172631732189_'
+        'e20172631734562_c20172631735002.nc'.format(channel))
+    nc = Dataset(filename, 'w')
+    nc.set_auto_maskandscale(False)
+    nc.createDimension('y', shape[0])
+    nc.createDimension('x', shape[1])
+    rad = nc.createVariable('Rad', 'i2', ('y', 'x'), fill_value=1023)
+    rad.scale_factor = 0.5
+    rad.add_offset = -1.
+    rad.units = 'W m-2 sr-1 um-1'
+    rad[:] = np.arange(shape[0] * shape[1]).reshape(shape) % 1000
+    for name, factor, offset in (('x', 5.6e-05, -0.1), ('y', -5.6e-05, 0.1)):
+        var = nc.createVariable(name, 'i2', (name, ))
+        var.scale_factor = factor
+        var.add_offset = offset
+        var[:] = np.arange(len(nc.dimensions[name])) * 10
+    proj = nc.createVariable('goes_imager_projection', 'i4')
+    proj.semi_major_axis = 6378137.
+    proj.semi_minor_axis = 6356752.31414
+    proj.perspective_point_height = 35786023.
+    proj.longitude_of_projection_origin = -75.
+    proj.sweep_angle_axis = 'x'
+    for name, value in (('esun', 2017.),
+                        ('earth_sun_distance_anomaly_in_AU', 0.99),
+                        ('nominal_satellite_subpoint_lat', 0.),
+                        ('nominal_satellite_subpoint_lon', -75.),
+                        ('nominal_satellite_height', 35786.02),
+                        ('t', 0.)):
+        nc.createVariable(name, 'f8')[...] = value
+    nc.time_coverage_start = '2017-09-20T17:32:18.9Z'
+    nc.time_coverage_end = '2017-09-20T17:34:56.2Z'
+    nc.close()
+    return filename
+
+
+def _get_nc_process(file_handler):
+    """Get the process and the dataset mean of an unpickled file handler."""
+    return os.getpid(), float(file_handler['Rad'].mean())
+
+
+try:
+    import distributed
+except ImportError:
+    distributed = None
+
+
+@unittest.skipIf(distributed is None, "distributed is not installed")
+class Test_NC_ABI_L1B_distributed(unittest.TestCase):
+    """Test processing ABI data with a multi-process dask cluster."""
+
+    def setUp(self):
+        """Write the files and start the cluster."""
+        import tempfile
+        self.base_dir = tempfile.mkdtemp()
+        self.filenames = [_write_abi_file(self.base_dir, channel)
+                          for channel in ('C01', 'C03')]
+
+    def tearDown(self):
+        """Remove the files."""
+        import shutil
+        shutil.rmtree(self.base_dir, ignore_errors=True)
+
+    def test_composite(self):
+        """Test computing a composite on the workers."""
+        from satpy import Scene
+        from satpy.composites import GenericCompositor
+        scn = Scene(reader='abi_l1b', filenames=self.filenames)
+        scn.load(['C01', 'C03'])
+        comp = GenericCompositor('test')([scn['C01'], scn['C03']])
+        expected = comp.values
+
+        cluster = distributed.LocalCluster(
+            n_workers=2, threads_per_worker=1, processes=True,
+            scheduler_port=0, diagnostics_port=None, local_dir=self.base_dir)
+        self.addCleanup(cluster.close)
+        client = distributed.Client(cluster)
+        self.addCleanup(client.close)
+        # the client is the default scheduler now
+        np.testing.assert_allclose(comp.compute().values, expected)
+
+        # the file handlers are shipped to the workers and reopened there
+        fh = scn.readers['abi_l1b'].file_handlers['c01'][0]
+        pid, mean = client.submit(_get_nc_process, fh).result()
+        self.assertNotEqual(pid, os.getpid())
+        self.assertEqual(mean, _get_nc_process(fh)[1])
+        new_scn = client.submit(lambda scn: scn, scn).result()
+        self.assertEqual(sorted(new_scn.keys()), sorted(scn.keys()))
+
 
 def suite():
     """The test suite for test_scene.
@@ -250,4 +375,5 @@ def suite():
     mysuite.addTest(loader.loadTestsFromTestCase(Test_NC_ABI_L1B_ir_cal))
     mysuite.addTest(loader.loadTestsFromTestCase(Test_NC_ABI_L1B_vis_cal))
     mysuite.addTest(loader.loadTestsFromTestCase(Test_NC_ABI_L1B_area))
+    mysuite.addTest(loader.loadTestsFromTestCase(Test_NC_ABI_L1B_distributed))
     return mysuite
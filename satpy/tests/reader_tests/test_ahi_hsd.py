@@ -21,6 +21,7 @@
 """The abi_l1b reader tests package.
 """
 
+import os
 import unittest
 try:
     from unittest import mock
@@ -36,12 +37,11 @@ class TestAHIHSDNavigation(unittest.TestCase):
     """Test the AHI HSD reader navigation."""
 
     @mock.patch('satpy.readers.ahi_hsd.np2str')
-    @mock.patch('satpy.readers.ahi_hsd.np.fromfile')
-    def test_region(self, fromfile, np2str):
+    def test_region(self, np2str):
         """Test region navigation."""
         np2str.side_effect = lambda x: x
-        m = mock.mock_open()
-        with mock.patch('satpy.readers.ahi_hsd.open', m, create=True):
+        with mock.patch.object(AHIHSDFileHandler, '_read_header',
+                               return_value=(mock.MagicMock(), 0)):
             fh = AHIHSDFileHandler(None, {'segment_number': 1, 'total_segments': 1}, None)
             fh.proj_info = {'CFAC': 40932549,
                             'COFF': -591.5,
@@ -78,12 +78,11 @@ class TestAHIHSDNavigation(unittest.TestCase):
                                                     1592000.0102878278, 5132000.033164027))
 
     @mock.patch('satpy.readers.ahi_hsd.np2str')
-    @mock.patch('satpy.readers.ahi_hsd.np.fromfile')
-    def test_segment(self, fromfile, np2str):
+    def test_segment(self, np2str):
         """Test segment navigation."""
         np2str.side_effect = lambda x: x
-        m = mock.mock_open()
-        with mock.patch('satpy.readers.ahi_hsd.open', m, create=True):
+        with mock.patch.object(AHIHSDFileHandler, '_read_header',
+                               return_value=(mock.MagicMock(), 0)):
             fh = AHIHSDFileHandler(None, {'segment_number': 8, 'total_segments': 10}, None)
             fh.proj_info = {'CFAC': 40932549,
                             'COFF': 5500.5,
@@ -122,12 +121,11 @@ class TestAHIHSDNavigation(unittest.TestCase):
 
 class TestAHIHSDFileHandler(unittest.TestCase):
     @mock.patch('satpy.readers.ahi_hsd.np2str')
-    @mock.patch('satpy.readers.ahi_hsd.np.fromfile')
-    def setUp(self, fromfile, np2str):
+    def setUp(self, np2str):
         """Create a test file handler."""
         np2str.side_effect = lambda x: x
-        m = mock.mock_open()
-        with mock.patch('satpy.readers.ahi_hsd.open', m, create=True):
+        with mock.patch.object(AHIHSDFileHandler, '_read_header',
+                               return_value=(mock.MagicMock(), 0)):
             fh = AHIHSDFileHandler(None, {'segment_number': 8, 'total_segments': 10}, None)
             fh.proj_info = {'CFAC': 40932549,
                             'COFF': 5500.5,
@@ -169,12 +167,112 @@ class TestAHIHSDFileHandler(unittest.TestCase):
         self.assertEqual(self.fh.scheduled_time, datetime(2018, 10, 22, 3, 0, 0, 0))
 
 
+def _write_hsd_file(filename, nlines=4, ncols=6):
+    """Write a small HSD file with variable length header blocks."""
+    from satpy.readers import ahi_hsd
+    corrections = np.zeros(2, dtype=ahi_hsd._NAVIGATION_CORRECTION_SUBINFO_TYPE)
+    corrections['line_number_after_rotation'] = [1, 3]
+    times = np.zeros(3, dtype=ahi_hsd._OBSERVATION_LINE_TIME_INFO_TYPE)
+    times['line_number'] = [1, 2, 4]
+    times['observation_time'] = [58413.125, 58413.126, 58413.127]
+    errors = np.zeros(1, dtype=ahi_hsd._ERROR_LINE_INFO_TYPE)
+    errors['numof_error_pixels_per_line'] = 5
+
+    blocks = {}
+    for name, dtype in (('basic', ahi_hsd._BASIC_INFO_TYPE),
+                        ('data', ahi_hsd._DATA_INFO_TYPE),
+                        ('proj', ahi_hsd._PROJ_INFO_TYPE),
+                        ('nav', ahi_hsd._NAV_INFO_TYPE),
+                        ('cal', ahi_hsd._CAL_INFO_TYPE),
+                        ('viscal', ahi_hsd._VISCAL_INFO_TYPE),
+                        ('inter', ahi_hsd._INTER_CALIBRATION_INFO_TYPE),
+                        ('segment', ahi_hsd._SEGMENT_INFO_TYPE),
+                        ('navcorr', ahi_hsd._NAVIGATION_CORRECTION_INFO_TYPE),
+                        ('obstime', ahi_hsd._OBS_TIME_INFO_TYPE),
+                        ('error', ahi_hsd._ERROR_INFO_TYPE),
+                        ('spare', ahi_hsd._SPARE_TYPE)):
+        blocks[name] = np.zeros(1, dtype=dtype)
+    blocks['basic']['satellite'] = b'Himawari-8'
+    blocks['basic']['observation_area'] = b'FLDK'
+    blocks['data']['number_of_lines'] = nlines
+    blocks['data']['number_of_columns'] = ncols
+    blocks['proj']['CFAC'] = blocks['proj']['LFAC'] = 40932549
+    # image center in the middle of the file
+    blocks['proj']['COFF'] = (ncols + 1) / 2.
+    blocks['proj']['LOFF'] = (nlines + 1) / 2.
+    blocks['proj']['distance_from_earth_center'] = 42164.0
+    blocks['proj']['earth_equatorial_radius'] = 6378.137
+    blocks['proj']['earth_polar_radius'] = 6356.7523
+    blocks['proj']['sub_lon'] = 140.7
+    blocks['nav']['distance_earth_center_to_satellite'] = 42164.0
+    blocks['cal']['band_number'] = 1
+    blocks['cal']['gain_count2rad_conversion'] = 2.
+    blocks['cal']['offset_count2rad_conversion'] = 1.
+    blocks['cal']['count_value_error_pixels'] = 65534
+    blocks['cal']['count_value_outside_scan_pixels'] = 65533
+    blocks['navcorr']['numof_correction_info_data'] = len(corrections)
+    blocks['obstime']['number_of_observation_times'] = len(times)
+    blocks['error']['number_of_error_info_data'] = len(errors)
+    spare = np.zeros(40, dtype=np.uint8)
+
+    header = [blocks['basic'], blocks['data'], blocks['proj'], blocks['nav'],
+              blocks['cal'], blocks['viscal'], blocks['inter'],
+              blocks['segment'], blocks['navcorr'], corrections, spare,
+              blocks['obstime'], times, spare, blocks['error'], errors, spare,
+              blocks['spare']]
+    blocks['basic']['total_header_length'] = sum(arr.nbytes for arr in header)
+    with open(filename, 'wb') as fd:
+        for arr in header:
+            arr.tofile(fd)
+        np.arange(nlines * ncols, dtype='<u2').tofile(fd)
+
+
+class TestAHIHSDHeader(unittest.TestCase):
+    """Test reading the header of HSD files."""
+
+    def setUp(self):
+        """Write a synthetic HSD file."""
+        import tempfile
+        fd, self.filename = tempfile.mkstemp(suffix='.DAT')
+        os.close(fd)
+        _write_hsd_file(self.filename)
+
+    def tearDown(self):
+        """Remove the synthetic HSD file."""
+        os.remove(self.filename)
+
+    def test_read_header(self):
+        """Test reading the variable length header blocks."""
+        fh = AHIHSDFileHandler(self.filename, {'segment_number': 1, 'total_segments': 1}, {})
+        self.assertEqual(fh.platform_name, 'Himawari-8')
+        self.assertEqual(fh.observation_area, 'FLDK')
+        np.testing.assert_array_equal(
+            fh._header['navigation_corrections']['line_number_after_rotation'], [1, 3])
+        np.testing.assert_array_equal(
+            fh._header['observation_time_information']['line_number'], [1, 2, 4])
+        np.testing.assert_array_equal(
+            fh._header['error_information_data']['numof_error_pixels_per_line'], [5])
+        self.assertEqual(fh._data_offset, fh.basic_info['total_header_length'][0])
+
+    def test_read_band(self):
+        """Test reading the image data after the header."""
+        from satpy.dataset import DatasetID
+        fh = AHIHSDFileHandler(self.filename, {'segment_number': 1, 'total_segments': 1}, {})
+        fh.get_area_def(None)
+        key = DatasetID(name='1', calibration='radiance')
+        info = {'units': 'W m-2 um-1 sr-1', 'standard_name': 'toa_outgoing_radiance',
+                'wavelength': (0.45, 0.47, 0.49)}
+        res = fh.read_band(key, info)
+        np.testing.assert_allclose(res.values, np.arange(24).reshape((4, 6)) * 2. + 1)
+
+
 def suite():
     """The test suite for test_scene."""
     loader = unittest.TestLoader()
     mysuite = unittest.TestSuite()
     mysuite.addTest(loader.loadTestsFromTestCase(TestAHIHSDNavigation))
     mysuite.addTest(loader.loadTestsFromTestCase(TestAHIHSDFileHandler))
+    mysuite.addTest(loader.loadTestsFromTestCase(TestAHIHSDHeader))
     return mysuite
 
 
@@ -97,6 +97,9 @@ class TestHDF5FileHandler(unittest.TestCase):
 
     def tearDown(self):
         """Remove the previously created test file"""
+        from satpy.readers.hdf5_utils import FILE_HANDLES, FILE_POOL
+        FILE_POOL.close('test.h5')
+        FILE_HANDLES.clear()
         os.remove('test.h5')
 
     def test_all_basic(self):
@@ -124,6 +127,68 @@ class TestHDF5FileHandler(unittest.TestCase):
         self.assertTrue('ds2_f' in file_handler)
         self.assertFalse('fake_ds' in file_handler)
 
+    def test_lazy_metadata(self):
+        """Test reading the metadata only when it is requested"""
+        import h5py
+        from satpy.readers.hdf5_utils import HDF5FileHandler
+        eager = HDF5FileHandler('test.h5', {}, {})
+        lazy = HDF5FileHandler('test.h5', {}, {'lazy_metadata': True})
+        self.assertEqual(len(lazy.file_content._content), 0)
+
+        self.assertEqual(lazy['test_group/ds1_i/attr/test_attr_str'], 'test_string')
+        self.assertEqual(lazy['/attr/test_attr_str_arr'], 'test_string2')
+        self.assertTupleEqual(lazy['ds2_f/shape'], (10, 100))
+        self.assertEqual(lazy['ds2_i'].dtype, np.int32)
+        self.assertFalse('test_group' in lazy)
+        self.assertFalse('fake_ds/shape' in lazy)
+        self.assertIsNone(lazy.get('/fake_ds/attr/test_attr_str'))
+        self.assertRaises(KeyError, lazy.__getitem__, 'test_group/attr/fake')
+
+        # iterating gives the same content as the eager file handler
+        self.assertSetEqual(set(lazy.file_content), set(eager.file_content))
+        for key, val in eager.file_content.items():
+            if isinstance(val, h5py.Dataset):
+                self.assertIsInstance(lazy.file_content[key], h5py.Dataset)
+            else:
+                np.testing.assert_equal(lazy.file_content[key], val)
+
+    def test_dataset_proxy(self):
+        """Test pickling dask arrays made from HDF5 datasets"""
+        import pickle
+        import dask.array as da
+        import h5py
+        from satpy.readers.hdf5_utils import HDF5DatasetProxy
+        with h5py.File('test.h5', 'r') as h5f:
+            proxy = HDF5DatasetProxy(h5f['test_group/ds1_i'])
+            self.assertTupleEqual(proxy.shape, (10, 100))
+            self.assertEqual(proxy.dtype, np.int32)
+            arr = da.from_array(proxy, chunks=(5, 50))
+            new_arr = pickle.loads(pickle.dumps(arr))
+            expected = np.arange(10 * 100).reshape((10, 100))
+            np.testing.assert_array_equal(arr.compute(), expected)
+        # the unpickled proxy reopens the file
+        np.testing.assert_array_equal(new_arr.compute(), expected)
+        del new_arr
+
+    def test_pickle(self):
+        """Test pickling the file handler and the data it returns"""
+        import pickle
+        from satpy.readers.hdf5_utils import HDF5FileHandler
+        expected = np.arange(10 * 100).reshape((10, 100))
+        for lazy_metadata in (False, True):
+            file_handler = HDF5FileHandler('test.h5', {}, {},
+                                           lazy_metadata=lazy_metadata)
+            data = file_handler['test_group/ds1_i']
+            new_data = pickle.loads(pickle.dumps(data))
+            np.testing.assert_array_equal(new_data.values, expected)
+            new_fh = pickle.loads(pickle.dumps(file_handler))
+            self.assertEqual(new_fh['ds2_i/attr/test_attr_str'], 'test_string')
+            np.testing.assert_array_equal(new_fh['test_group/ds1_i'].values,
+                                          expected)
+            self.assertSetEqual(set(new_fh.file_content),
+                                set(file_handler.file_content))
+            file_handler.close()
+
 
 def suite():
     """The test suite for test_hdf5_utils.
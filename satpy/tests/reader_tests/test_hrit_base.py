@@ -155,6 +155,22 @@ class TestHRITFileHandler(unittest.TestCase):
                          (-77771774058.38356, -77771774058.38356,
                           30310525626438.438, 3720765401003.719))
 
+    def test_get_bounding_box(self):
+        """Test the bounding box of the segment from the header."""
+        self.reader.mda['cfac'] = 13642337
+        self.reader.mda['lfac'] = 13642337
+        self.reader.mda['coff'] = 1856
+        self.reader.mda['loff'] = 1856
+        lons, lats = self.reader.get_bounding_box()
+        self.assertTrue(np.isfinite(lons).all())
+        self.assertTrue(np.isfinite(lats).all())
+        # the segment lines are the southernmost of the disk
+        self.assertAlmostEqual(lats.min(), -74.8, 1)
+        self.assertTrue((lats < -40).all())
+
+        del self.reader.mda['cfac']
+        self.assertRaises(NotImplementedError, self.reader.get_bounding_box)
+
     @mock.patch('satpy.readers.hrit_base.np.memmap')
     def test_read_band(self, memmap):
         nbits = self.reader.mda['number_of_bits_per_pixel']
@@ -164,6 +180,28 @@ class TestHRITFileHandler(unittest.TestCase):
         res = self.reader.read_band('VIS006', None)
         self.assertEqual(res.compute().shape, (464, 3712))
 
+    @mock.patch('satpy.readers.hrit_base.np.memmap')
+    def test_read_band_window(self, memmap):
+        """Test reading only some lines and columns of the band."""
+        line_length = 3712 * 10 // 8
+        data = np.random.randint(0, 256, size=464 * line_length,
+                                 dtype=np.uint8)
+        memmap.return_value = data[10 * line_length:20 * line_length]
+        res = self.reader.read_band('VIS006', None, xslice=slice(100, 200),
+                                    yslice=slice(10, 20))
+        self.assertEqual(res.compute().shape, (10, 100))
+        kwargs = memmap.call_args[1]
+        self.assertEqual(kwargs['offset'],
+                         self.reader.mda['total_header_length'] +
+                         10 * line_length)
+        self.assertEqual(kwargs['shape'], (10 * line_length, ))
+
+        # same values as when reading the whole band
+        memmap.return_value = data
+        full = self.reader.read_band('VIS006', None)
+        np.testing.assert_array_equal(res.compute(),
+                                      full[10:20, 100:200].compute())
+
 
 def suite():
     """The test suite for test_scene.
@@ -53,6 +53,18 @@ class TestDec10216(unittest.TestCase):
         exp = np.array([4,  16,  64, 257], dtype=np.uint16)
         self.assertTrue(np.all(res == exp))
 
+    def test_dec10216_chunks(self):
+        """Test decoding a chunked array of lines."""
+        import dask.array as da
+        raw = np.random.RandomState(0).randint(0, 256, (6, 20)).astype(np.uint8)
+        exp = np.stack([dec10216(line).compute() for line in raw])
+        res = dec10216(da.from_array(raw, chunks=(2, 7)))
+        self.assertEqual(res.chunks, ((2, 2, 2), (4, 4, 4, 4)))
+        np.testing.assert_array_equal(res.compute(), exp)
+        # incomplete groups of 5 bytes are dropped
+        res = dec10216(raw[0, :13])
+        np.testing.assert_array_equal(res.compute(), exp[0, :8])
+
 
 def suite():
     """The test suite for test_scene.
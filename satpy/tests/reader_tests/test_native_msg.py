@@ -103,6 +103,33 @@ class TestNativeMSGFileHandler(unittest.TestCase):
         for bandname in AVAILABLE_CHANNELS.keys():
             self.assertTrue(available_chs[bandname])
 
+    def test_get_dataset_hrv(self):
+        """Test assembling the HRV channel from its three line layers"""
+        import dask.array as da
+        from satpy.dataset import DatasetID
+        from satpy.readers.msg_base import dec10216
+        lines, cols = 4, 8
+        raw = np.zeros((lines, ), dtype=[('hrv', [('line_data', np.uint8, (3, 10))])])
+        raw['hrv']['line_data'] = np.random.RandomState(0).randint(1, 256, (lines, 3, 10))
+        fh = mock.Mock(_channel_list=['HRV'], platform_name='Meteosat-11',
+                       mda={'hrv_number_of_lines': 3 * lines,
+                            'hrv_number_of_columns': cols},
+                       dask_array=da.from_array(raw, chunks=(2, )))
+        fh.calibrate.side_effect = lambda data, dsid: data
+        info = {'units': 'count', 'wavelength': (0.5, 0.7, 0.9),
+                'standard_name': 'counts'}
+        res = NativeMSGFileHandler.get_dataset(
+            fh, DatasetID(name='HRV', calibration='counts'), info)
+
+        expected = np.zeros((3 * lines, cols))
+        for layer in range(3):
+            data = dec10216(raw['hrv']['line_data'][:, layer, :].ravel()).compute()
+            data = data.reshape((lines, cols))[::-1, ::-1]
+            expected[2 - layer::3, :] = data
+        self.assertEqual(res.dtype, np.float32)
+        self.assertEqual(res.data.chunks, ((6, 6), (cols, )))
+        np.testing.assert_array_equal(res.values, expected)
+
     def tearDown(self):
         pass
 
@@ -58,6 +58,15 @@ class TestNcNWCSAF(unittest.TestCase):
     def tearDown(self):
         pass
 
+    def test_getstate(self):
+        """Test that pickled copies don't own the unzipped file."""
+        self.scn._unzipped = 'unzipped_file'
+        state = self.scn.__getstate__()
+        self.assertNotIn('nc', state)
+        self.assertIsNone(state['_unzipped'])
+        self.assertEqual(self.scn._unzipped, 'unzipped_file')
+        self.scn._unzipped = None
+
     def test_get_projection(self):
         # a, b and h in kilometers
         self.scn.nc.attrs = PROJ_KM
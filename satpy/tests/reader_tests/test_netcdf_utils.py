@@ -93,6 +93,8 @@ class TestNetCDF4FileHandler(unittest.TestCase):
 
     def tearDown(self):
         """Remove the previously created test file"""
+        from satpy.readers.netcdf_utils import DATASET_POOL
+        DATASET_POOL.close('test.nc')
         os.remove('test.nc')
 
     def test_all_basic(self):
@@ -123,6 +125,72 @@ class TestNetCDF4FileHandler(unittest.TestCase):
         self.assertTrue('ds2_f' in file_handler)
         self.assertFalse('fake_ds' in file_handler)
 
+    def test_dataset_pool(self):
+        """Test that files are only reopened once per group."""
+        from satpy.readers.netcdf_utils import NetCDF4FileHandler, DATASET_POOL
+        DATASET_POOL.close()
+        DATASET_POOL.reset_stats()
+        file_handler = NetCDF4FileHandler('test.nc', {}, {})
+        for ds in ('test_group/ds1_f', 'test_group/ds1_i', 'ds2_f', 'ds2_i'):
+            file_handler[ds]
+        self.assertEqual(DATASET_POOL.misses, 2)
+        self.assertEqual(DATASET_POOL.hits, 2)
+        data = file_handler['ds2_f']
+        file_handler.close()
+        self.assertEqual(len(DATASET_POOL), 0)
+        # closed files are reopened when the data is needed
+        np.testing.assert_allclose(data.values,
+                                   np.arange(10. * 100).reshape((10, 100)))
+
+    def test_lazy_metadata(self):
+        """Test reading the metadata only when it is requested"""
+        import netCDF4
+        import xarray as xr
+        from satpy.readers.netcdf_utils import NetCDF4FileHandler
+        eager = NetCDF4FileHandler('test.nc', {}, {})
+        lazy = NetCDF4FileHandler('test.nc', {}, {}, lazy_metadata=True)
+        self.assertEqual(len(lazy.file_content._content), 0)
+
+        self.assertEqual(lazy['/dimension/rows'], 10)
+        self.assertEqual(lazy['test_group/ds1_i/attr/test_attr_str'], 'test_string')
+        self.assertEqual(lazy['test_group/attr/test_attr_int'], 0)
+        self.assertEqual(lazy['/attr/test_attr_str_arr'], 'test_string2')
+        self.assertTupleEqual(lazy['ds2_f/shape'], (10, 100))
+        self.assertIsInstance(lazy['test_group/ds1_f'], xr.DataArray)
+        self.assertFalse('test_group' in lazy)
+        self.assertFalse('test_group/dimension/rows' in lazy)
+        self.assertFalse('fake_ds/shape' in lazy)
+        self.assertIsNone(lazy.get('/ds2_f'))
+        self.assertRaises(KeyError, lazy.__getitem__, 'ds2_i/attr/fake')
+
+        # iterating gives the same content as the eager file handler
+        self.assertSetEqual(set(lazy.file_content), set(eager.file_content))
+        for key, val in eager.file_content.items():
+            if isinstance(val, netCDF4.Variable):
+                self.assertIsInstance(lazy.file_content[key], netCDF4.Variable)
+            else:
+                np.testing.assert_equal(lazy.file_content[key], val)
+
+    def test_pickle(self):
+        """Test pickling the file handler and the data it returns"""
+        import pickle
+        from satpy.readers.netcdf_utils import NetCDF4FileHandler
+        expected = np.arange(10 * 100).reshape((10, 100))
+        for lazy_metadata in (False, True):
+            file_handler = NetCDF4FileHandler('test.nc', {}, {},
+                                              lazy_metadata=lazy_metadata)
+            data = file_handler['test_group/ds1_i']
+            new_data = pickle.loads(pickle.dumps(data))
+            np.testing.assert_array_equal(new_data.values, expected)
+            new_fh = pickle.loads(pickle.dumps(file_handler))
+            self.assertEqual(new_fh['/dimension/rows'], 10)
+            self.assertEqual(new_fh['ds2_i/attr/test_attr_str'], 'test_string')
+            np.testing.assert_array_equal(new_fh['test_group/ds1_i'].values,
+                                          expected)
+            self.assertSetEqual(set(new_fh.file_content),
+                                set(file_handler.file_content))
+            file_handler.close()
+
 
 def suite():
     """The test suite for test_netcdf_utils.
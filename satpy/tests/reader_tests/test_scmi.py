@@ -125,6 +125,13 @@ class TestSCMIFileHandler(unittest.TestCase):
         self.assertEqual(res.attrs['standard_name'],
                          'toa_bidirectional_reflectance')
 
+    def test_close(self):
+        """Test that closing the file handler releases the file."""
+        from satpy.readers.file_handlers import FILE_HANDLES
+        self.reader.close()
+        self.assertNotIn(('filename', 'scmi'), FILE_HANDLES)
+        self.assertNotIn('nc', self.reader.__dict__)
+
 
 class TestSCMIFileHandlerArea(unittest.TestCase):
     """Test the SCMIFileHandler's area creation."""
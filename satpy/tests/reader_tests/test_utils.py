@@ -298,6 +298,33 @@ class TestHelpers(unittest.TestCase):
         np.testing.assert_allclose(lon, elon + lon_0)
         np.testing.assert_allclose(lat, elat)
 
+    def test_get_geostationary_segment_bbox(self):
+        """Get the geostationary bbox of a segment."""
+        from pyresample.geometry import AreaDefinition, StackedAreaDefinition
+        proj_dict = {'a': 6378169.00,
+                     'b': 6356583.80,
+                     'h': 35785831.00,
+                     'lon_0': 0,
+                     'proj': 'geos'}
+        north = AreaDefinition('north', 'north', 'geos', proj_dict, 100, 50,
+                               [-5500000., 3000000., 5500000., 5500000.])
+        lon, lat = hf.get_geostationary_segment_bounding_box(north, 20)
+        self.assertEqual(len(lon), 12)
+        self.assertTrue(np.isfinite(lon).all())
+        self.assertTrue(np.isfinite(lat).all())
+        # the south edge follows the segment, not the disk
+        self.assertAlmostEqual(lat.min(), 29.0, 1)
+        self.assertAlmostEqual(lon[lat.argmin()], 0, 3)
+        self.assertAlmostEqual(lat.max(), 74.8, 1)
+        self.assertTrue((np.abs(lon) < 75).all())
+
+        south = AreaDefinition('south', 'south', 'geos', proj_dict, 100, 50,
+                               [-5500000., 0., 5500000., 3000000.])
+        stacked = StackedAreaDefinition(north, south)
+        lon, lat = hf.get_geostationary_segment_bounding_box(stacked, 20)
+        self.assertAlmostEqual(lat.min(), 0, 3)
+        self.assertAlmostEqual(lat.max(), 74.8, 1)
+
     def test_get_geostationary_angle_extent(self):
         """Get max geostationary angles."""
         geos_area = mock.MagicMock()
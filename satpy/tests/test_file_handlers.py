@@ -36,6 +36,27 @@ import numpy as np
 from satpy.readers.file_handlers import BaseFileHandler
 
 
+class _Handle(object):
+    """Fake open file object."""
+
+
+class _ReopeningFileHandler(BaseFileHandler):
+    """File handler keeping an open file object."""
+
+    file_handle_attributes = ('handle', )
+
+    def __init__(self, filename, filename_info, filetype_info):
+        super(_ReopeningFileHandler, self).__init__(filename, filename_info,
+                                                    filetype_info)
+        self.reopen(refresh=True)
+
+    def reopen(self, refresh=False):
+        self.handle = self.open_shared('fake', _Handle, refresh)
+
+    def close(self):
+        self.release_shared('fake', self.__dict__.pop('handle'))
+
+
 class TestBaseFileHandler(unittest.TestCase):
     """Test the BaseFileHandler."""
 
@@ -107,16 +128,152 @@ class TestBaseFileHandler(unittest.TestCase):
         self.assertTupleEqual(sdef.call_args[1]['lats'].shape, (2, 5))
         self.assertEqual(sdef.return_value.name, 'area1_area2')
 
+    def test_pickle_reopen(self):
+        """Test that unpickled file handlers reopen their files."""
+        import pickle
+        from satpy.readers.file_handlers import FILE_HANDLES
+        fh = _ReopeningFileHandler('filename', {'filename_info': 'bla'},
+                                   'filetype_info')
+        state = pickle.dumps(fh)
+        self.assertNotIn(b'_Handle', state)
+        # the file is shared by the copies in the same process
+        new_fh = pickle.loads(state)
+        self.assertEqual(new_fh.filename_info, {'filename_info': 'bla'})
+        self.assertIs(new_fh.handle, fh.handle)
+        # new file handlers open the file again
+        other_fh = _ReopeningFileHandler('filename', {}, 'filetype_info')
+        self.assertIsNot(other_fh.handle, fh.handle)
+        self.assertIs(pickle.loads(state).handle, other_fh.handle)
+        # other processes open their own file
+        with mock.patch('satpy.readers.file_handlers.os.getpid',
+                        return_value=-1):
+            self.assertIsNot(pickle.loads(state).handle, other_fh.handle)
+        FILE_HANDLES.clear()
+
+    def test_close_reopen(self):
+        """Test that closed file handlers reopen their files when used."""
+        from satpy.readers.file_handlers import FILE_HANDLES
+        fh = _ReopeningFileHandler('filename', {}, 'filetype_info')
+        handle = fh.handle
+        fh.close()
+        self.assertNotIn('handle', fh.__dict__)
+        self.assertNotIn(('filename', 'fake'), FILE_HANDLES)
+        new_handle = fh.handle
+        self.assertIsNot(new_handle, handle)
+        self.assertIs(fh.handle, new_handle)
+        self.assertRaises(AttributeError, getattr, fh, 'other')
+        FILE_HANDLES.clear()
+
+    def test_pickle_without_file_handles(self):
+        """Test that file handlers without file objects aren't reopened."""
+        import pickle
+        new_fh = pickle.loads(pickle.dumps(self.fh))
+        self.assertEqual(new_fh.filename, 'filename')
+
     def tearDown(self):
         """Tear down the test."""
         BaseFileHandler.__abstractmethods__ = self._old_set
 
 
+class TestFileHandlePool(unittest.TestCase):
+    """Test the FileHandlePool."""
+
+    def test_reuse_and_eviction(self):
+        """Test that handles are reused and the oldest closed when full."""
+        from satpy.readers.file_handlers import FileHandlePool
+        pool = FileHandlePool(max_size=2)
+        opener = mock.MagicMock(side_effect=lambda: mock.MagicMock())
+        handle_a = pool.get(('a', None), opener)
+        self.assertIs(pool.get(('a', None), opener), handle_a)
+        self.assertEqual((pool.hits, pool.misses), (1, 1))
+        handle_b = pool.get(('b', None), opener)
+        # 'a' is used again so 'b' is the least recently used
+        pool.get(('a', None), opener)
+        pool.get(('c', None), opener)
+        self.assertEqual(len(pool), 2)
+        handle_b.close.assert_called_once_with()
+        handle_a.close.assert_not_called()
+        self.assertNotIn(('b', None), pool)
+        self.assertEqual((pool.hits, pool.misses), (2, 3))
+        pool.reset_stats()
+        self.assertEqual((pool.hits, pool.misses), (0, 0))
+
+    def test_close(self):
+        """Test closing the handles of one file or all of them."""
+        from satpy.readers.file_handlers import FileHandlePool
+        pool = FileHandlePool()
+        handles = [pool.get(key, mock.MagicMock) for key in
+                   [('a', 'g1'), ('a', 'g2'), ('b', None)]]
+        pool.close('a')
+        handles[0].close.assert_called_once_with()
+        handles[1].close.assert_called_once_with()
+        handles[2].close.assert_not_called()
+        self.assertEqual(len(pool), 1)
+        pool.close()
+        handles[2].close.assert_called_once_with()
+        self.assertEqual(len(pool), 0)
+
+
+class TestProcessFileHandles(unittest.TestCase):
+    """Test the ProcessFileHandles."""
+
+    def test_get(self):
+        """Test that file objects are shared while they are used."""
+        import gc
+        from satpy.readers.file_handlers import ProcessFileHandles
+        handles = ProcessFileHandles(max_recent=1)
+        handle_a = handles.get(('a', None), _Handle)
+        self.assertIs(handles.get(('a', None), _Handle), handle_a)
+        new_handle_a = handles.get(('a', None), _Handle, refresh=True)
+        self.assertIsNot(new_handle_a, handle_a)
+        handle_a = new_handle_a
+        del new_handle_a
+        self.assertEqual((handles.hits, handles.misses), (1, 2))
+        handles.get(('b', None), _Handle)
+        # the file object is kept while it is used
+        self.assertIs(handles.get(('a', None), _Handle), handle_a)
+        # and forgotten once it isn't used nor among the recent ones
+        handles.get(('b', None), _Handle)
+        del handle_a
+        gc.collect()
+        self.assertNotIn(('a', None), handles)
+        self.assertIn(('b', None), handles)
+        handles.clear()
+        gc.collect()
+        self.assertEqual(len(handles), 0)
+        handles.reset_stats()
+        self.assertEqual((handles.hits, handles.misses), (0, 0))
+
+    def test_discard(self):
+        """Test forgetting a file object."""
+        from satpy.readers.file_handlers import ProcessFileHandles
+        handles = ProcessFileHandles()
+        handle = handles.get(('a', None), _Handle)
+        new_handle = handles.get(('a', None), _Handle, refresh=True)
+        # a file object replaced by a new one doesn't discard the new one
+        handles.discard(('a', None), handle)
+        self.assertIs(handles.get(('a', None), _Handle), new_handle)
+        handles.discard(('a', None), new_handle)
+        self.assertNotIn(('a', None), handles)
+        self.assertEqual(len(handles._recent), 0)
+
+    def test_fork(self):
+        """Test that the file objects of the parent process are forgotten."""
+        from satpy.readers.file_handlers import ProcessFileHandles
+        handles = ProcessFileHandles()
+        handle = handles.get(('a', None), _Handle)
+        with mock.patch('satpy.readers.file_handlers.os.getpid',
+                        return_value=-1):
+            self.assertIsNot(handles.get(('a', None), _Handle), handle)
+
+
 def suite():
     """The test suite for test_projector.
     """
     loader = unittest.TestLoader()
     my_suite = unittest.TestSuite()
     my_suite.addTest(loader.loadTestsFromTestCase(TestBaseFileHandler))
+    my_suite.addTest(loader.loadTestsFromTestCase(TestFileHandlePool))
+    my_suite.addTest(loader.loadTestsFromTestCase(TestProcessFileHandles))
 
     return my_suite
@@ -134,6 +134,26 @@ class TestMultiScene(unittest.TestCase):
         self.assertSetEqual(mscn.shared_dataset_ids, {ds1_id, ds2_id})
         self.assertFalse(mscn.all_same_area)
 
+    def test_resample_many(self):
+        """Test resampling the scenes to several areas at once."""
+        import xarray as xr
+        from satpy import MultiScene
+        area = _create_test_area()
+        scenes = _create_test_scenes(area=area)
+        dst_areas = [_create_test_area(shape=(4, 4)),
+                     _create_test_area(shape=(2, 3))]
+        mscn = MultiScene(scenes)
+        with mock.patch('satpy.scene.resample_dataset') as rs:
+            rs.side_effect = lambda dataset, dst_area, **kwargs: xr.DataArray(
+                dataset.data[:dst_area.shape[0], :dst_area.shape[1]],
+                dims=dataset.dims, attrs=dataset.attrs)
+            new_mscns = mscn.resample_many(dst_areas, resampler='nearest')
+        self.assertEqual(len(new_mscns), 2)
+        for new_mscn, dst_area in zip(new_mscns, dst_areas):
+            self.assertEqual(len(new_mscn.scenes), 2)
+            for scn in new_mscn.scenes:
+                self.assertTupleEqual(scn['ds1'].shape, dst_area.shape)
+
 
 class TestMultiSceneSave(unittest.TestCase):
     """Test saving a MultiScene to various formats."""
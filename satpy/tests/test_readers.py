@@ -191,6 +191,58 @@ class TestDatasetDict(unittest.TestCase):
         self.assertEqual(d[0.5]['resolution'], 500)
         self.assertEqual(d[0.5]['name'], 'testh')
 
+    def test_index_matches_filtering(self):
+        """Test that the index gives the same results as filtering keys."""
+        from satpy.dataset import DatasetID
+        from satpy.readers import filter_keys_by_dataset_id
+        d = self.test_dict
+        queries = [DatasetID(name='test4', modifiers=None),
+                   DatasetID(wavelength=0.5, modifiers=None),
+                   DatasetID(wavelength=1.65, resolution=1000, modifiers=None),
+                   DatasetID(wavelength=(0, 0.5, 1), modifiers=None),
+                   DatasetID(name='test5', modifiers=('mod2',)),
+                   DatasetID(name='test6', level=100, modifiers=None),
+                   DatasetID(calibration='radiance', modifiers=None),
+                   DatasetID(name='test_bad', modifiers=None),
+                   DatasetID(modifiers=None),
+                   DatasetID(name='test')]
+        for query in queries:
+            self.assertListEqual(
+                d.index.filter(query),
+                sorted(filter_keys_by_dataset_id(query, self.regular_dict)))
+
+    def test_index_updates(self):
+        """Test that the index follows modifications of the dictionary."""
+        from satpy.dataset import DatasetID
+        d = self.test_dict
+        del d['test']
+        self.assertNotIn('test', d)
+        self.assertEqual(d[0.5], '1h')
+        d.pop(DatasetID(name='testh', wavelength=(0, 0.5, 1), resolution=500))
+        self.assertNotIn(0.5, d)
+        d.update({DatasetID(name='test7', resolution=250): '7'})
+        self.assertEqual(d['test7'], '7')
+        d.setdefault(DatasetID(name='test8'), '8')
+        self.assertEqual(d['test8'], '8')
+        key, _ = d.popitem()
+        self.assertNotIn(key, d.index)
+        self.assertEqual(len(d.index), len(d))
+        d.clear()
+        self.assertEqual(len(d.index), 0)
+        self.assertNotIn('test2', d)
+
+    def test_copy_and_pickle(self):
+        """Test that copies get their own index."""
+        import copy
+        import pickle
+        for new_dict in (copy.deepcopy(self.test_dict),
+                         pickle.loads(pickle.dumps(self.test_dict))):
+            self.assertDictEqual(dict(new_dict), self.regular_dict)
+            self.assertIsNot(new_dict.index, self.test_dict.index)
+            self.assertEqual(new_dict['test'], '1')
+            del new_dict['test']
+            self.assertIn('test', self.test_dict)
+
 
 class TestReaderLoader(unittest.TestCase):
     """Test the `load_readers` function.
@@ -449,15 +501,67 @@ class TestFindFilesAndReaders(unittest.TestCase):
 
     def test_reader_load_failed(self):
         """Test that an exception is raised when a reader can't be loaded."""
+        from satpy.config import CONFIG_CACHE
         from satpy.readers import find_files_and_readers
         import yaml
-        # touch the file so it exists on disk
+        # make sure the configuration is really parsed
+        CONFIG_CACHE.clear()
         with mock.patch('yaml.load') as load:
             load.side_effect = yaml.YAMLError("Import problems")
             self.assertRaises(yaml.YAMLError, find_files_and_readers,
                               reader='viirs_sdr')
 
 
+class TestReaderConfigCache(unittest.TestCase):
+    """Test the caching of parsed reader configuration files."""
+
+    def setUp(self):
+        """Start every test with an empty cache."""
+        from satpy.config import CONFIG_CACHE
+        CONFIG_CACHE.clear()
+
+    def test_reader_config_reused(self):
+        """Test that reader configs are only parsed once."""
+        from satpy.config import CONFIG_CACHE
+        from satpy.readers import configs_for_reader, load_reader
+        reader_configs = list(configs_for_reader('viirs_sdr'))[0]
+        reader1 = load_reader(reader_configs)
+        misses = CONFIG_CACHE.misses
+        with mock.patch('yaml.load') as load:
+            reader2 = load_reader(reader_configs)
+            load.assert_not_called()
+        self.assertEqual(CONFIG_CACHE.misses, misses)
+        self.assertEqual(CONFIG_CACHE.hits, 2)
+        self.assertSetEqual(set(reader1.all_dataset_ids),
+                            set(reader2.all_dataset_ids))
+        # instances must not share mutable state
+        self.assertIsNot(reader1.config, reader2.config)
+        ds_id = next(iter(reader1.all_dataset_ids))
+        self.assertIsNot(reader1.ids[ds_id], reader2.ids[ds_id])
+        reader1.info['filenames'].append('fake.h5')
+        self.assertListEqual(reader2.info['filenames'], [])
+
+    def test_modified_config_reloaded(self):
+        """Test that a modified config file invalidates the cache."""
+        import tempfile
+        from satpy.config import CONFIG_CACHE
+        from satpy.readers import read_reader_config
+        handle, fn = tempfile.mkstemp(suffix='.yaml')
+        os.close(handle)
+        try:
+            with open(fn, 'w') as fd:
+                fd.write("reader:\n  name: fake1\n")
+            self.assertEqual(read_reader_config([fn])['name'], 'fake1')
+            with open(fn, 'w') as fd:
+                fd.write("reader:\n  name: fake_2\n")
+            self.assertEqual(read_reader_config([fn])['name'], 'fake_2')
+            self.assertEqual(CONFIG_CACHE.misses, 2)
+            self.assertEqual(read_reader_config([fn])['name'], 'fake_2')
+            self.assertEqual(CONFIG_CACHE.hits, 1)
+        finally:
+            os.remove(fn)
+
+
 class TestYAMLFiles(unittest.TestCase):
     """Test and analyze the reader configuration files."""
 
@@ -505,6 +609,7 @@ def suite():
     mysuite.addTest(loader.loadTestsFromTestCase(TestDatasetDict))
     mysuite.addTest(loader.loadTestsFromTestCase(TestReaderLoader))
     mysuite.addTest(loader.loadTestsFromTestCase(TestFindFilesAndReaders))
+    mysuite.addTest(loader.loadTestsFromTestCase(TestReaderConfigCache))
     mysuite.addTest(loader.loadTestsFromTestCase(TestYAMLFiles))
 
     return mysuite
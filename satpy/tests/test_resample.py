@@ -33,6 +33,11 @@ except ImportError:
     import mock
 
 
+def _raise_value_error(block):
+    """Fail to compute *block*."""
+    raise ValueError("Can't compute this block")
+
+
 class TestHLResample(unittest.TestCase):
     """Test the higher level resampling functions."""
 
@@ -62,25 +67,31 @@ class TestKDTreeResampler(unittest.TestCase):
     @mock.patch('satpy.resample.np.savez')
     @mock.patch('satpy.resample.np.load')
     @mock.patch('satpy.resample.KDTreeResampler._create_cache_filename')
+    @mock.patch('satpy.resample.KDTreeResampler.get_hash')
     @mock.patch('satpy.resample.XArrayResamplerNN')
-    def test_kd_resampling(self, resampler, create_filename, load, savez):
+    def test_kd_resampling(self, resampler, get_hash, create_filename, load, savez):
         """Test the kd resampler."""
         import numpy as np
         import dask.array as da
-        from satpy.resample import KDTreeResampler
+        from satpy.resample import KDTreeResampler, RESAMPLE_CACHE
         from pyresample.geometry import SwathDefinition
+        RESAMPLE_CACHE.clear()
+        get_hash.side_effect = lambda mask=None, **kwargs: 'fake_hash_{}'.format(mask)
         source_area = mock.MagicMock()
         source_swath = SwathDefinition(
             da.arange(5, chunks=5), da.arange(5, chunks=5))
         target_area = mock.MagicMock()
 
         resampler = KDTreeResampler(source_swath, target_area)
+        load.side_effect = IOError()
         resampler.precompute(
             mask=da.arange(5, chunks=5).astype(np.bool), cache_dir='.')
         resampler.resampler.get_neighbour_info.assert_called()
-        # swath definitions should not be cached
-        self.assertFalse(len(savez.mock_calls), 0)
+        # masked swath definitions are cached too
+        self.assertEqual(len(savez.mock_calls), 1)
         resampler.resampler.reset_mock()
+        savez.reset_mock()
+        load.reset_mock()
 
         resampler = KDTreeResampler(source_area, target_area)
         resampler.precompute()
@@ -88,6 +99,7 @@ class TestKDTreeResampler(unittest.TestCase):
 
         try:
             the_dir = tempfile.mkdtemp()
+            RESAMPLE_CACHE.clear()
             resampler = KDTreeResampler(source_area, target_area)
             create_filename.return_value = os.path.join(the_dir, 'test_cache.npz')
             load.side_effect = IOError()
@@ -97,7 +109,7 @@ class TestKDTreeResampler(unittest.TestCase):
             # assert that load was called to try to load something from disk
             self.assertEqual(len(load.mock_calls), 1)
             # we should have cached things in-memory
-            self.assertEqual(len(resampler._index_caches), 1)
+            self.assertEqual(len(RESAMPLE_CACHE), 1)
             nbcalls = len(resampler.resampler.get_neighbour_info.mock_calls)
             # test reusing the resampler
             load.side_effect = None
@@ -116,16 +128,23 @@ class TestKDTreeResampler(unittest.TestCase):
             # we already have things cached in-memory, don't need to load
             self.assertEqual(len(load.mock_calls), 1)
             # we should have cached things in-memory
-            self.assertEqual(len(resampler._index_caches), 1)
+            self.assertEqual(len(RESAMPLE_CACHE), 1)
+            self.assertEqual(len(resampler.resampler.get_neighbour_info.mock_calls), nbcalls)
+
+            # test reusing the in-memory cache from another resampler
+            resampler = KDTreeResampler(source_area, target_area)
+            resampler.precompute(cache_dir=the_dir)
+            self.assertEqual(len(load.mock_calls), 1)
             self.assertEqual(len(resampler.resampler.get_neighbour_info.mock_calls), nbcalls)
 
             # test loading saved resampler
+            RESAMPLE_CACHE.clear()
             resampler = KDTreeResampler(source_area, target_area)
             resampler.precompute(cache_dir=the_dir)
             self.assertEqual(len(load.mock_calls), 2)
             self.assertEqual(len(resampler.resampler.get_neighbour_info.mock_calls), nbcalls)
             # we should have cached things in-memory now
-            self.assertEqual(len(resampler._index_caches), 1)
+            self.assertEqual(len(RESAMPLE_CACHE), 1)
         finally:
             shutil.rmtree(the_dir)
 
@@ -136,10 +155,268 @@ class TestKDTreeResampler(unittest.TestCase):
         resampler.compute(data, fill_value=fill_value)
         resampler.resampler.get_sample_from_neighbour_info.assert_called_with(data, fill_value)
 
+    def test_kd_resampling_lazy(self):
+        """Test the indexes are only computed before saving them to a file."""
+        import numpy as np
+        import dask
+        import dask.array as da
+        import xarray as xr
+        from pyresample.geometry import AreaDefinition
+        from satpy.resample import KDTreeResampler, RESAMPLE_CACHE
+        proj_dict = {'proj': 'eqc', 'lon_0': 0., 'units': 'm'}
+        source = AreaDefinition('src', 'src', 'src', proj_dict, 10, 10,
+                                (-111000., -111000., 111000., 111000.))
+        target = AreaDefinition('dst', 'dst', 'dst', proj_dict, 5, 5,
+                                (-111000., -111000., 111000., 111000.))
+        arr = xr.DataArray(da.arange(100., chunks=50).reshape((10, 10)),
+                           dims=('y', 'x'))
+        the_dir = tempfile.mkdtemp()
+        try:
+            RESAMPLE_CACHE.clear()
+            with mock.patch('satpy.resample.dask.persist',
+                            side_effect=dask.persist) as persist:
+                resampler = KDTreeResampler(source, target)
+                res = resampler.resample(arr, radius_of_influence=50000)
+                persist.assert_not_called()
+                self.assertEqual(len(RESAMPLE_CACHE), 1)
+                self.assertIsInstance(resampler.resampler.index_array,
+                                      da.Array)
+                RESAMPLE_CACHE.clear()
+                resampler = KDTreeResampler(source, target)
+                cached = resampler.resample(arr, cache_dir=the_dir,
+                                            radius_of_influence=50000)
+                self.assertEqual(persist.call_count, 1)
+            np.testing.assert_array_equal(res.values, cached.values)
+        finally:
+            shutil.rmtree(the_dir)
+
+
+class TestMaskHash(unittest.TestCase):
+    """Test hashing the masks of the resampled data."""
+
+    def test_get_hash_with_mask(self):
+        """Test masks with the same content give the same hash."""
+        import numpy as np
+        import dask.array as da
+        import xarray as xr
+        from pyresample.geometry import AreaDefinition
+        from satpy.resample import BaseResampler
+        area = AreaDefinition('test', 'test', 'test',
+                              {'proj': 'eqc', 'lon_0': 0., 'units': 'm'},
+                              4, 4, (-1000., -1000., 1000., 1000.))
+        resampler = BaseResampler(area, area)
+        mask = np.zeros((4, 4), dtype=bool)
+        mask[0, :] = True
+        mask1 = xr.DataArray(da.from_array(mask, chunks=2), dims=('y', 'x'))
+        mask2 = xr.DataArray(da.from_array(mask.copy(), chunks=2) > 0, dims=('y', 'x'))
+        mask3 = xr.DataArray(da.from_array(~mask, chunks=2), dims=('y', 'x'))
+        self.assertNotEqual(mask1.data.name, mask2.data.name)
+        self.assertEqual(resampler.get_hash(mask=mask1), resampler.get_hash(mask=mask2))
+        self.assertNotEqual(resampler.get_hash(mask=mask1), resampler.get_hash(mask=mask3))
+        self.assertNotEqual(resampler.get_hash(mask=mask1), resampler.get_hash())
+
+    def test_kd_resampling_masked_cache(self):
+        """Test masked neighbour info is saved and reused from the cache dir."""
+        import numpy as np
+        import dask.array as da
+        import xarray as xr
+        from pyresample.geometry import SwathDefinition, AreaDefinition
+        from satpy.resample import KDTreeResampler, RESAMPLE_CACHE
+        lons = xr.DataArray(da.from_array(np.linspace(-1, 1, 25).reshape((5, 5)), chunks=5),
+                            dims=('y', 'x'))
+        lats = xr.DataArray(da.from_array(np.linspace(-1, 1, 25).reshape((5, 5)).T, chunks=5),
+                            dims=('y', 'x'))
+        source = SwathDefinition(lons, lats)
+        target = AreaDefinition('test', 'test', 'test',
+                                {'proj': 'eqc', 'lon_0': 0., 'units': 'm'},
+                                5, 5, (-111000., -111000., 111000., 111000.))
+        data = np.arange(25.).reshape((5, 5))
+        data[0, 0] = np.nan
+        the_dir = tempfile.mkdtemp()
+        try:
+            results = []
+            for _ in range(2):
+                RESAMPLE_CACHE.clear()
+                RESAMPLE_CACHE.reset_stats()
+                arr = xr.DataArray(da.from_array(data, chunks=5), dims=('y', 'x'))
+                resampler = KDTreeResampler(source, target)
+                results.append(resampler.resample(arr, cache_dir=the_dir,
+                                                  radius_of_influence=50000).values)
+            self.assertEqual(len(os.listdir(the_dir)), 1)
+            self.assertEqual(RESAMPLE_CACHE.stats['disk_hits'], 1)
+            np.testing.assert_array_equal(results[0], results[1])
+        finally:
+            shutil.rmtree(the_dir)
+
+    def test_kd_resampling_different_masks(self):
+        """Test datasets of one swath with different masks aren't mixed up."""
+        import numpy as np
+        import dask.array as da
+        import xarray as xr
+        from pyresample.geometry import SwathDefinition, AreaDefinition
+        from satpy.resample import KDTreeResampler, RESAMPLE_CACHE
+        lons = xr.DataArray(da.from_array(np.linspace(-1, 1, 25).reshape((5, 5)), chunks=5),
+                            dims=('y', 'x'))
+        lats = xr.DataArray(da.from_array(np.linspace(-1, 1, 25).reshape((5, 5)).T, chunks=5),
+                            dims=('y', 'x'))
+        source = SwathDefinition(lons, lats)
+        target = AreaDefinition('test', 'test', 'test',
+                                {'proj': 'eqc', 'lon_0': 0., 'units': 'm'},
+                                5, 5, (-111000., -111000., 111000., 111000.))
+        arrays = []
+        for nan_row in (0, 4):
+            data = np.arange(25.).reshape((5, 5))
+            data[nan_row, :] = np.nan
+            arrays.append(xr.DataArray(da.from_array(data, chunks=5),
+                                       dims=('y', 'x'), name='Radiance'))
+        expected = []
+        for arr in arrays:
+            RESAMPLE_CACHE.clear()
+            resampler = KDTreeResampler(source, target)
+            expected.append(resampler.resample(
+                arr, radius_of_influence=50000).values)
+        self.assertFalse(np.array_equal(np.isnan(expected[0]),
+                                        np.isnan(expected[1])))
+        # both datasets resampled in turn with the in-memory cache
+        RESAMPLE_CACHE.clear()
+        for arr, exp in zip(arrays, expected):
+            resampler = KDTreeResampler(source, target)
+            res = resampler.resample(arr, radius_of_influence=50000)
+            np.testing.assert_array_equal(res.values, exp)
+        self.assertEqual(len(RESAMPLE_CACHE), 2)
+
+
+class TestResampleCache(unittest.TestCase):
+    """Test the cache of resampling parameters."""
+
+    def test_memory_tier(self):
+        """Test the least recently used entries are removed from memory."""
+        import numpy as np
+        from satpy.resample import ResampleCache
+        cache = ResampleCache(max_entries=2)
+        for key in ('a', 'b', 'c'):
+            cache.put(key, {'index': np.zeros(10)})
+        self.assertNotIn('a', cache)
+        self.assertIsNotNone(cache.get('b'))
+        cache.put('d', {'index': np.zeros(10)})
+        self.assertIn('b', cache)
+        self.assertNotIn('c', cache)
+        self.assertIsNone(cache.get('c'))
+        self.assertEqual(cache.stats, {'memory_hits': 1, 'disk_hits': 0, 'misses': 1})
+
+        cache = ResampleCache(max_entries=None, max_bytes=200)
+        for key in ('a', 'b', 'c'):
+            cache.put(key, {'index': np.zeros(10)})
+        self.assertEqual(len(cache), 2)
+
+    def test_pickle(self):
+        """Test pickling the cache with its entries."""
+        import pickle
+        import numpy as np
+        from satpy.resample import ResampleCache
+        cache = ResampleCache()
+        cache.put('a', {'index': np.arange(10)})
+        new_cache = pickle.loads(pickle.dumps(cache))
+        np.testing.assert_array_equal(new_cache.get('a')['index'],
+                                      np.arange(10))
+        new_cache.put('b', {'index': np.arange(10)})
+        self.assertEqual(len(new_cache), 2)
+
+    def test_disk_tier(self):
+        """Test the cache files and their eviction."""
+        import numpy as np
+        from satpy.resample import ResampleCache
+        the_dir = tempfile.mkdtemp()
+        try:
+            cache = ResampleCache(max_disk_entries=2)
+            filenames = [os.path.join(the_dir, 'resample_lut-{}.npz'.format(key))
+                         for key in ('a', 'b', 'c')]
+            for key, filename in zip(('a', 'b'), filenames):
+                cache.put(key, {'index': np.arange(10)}, filename)
+            # mark 'a' as the most recently used file
+            os.utime(filenames[1], (0, 0))
+            cache.clear()
+            np.testing.assert_array_equal(cache.get('a', filenames[0])['index'],
+                                          np.arange(10))
+            self.assertIn('a', cache)
+            cache.put('c', {'index': np.arange(10)}, filenames[2])
+            self.assertListEqual([os.path.exists(fn) for fn in filenames],
+                                 [True, False, True])
+            self.assertIsNone(cache.get('b', filenames[1]))
+            self.assertEqual(cache.stats, {'memory_hits': 0, 'disk_hits': 1, 'misses': 1})
+        finally:
+            shutil.rmtree(the_dir)
+
+    def test_save_dir_stale_tmp(self):
+        """Test saving a directory over a temporary one of a crashed process."""
+        import threading
+        import numpy as np
+        import dask.array as da
+        from satpy.resample import ResampleCache
+        the_dir = tempfile.mkdtemp()
+        try:
+            dirname = os.path.join(the_dir, 'resample_lut-a')
+            tmp_dirname = '{}.tmp{}-{}'.format(dirname, os.getpid(),
+                                               threading.current_thread().ident)
+            os.mkdir(tmp_dirname)
+            with open(os.path.join(tmp_dirname, 'rows.npy'), 'w') as fd:
+                fd.write('incomplete')
+            value = ResampleCache().put('a', {'cols': da.arange(10, chunks=4)},
+                                        dirname)
+            self.assertListEqual(sorted(value.keys()), ['cols'])
+            self.assertListEqual(os.listdir(the_dir), ['resample_lut-a'])
+            # nothing is left behind when the data can't be computed
+            self.assertRaises(ValueError, ResampleCache().put, 'b',
+                              {'cols': da.arange(10, chunks=4).map_blocks(
+                                  _raise_value_error, dtype=np.int64)},
+                              os.path.join(the_dir, 'resample_lut-b'))
+            self.assertListEqual(os.listdir(the_dir), ['resample_lut-a'])
+        finally:
+            shutil.rmtree(the_dir)
+
+    def test_chunked_disk_tier(self):
+        """Test saving dask arrays to a cache directory."""
+        import numpy as np
+        import dask.array as da
+        from satpy.resample import ResampleCache
+        the_dir = tempfile.mkdtemp()
+        try:
+            cache = ResampleCache(max_disk_entries=1)
+            dirname = os.path.join(the_dir, 'resample_lut-a')
+            value = cache.put('a', {'cols': da.arange(10, chunks=4),
+                                    'fill': np.zeros(3)}, dirname)
+            self.assertTrue(os.path.isdir(dirname))
+            self.assertIsInstance(value['cols'], da.Array)
+            cache.clear()
+            value = cache.get('a', dirname)
+            self.assertEqual(value['cols'].chunks, ((4, 4, 2), ))
+            np.testing.assert_array_equal(value['cols'], np.arange(10))
+            np.testing.assert_array_equal(value['fill'], np.zeros(3))
+            # directories being written by other processes are left alone
+            # unless they were left over by a crashed process
+            os.mkdir(os.path.join(the_dir, 'resample_lut-c.tmp1234'))
+            stale_dirname = os.path.join(the_dir, 'resample_lut-d.tmp5678')
+            os.mkdir(stale_dirname)
+            with open(os.path.join(stale_dirname, 'cols.npy'), 'w'):
+                pass
+            for filename in (os.path.join(stale_dirname, 'cols.npy'), stale_dirname):
+                os.utime(filename, (0, 0))
+            cache.put('b', {'cols': da.arange(10, chunks=4)},
+                      os.path.join(the_dir, 'resample_lut-b'))
+            self.assertListEqual(sorted(os.listdir(the_dir)),
+                                 ['resample_lut-b', 'resample_lut-c.tmp1234'])
+        finally:
+            shutil.rmtree(the_dir)
+
 
 class TestEWAResampler(unittest.TestCase):
     """Test EWA resampler class."""
 
+    def setUp(self):
+        """Start from an empty resampling cache."""
+        from satpy.resample import RESAMPLE_CACHE
+        RESAMPLE_CACHE.clear()
+
     @mock.patch('satpy.resample.fornav')
     @mock.patch('satpy.resample.ll2cr')
     def test_2d_ewa(self, ll2cr, fornav):
@@ -242,6 +519,158 @@ class TestEWAResampler(unittest.TestCase):
         self.assertEqual(ll2cr.call_count, previous_calls)
         new_data.compute()
 
+    def test_tiled_ewa(self):
+        """Test that tiled EWA gives the same result as one fornav call."""
+        import numpy as np
+        import dask.array as da
+        import xarray as xr
+        from satpy.resample import resample_dataset
+        from pyresample.geometry import SwathDefinition, AreaDefinition
+        lons, lats = np.meshgrid(np.linspace(-10., 10., 40),
+                                 np.linspace(50., 40., 30))
+        sgd = SwathDefinition(xr.DataArray(da.from_array(lons, chunks=10)),
+                              xr.DataArray(da.from_array(lats, chunks=10)))
+        tgd = AreaDefinition('test', 'test', 'test',
+                             {'proj': 'eqc', 'lon_0': 0., 'ellps': 'WGS84'},
+                             30, 25,
+                             (-1300000., 4200000., 1300000., 5800000.))
+        data = np.arange(30 * 40, dtype=np.float32).reshape((30, 40))
+        input_data = xr.DataArray(da.from_array(data, chunks=10),
+                                  dims=('y', 'x'), attrs={'area': sgd})
+
+        expected = resample_dataset(input_data, tgd, resampler='ewa',
+                                    rows_per_scan=2).values
+        res = resample_dataset(input_data, tgd, resampler='ewa',
+                               rows_per_scan=2, tile_size=(7, 9))
+        self.assertEqual(res.data.chunks, ((7, 7, 7, 4), (9, 9, 9, 3)))
+        self.assertTrue(np.isfinite(expected).any())
+        np.testing.assert_allclose(res.values, expected, rtol=1e-5)
+
+        rgb = xr.DataArray(da.from_array(np.stack([data, data * 2]),
+                                         chunks=10),
+                           dims=('bands', 'y', 'x'), attrs={'area': sgd})
+        res = resample_dataset(rgb, tgd, resampler='ewa', rows_per_scan=2,
+                               tile_size=10)
+        self.assertTupleEqual(res.shape, (2, 25, 30))
+        np.testing.assert_allclose(res.values[1], expected * 2, rtol=1e-5)
+
+    def test_ewa_cache_dir(self):
+        """Test saving the EWA columns and rows to disk."""
+        import numpy as np
+        import dask.array as da
+        import xarray as xr
+        from satpy.resample import resample_dataset, RESAMPLE_CACHE
+        from pyresample.geometry import SwathDefinition, AreaDefinition
+        lons, lats = np.meshgrid(np.linspace(-10., 10., 40),
+                                 np.linspace(50., 40., 30))
+        sgd = SwathDefinition(xr.DataArray(da.from_array(lons, chunks=10)),
+                              xr.DataArray(da.from_array(lats, chunks=10)))
+        tgd = AreaDefinition('test', 'test', 'test',
+                             {'proj': 'eqc', 'lon_0': 0., 'ellps': 'WGS84'},
+                             30, 25,
+                             (-1300000., 4200000., 1300000., 5800000.))
+        input_data = xr.DataArray(
+            da.from_array(np.arange(30 * 40.).reshape((30, 40)), chunks=10),
+            dims=('y', 'x'), attrs={'area': sgd})
+        the_dir = tempfile.mkdtemp()
+        try:
+            expected = resample_dataset(input_data, tgd, resampler='ewa',
+                                        rows_per_scan=2,
+                                        cache_dir=the_dir).values
+            self.assertEqual(len(os.listdir(the_dir)), 1)
+            RESAMPLE_CACHE.clear()
+            RESAMPLE_CACHE.reset_stats()
+            with mock.patch('satpy.resample.ll2cr') as ll2cr:
+                res = resample_dataset(input_data, tgd, resampler='ewa',
+                                       rows_per_scan=2, cache_dir=the_dir)
+                np.testing.assert_array_equal(res.values, expected)
+            self.assertFalse(ll2cr.called)
+            self.assertEqual(RESAMPLE_CACHE.stats['disk_hits'], 1)
+        finally:
+            shutil.rmtree(the_dir)
+
+
+class TestBilinearResampler(unittest.TestCase):
+    """Test the bilinear resampler class."""
+
+    def setUp(self):
+        """Create the test swath and area."""
+        import numpy as np
+        import dask.array as da
+        import xarray as xr
+        from pyresample.geometry import SwathDefinition, AreaDefinition
+        from satpy.resample import RESAMPLE_CACHE
+        RESAMPLE_CACHE.clear()
+        RESAMPLE_CACHE.reset_stats()
+        self.lons, self.lats = np.meshgrid(np.linspace(-10., 10., 40),
+                                           np.linspace(50., 40., 30))
+        self.sgd = SwathDefinition(
+            xr.DataArray(da.from_array(self.lons, chunks=10)),
+            xr.DataArray(da.from_array(self.lats, chunks=10)))
+        self.tgd = AreaDefinition('test', 'test', 'test',
+                                  {'proj': 'eqc', 'lon_0': 0.,
+                                   'ellps': 'WGS84'},
+                                  30, 25,
+                                  (-1300000., 4200000., 1300000., 5800000.))
+        self.data = np.arange(30 * 40.).reshape((30, 40))
+
+    @mock.patch('satpy.resample.CHUNK_SIZE', 10)
+    def test_bilinear(self):
+        """Test bilinear resampling gives the same result as pyresample."""
+        import numpy as np
+        import dask.array as da
+        import xarray as xr
+        from pyresample.bilinear import resample_bilinear
+        from pyresample.geometry import SwathDefinition
+        from satpy.resample import resample_dataset
+        expected = resample_bilinear(self.data,
+                                     SwathDefinition(self.lons, self.lats),
+                                     self.tgd, radius=50000, fill_value=None)
+        expected = np.ma.filled(expected, np.nan)
+        input_data = xr.DataArray(da.from_array(self.data, chunks=10),
+                                  dims=('y', 'x'),
+                                  attrs={'area': self.sgd, 'test': 'test'})
+        res = resample_dataset(input_data, self.tgd, resampler='bilinear',
+                               radius_of_influence=50000)
+        self.assertEqual(res.data.chunks, ((10, 10, 5), (10, 10, 10)))
+        self.assertEqual(res.attrs['test'], 'test')
+        self.assertTrue(np.isfinite(expected).any())
+        np.testing.assert_allclose(res.values, expected)
+
+        rgb = xr.DataArray(da.from_array(np.stack([self.data] * 3),
+                                         chunks=10),
+                           dims=('bands', 'y', 'x'), attrs={'area': self.sgd})
+        res = resample_dataset(rgb, self.tgd, resampler='bilinear',
+                               radius_of_influence=50000, fill_value=0)
+        self.assertTupleEqual(res.shape, (3, 25, 30))
+        np.testing.assert_allclose(res.values[2],
+                                   np.where(np.isnan(expected), 0, expected))
+
+    def test_bilinear_cache_dir(self):
+        """Test saving the bilinear coefficients to disk."""
+        import numpy as np
+        import dask.array as da
+        import xarray as xr
+        from satpy.resample import resample_dataset, RESAMPLE_CACHE
+        input_data = xr.DataArray(da.from_array(self.data, chunks=10),
+                                  dims=('y', 'x'), attrs={'area': self.sgd})
+        the_dir = tempfile.mkdtemp()
+        try:
+            expected = resample_dataset(input_data, self.tgd,
+                                        resampler='bilinear',
+                                        cache_dir=the_dir).values
+            self.assertEqual(len(os.listdir(the_dir)), 1)
+            RESAMPLE_CACHE.clear()
+            with mock.patch('satpy.resample.get_bil_info') as get_bil_info:
+                res = resample_dataset(input_data, self.tgd,
+                                       resampler='bilinear',
+                                       cache_dir=the_dir)
+                np.testing.assert_array_equal(res.values, expected)
+            self.assertFalse(get_bil_info.called)
+            self.assertEqual(RESAMPLE_CACHE.stats['disk_hits'], 1)
+        finally:
+            shutil.rmtree(the_dir)
+
 
 class TestNativeResampler(unittest.TestCase):
     """Tests for the 'native' resampling method."""
@@ -391,7 +820,10 @@ def suite():
     mysuite = unittest.TestSuite()
     mysuite.addTest(loader.loadTestsFromTestCase(TestNativeResampler))
     mysuite.addTest(loader.loadTestsFromTestCase(TestKDTreeResampler))
+    mysuite.addTest(loader.loadTestsFromTestCase(TestResampleCache))
+    mysuite.addTest(loader.loadTestsFromTestCase(TestMaskHash))
     mysuite.addTest(loader.loadTestsFromTestCase(TestEWAResampler))
+    mysuite.addTest(loader.loadTestsFromTestCase(TestBilinearResampler))
     mysuite.addTest(loader.loadTestsFromTestCase(TestHLResample))
 
     return mysuite
@@ -56,6 +56,17 @@ class TestScene(unittest.TestCase):
         import satpy.scene
         self.assertRaises(ValueError, satpy.scene.Scene, reader='blo', filenames='test.nc')
 
+    def test_close(self):
+        """Test that closing the Scene closes the readers."""
+        import satpy.scene
+        from satpy.tests.utils import create_fake_reader
+        with mock.patch('satpy.scene.Scene.create_reader_instances') as cri:
+            reader = create_fake_reader('fake_reader', sensor_name='fake_sensor')
+            cri.return_value = {'fake_reader': reader}
+            scene = satpy.scene.Scene(filenames=['bla'], reader='fake_reader')
+            scene.close()
+            reader.close.assert_called_once_with()
+
     def test_init_with_sensor(self):
         import satpy.scene
         from satpy.tests.utils import create_fake_reader
@@ -671,6 +682,32 @@ class TestSceneLoading(unittest.TestCase):
         self.assertTupleEqual(
             tuple(loaded_ids[0]), tuple(DatasetID(name='ds1')))
 
+    @mock.patch('satpy.scene.Scene.create_reader_instances')
+    def test_load_ds1_area(self, cri):
+        """Test that the area to load is passed on to the readers."""
+        import satpy.scene
+        from satpy.tests.utils import create_fake_reader
+        r = create_fake_reader('fake_reader', 'fake_sensor')
+        reader_load = r.load.side_effect
+        r.load.side_effect = lambda dataset_keys, area=None: reader_load(
+            dataset_keys)
+        cri.return_value = {'fake_reader': r}
+        scene = satpy.scene.Scene(filenames=['bla'],
+                                  base_dir='bli',
+                                  reader='fake_reader')
+        scene.load(['ds1'], ll_bbox=(-10., 30., 30., 60.))
+        area = r.load.call_args[1]['area']
+        self.assertEqual(area.proj_dict['proj'], 'latlong')
+        self.assertTupleEqual(area.area_extent, (-10., 30., 30., 60.))
+        self.assertIn('ds1', scene)
+
+        scene.load(['ds2'], area='euro4')
+        self.assertEqual(r.load.call_args[1]['area'].area_id, 'euro4')
+        scene.load(['ds3'])
+        self.assertNotIn('area', r.load.call_args[1])
+        self.assertRaises(ValueError, scene.load, ['ds4'], area='euro4',
+                          ll_bbox=(-10., 30., 30., 60.))
+
     @mock.patch('satpy.scene.Scene.create_reader_instances')
     def test_load_ds1_load_twice(self, cri):
         """Test loading one dataset with no loaded compositors"""
@@ -1124,6 +1161,60 @@ class TestSceneLoading(unittest.TestCase):
         self.assertTupleEqual(
             tuple(loaded_ids[0]), tuple(DatasetID(name='comp19')))
 
+    @mock.patch('satpy.composites.CompositorLoader.load_compositors')
+    @mock.patch('satpy.scene.Scene.create_reader_instances')
+    def test_dep_tree_shared_nodes(self, cri, cl):
+        """Test dependency tree queries when nodes have multiple parents."""
+        import satpy.scene
+        from satpy.tests.utils import create_fake_reader, test_composites
+        from satpy import DatasetID
+        cri.return_value = {'fake_reader': create_fake_reader(
+            'fake_reader', 'fake_sensor')}
+        comps, mods = test_composites('fake_sensor')
+        cl.return_value = (comps, mods)
+        scene = satpy.scene.Scene(filenames=['bla'],
+                                  base_dir='bli',
+                                  reader='fake_reader')
+        dep_tree = scene.dep_tree
+        dep_tree.find_dependencies({'comp19'})
+        shared_dep_id = DatasetID(name='ds5', modifiers=('res_change',))
+        comp19 = dep_tree['comp19']
+        comp13 = dep_tree['comp13']
+        shared_dep = dep_tree[shared_dep_id]
+
+        # the shared modified ds5 is a child of comp19 and comp13
+        trunk = dep_tree.trunk()
+        self.assertEqual(len(trunk), 3)
+        self.assertEqual(set(id(n) for n in trunk),
+                         set([id(comp19), id(comp13), id(shared_dep)]))
+        self.assertEqual(len(dep_tree.trunk(unique=False)), 4)
+        leaves = dep_tree.leaves()
+        self.assertEqual(sorted(n.name.name for n in leaves), ['ds2', 'ds5'])
+
+        # prerequisites are generated before the composites using them
+        order = dep_tree.trunk_order()
+        self.assertIs(order[-1], comp19)
+        self.assertLess(order.index(shared_dep), order.index(comp13))
+
+        # queries are cached until the tree changes
+        self.assertIsNot(dep_tree.trunk(), dep_tree.trunk())
+        self.assertEqual(len(dep_tree._query_cache), 4)
+        dep_tree.find_dependencies({'comp14'})
+        self.assertEqual(len(dep_tree._query_cache), 0)
+        self.assertEqual(len(dep_tree.trunk()), 4)
+
+        # copies have their own nodes, still shared by the same parents
+        new_tree = scene.copy().dep_tree
+        self.assertIsNot(new_tree['comp19'], comp19)
+        self.assertEqual(new_tree['comp19'].name, comp19.name)
+        self.assertIs(new_tree['comp13'].children[0], new_tree[shared_dep_id])
+        self.assertIn(new_tree[shared_dep_id], new_tree['comp19'].children)
+        self.assertEqual(len(new_tree.trunk()), 4)
+        new_tree.add_leaf(DatasetID(name='new_ds'))
+        self.assertIn('new_ds', new_tree)
+        self.assertNotIn('new_ds', dep_tree)
+        self.assertEqual(len(new_tree.children), len(dep_tree.children) + 1)
+
     @mock.patch('satpy.composites.CompositorLoader.load_compositors')
     @mock.patch('satpy.scene.Scene.create_reader_instances')
     def test_load_multiple_comps(self, cri, cl):
@@ -1265,7 +1356,7 @@ class TestSceneLoading(unittest.TestCase):
             # this is the unmodified ds1
             self.assertIn(DatasetID(name='ds1'), loaded_ids)
             # m.assert_called_once_with(set([scene.dep_tree['ds1']]))
-            m.assert_called_once_with(set())
+            m.assert_called_once_with([])
         with mock.patch.object(scene, '_read_composites', wraps=scene._read_composites) as m:
             scene.load(['ds1'])
             self.assertEqual(r.load.call_count, 2)
@@ -1273,7 +1364,7 @@ class TestSceneLoading(unittest.TestCase):
             self.assertEqual(len(loaded_ids), 2)
             # this is the unmodified ds1
             self.assertIn(DatasetID(name='ds1'), loaded_ids)
-            m.assert_called_once_with(set())
+            m.assert_called_once_with([])
         # we should only generate the composite once
         self.assertEqual(comps['fake_sensor'][
                          'comp10'].side_effect.call_count, 1)
@@ -1420,6 +1511,51 @@ class TestSceneLoading(unittest.TestCase):
         self.assertIn(ds1_mod_id, scene.datasets)
         self.assertIn(ds3_mod_id, scene.datasets)
 
+    @mock.patch('satpy.composites.CompositorLoader.load_compositors', autospec=True)
+    @mock.patch('satpy.scene.Scene.create_reader_instances')
+    def test_available_composite_ids_cached(self, cri, cl):
+        """Test that available composites are cached and modifiers unused."""
+        import satpy.scene
+        from satpy.tests.utils import create_fake_reader, test_composites
+        from satpy import DatasetID, DatasetDict
+        cri.return_value = {'fake_reader': create_fake_reader(
+            'fake_reader', 'fake_sensor')}
+        comps, mods = test_composites('fake_sensor')
+
+        def _test(self, sensor_names):
+            if not self.compositors:
+                self.compositors = comps
+                self.modifiers = mods
+            new_comps = {}
+            new_mods = {}
+            for sn in sensor_names:
+                new_comps[sn] = DatasetDict(
+                    self.compositors[sn].copy())
+                new_mods[sn] = self.modifiers[sn].copy()
+            return new_comps, new_mods
+
+        cl.side_effect = _test
+        scene = satpy.scene.Scene(filenames=['bla'],
+                                  base_dir='bli',
+                                  reader='fake_reader')
+        with mock.patch('satpy.scene.DependencyTree.get_modifier') as gm:
+            avail_comps = scene.available_composite_ids()
+            gm.assert_not_called()
+        self.assertIn(DatasetID(name='comp10'), avail_comps)
+        self.assertIn(DatasetID(name='comp19'), avail_comps)
+        # missing required prerequisite
+        self.assertNotIn(DatasetID(name='comp8'), avail_comps)
+        # missing optional prerequisite
+        self.assertIn(DatasetID(name='comp9'), avail_comps)
+
+        with mock.patch('satpy.scene.DependencyTree.is_available') as ia:
+            self.assertListEqual(scene.available_composite_ids(), avail_comps)
+            ia.assert_not_called()
+            # different available datasets are checked again
+            ia.return_value = False
+            self.assertListEqual(scene.available_composite_ids(
+                available_datasets=[DatasetID(name='ds1')]), [])
+
     @mock.patch('satpy.composites.CompositorLoader.load_compositors', autospec=True)
     @mock.patch('satpy.scene.Scene.create_reader_instances')
     def test_load_comp11_and_23(self, cri, cl):
@@ -1618,6 +1754,76 @@ class TestSceneResampling(unittest.TestCase):
         self.assertIn('comp10', new_scn.datasets)
         self.assertEqual(len(new_scn.missing_datasets), 0)
 
+    @mock.patch('satpy.scene.resample_dataset')
+    @mock.patch('satpy.composites.CompositorLoader.load_compositors')
+    @mock.patch('satpy.scene.Scene.create_reader_instances')
+    def test_resample_twice_generate(self, cri, cl, rs):
+        """Test generating composites when resampling a scene twice.
+
+        The composite ID is updated with a resolution when it is generated,
+        which must not affect the dependency tree of the original Scene.
+
+        """
+        import satpy.scene
+        from satpy.tests.utils import create_fake_reader, test_composites
+        from pyresample.geometry import AreaDefinition
+        cri.return_value = {'fake_reader': create_fake_reader(
+            'fake_reader', 'fake_sensor')}
+        comps, mods = test_composites('fake_sensor')
+        cl.return_value = (comps, mods)
+        rs.side_effect = self._fake_resample_dataset
+        area_def = AreaDefinition('test', 'test', 'test',
+                                  {'proj': 'eqc', 'lon_0': 0.}, 200, 400,
+                                  (-1000., -1500., 1000., 1500.))
+        scene = satpy.scene.Scene(filenames=['bla'],
+                                  base_dir='bli',
+                                  reader='fake_reader')
+        scene.load(['comp14'], generate=False)
+        for _ in range(2):
+            new_scn = scene.resample(area_def)
+            self.assertIn('comp14', new_scn.datasets)
+            self.assertEqual(new_scn['comp14'].attrs['resolution'], 555)
+        self.assertIsNone(scene.dep_tree['comp14'].name.resolution)
+        for new_scn in scene.resample_many([area_def, area_def]):
+            self.assertIn('comp14', new_scn.datasets)
+
+    def test_resample_many(self):
+        """Test resampling to several areas sharing the reduced source."""
+        import numpy as np
+        import dask.array as da
+        import xarray as xr
+        from satpy.scene import Scene
+        from pyresample.geometry import AreaDefinition
+        proj_dict = {'proj': 'eqc', 'lon_0': 0., 'ellps': 'WGS84'}
+        src_area = AreaDefinition('src', 'src', 'src', proj_dict, 40, 30,
+                                  (-2000000., -1500000., 2000000., 1500000.))
+        dst_areas = [
+            AreaDefinition('dst1', 'dst1', 'dst1', proj_dict, 10, 10,
+                           (-1500000., -1000000., -500000., 0.)),
+            AreaDefinition('dst2', 'dst2', 'dst2', proj_dict, 10, 10,
+                           (0., -500000., 1000000., 500000.)),
+        ]
+        scene = Scene()
+        scene['ds1'] = xr.DataArray(
+            da.from_array(np.arange(30 * 40.).reshape((30, 40)), chunks=10),
+            dims=('y', 'x'), attrs={'name': 'ds1', 'area': src_area})
+
+        with mock.patch('satpy.scene.resample_dataset') as rs:
+            rs.side_effect = self._fake_resample_dataset
+            scene.resample_many(dst_areas)
+            source_areas = [call[0][0].attrs['area'] for call in rs.call_args_list]
+        self.assertIs(source_areas[0], source_areas[1])
+        self.assertTupleEqual(source_areas[0].shape, (16, 26))
+        self.assertIs(scene['ds1'].attrs['area'], src_area)
+
+        new_scenes = scene.resample_many(dst_areas, radius_of_influence=100000)
+        self.assertEqual(len(new_scenes), 2)
+        for new_scn, dst_area in zip(new_scenes, dst_areas):
+            self.assertIs(new_scn['ds1'].attrs['area'], dst_area)
+            expected = scene.resample(dst_area, radius_of_influence=100000)
+            np.testing.assert_array_equal(new_scn['ds1'].values,
+                                          expected['ds1'].values)
+
 
 class TestSceneSaving(unittest.TestCase):
     """Test the Scene's saving method."""
@@ -136,6 +136,45 @@ class TestEnhancer(unittest.TestCase):
         self.assertRaises(
             ValueError, Enhancer, enhancement_config_file="is_not_a_valid_filename_?.yaml")
 
+    def test_shared_enhancement_tree(self):
+        """Test that enhancement configs are only parsed once."""
+        from satpy.config import CONFIG_CACHE
+        from satpy.writers import Enhancer
+        CONFIG_CACHE.clear()
+        e1 = Enhancer()
+        with mock.patch('yaml.load') as load:
+            e2 = Enhancer()
+            load.assert_not_called()
+        self.assertIs(e1.enhancement_tree, e2.enhancement_tree)
+
+    def test_find_match_memoized(self):
+        """Test that matches are only searched once per attributes."""
+        from satpy.writers import EnhancementDecisionTree
+        tree = EnhancementDecisionTree({
+            'default': {'operations': []},
+            'ir': {'name': 'ir', 'operations': ['ir']},
+        })
+        with mock.patch.object(tree, '_find_match',
+                               wraps=tree._find_match) as find_match:
+            self.assertEqual(tree.find_match(name='ir', uid='a')['operations'],
+                             ['ir'])
+            num_calls = find_match.call_count
+            self.assertEqual(tree.find_match(name='ir', uid='b')['operations'],
+                             ['ir'])
+            self.assertEqual(find_match.call_count, num_calls)
+            self.assertEqual(tree.find_match(name='vis')['operations'], [])
+            self.assertGreater(find_match.call_count, num_calls)
+            # unhashable values are never remembered
+            tree.find_match(name='ir', sensor=['a', 'b'])
+            num_calls = find_match.call_count
+            tree.find_match(name='ir', sensor=['a', 'b'])
+            self.assertGreater(find_match.call_count, num_calls)
+            # new configs invalidate the results
+            tree.add_config_to_tree({'vis': {'name': 'vis',
+                                             'operations': ['vis']}})
+            self.assertEqual(tree.find_match(name='vis')['operations'],
+                             ['vis'])
+
 
 class TestEnhancerUserConfigs(unittest.TestCase):
     """Test `Enhancer` functionality when user's custom configurations are present."""
@@ -292,6 +331,24 @@ sensor_name: visir/test_sensor2
                              os.path.abspath(self.ENH_ENH_FN)})
         np.testing.assert_almost_equal(img.data.isel(bands=0).max().values, 0.5)
 
+    def test_shared_sensor_enhancement_tree(self):
+        """Test that enhancers share the trees with sensor configs."""
+        from satpy.writers import Enhancer
+        e1 = Enhancer()
+        generic_tree = e1.enhancement_tree
+        e1.add_sensor_enhancements('test_sensor')
+        self.assertIsNot(e1.enhancement_tree, generic_tree)
+        match = generic_tree.find_match(name='test1', units='kelvin',
+                                        sensor='test_sensor')
+        self.assertEqual(match['operations'][0]['kwargs']['stretch'], 'linear')
+        e2 = Enhancer()
+        self.assertIs(e2.enhancement_tree, generic_tree)
+        e2.add_sensor_enhancements('test_sensor')
+        self.assertIs(e1.enhancement_tree, e2.enhancement_tree)
+        match = e2.enhancement_tree.find_match(name='test1', units='kelvin',
+                                               sensor='test_sensor')
+        self.assertEqual(match['operations'][0]['kwargs']['stretch'], 'crude')
+
 
 class TestYAMLFiles(unittest.TestCase):
     """Test and analyze the writer configuration files."""
@@ -27,6 +27,9 @@ import unittest
 from datetime import datetime
 from tempfile import mkdtemp
 
+import numpy as np
+import xarray as xr
+
 import satpy.readers.yaml_reader as yr
 from satpy.readers.file_handlers import BaseFileHandler
 from satpy.dataset import DatasetID
@@ -58,6 +61,42 @@ class FakeFH(BaseFileHandler):
         return self._end_time
 
 
+class FakeSegmentFH(BaseFileHandler):
+    """Fake file handler for one 4-line segment of an image."""
+
+    def __init__(self, segment, image):
+        super(FakeSegmentFH, self).__init__("", {}, {})
+        self.segment = segment
+        self.image = image
+        self.windows = []
+
+    @property
+    def start_time(self):
+        return datetime(2018, 1, 1, 12, self.segment)
+
+    @property
+    def end_time(self):
+        return datetime(2018, 1, 1, 12, self.segment + 1)
+
+    def get_area_def(self, dsid):
+        area = MagicMock()
+        area.y_size = 4
+        return area
+
+    def get_dataset(self, dsid, ds_info, xslice=slice(None),
+                    yslice=slice(None)):
+        self.windows.append((xslice, yslice))
+        lines = self.image[self.segment * 4:(self.segment + 1) * 4]
+        return xr.DataArray(lines[yslice, xslice], dims=['y', 'x'])
+
+
+class FakeWholeSegmentFH(FakeSegmentFH):
+    """Fake segment file handler not taking slices."""
+
+    def get_dataset(self, dsid, ds_info):
+        return super(FakeWholeSegmentFH, self).get_dataset(dsid, ds_info)
+
+
 class TestUtils(unittest.TestCase):
     """Test the utility functions."""
 
@@ -129,6 +168,8 @@ class TestFileFileYAMLReaderMultiplePatterns(unittest.TestCase):
     @patch('satpy.readers.yaml_reader.yaml', spec=yr.yaml)
     def setUp(self, _, rec_up):  # pylint: disable=arguments-differ
         """Setup a reader instance with a fake config."""
+        from satpy.config import CONFIG_CACHE
+        CONFIG_CACHE.clear()
         patterns = ['a{something:3s}.bla',
                     'a0{something:2s}.bla']
         res_dict = {'reader': {'name': 'fake',
@@ -184,6 +225,61 @@ class TestFileFileYAMLReaderMultiplePatterns(unittest.TestCase):
         self.reader.create_filehandlers(filelist)
         self.assertEqual(len(self.reader.file_handlers['ftype1']), 3)
 
+    def test_create_filehandlers_threaded(self):
+        """Check create_filehandlers with multiple workers."""
+        filelist = ['a001.bla', 'a002.bla', 'a001.bla', 'a002.bla',
+                    'abcd.bla', 'k001.bla', 'a003.bli']
+        ft_info = self.config['file_types']['ftype1']
+        sequential = [fh.filename for fh in self.reader.new_filehandler_instances(
+            ft_info, self.reader.filename_items_for_filetype(filelist, ft_info))]
+
+        self.reader.filehandler_workers = 4
+        self.reader.create_filehandlers(filelist)
+        self.assertEqual(len(self.reader.file_handlers['ftype1']), 3)
+        threaded = [fh.filename for fh in self.reader.new_filehandler_instances(
+            ft_info, self.reader.filename_items_for_filetype(filelist, ft_info))]
+        self.assertListEqual(threaded, sequential)
+
+    def test_create_filehandlers_threaded_error(self):
+        """Check that errors are raised the same way with multiple workers."""
+        filelist = ['a001.bla', 'a002.bla', 'abcd.bla']
+        ft_info = self.config['file_types']['ftype1']
+
+        def _bad_reader(filename, filename_info, filetype_info):
+            if filename != 'a001.bla':
+                raise IOError("Bad file {}".format(filename))
+            return DummyReader(filename, filename_info, filetype_info)
+
+        ft_info['file_reader'] = _bad_reader
+        for workers in (None, 3):
+            self.reader.filehandler_workers = workers
+            fhs = self.reader.new_filehandler_instances(
+                ft_info, self.reader.filename_items_for_filetype(filelist, ft_info))
+            with self.assertRaisesRegexp(IOError, 'Bad file a002.bla'):
+                list(fhs)
+
+    def test_create_filehandlers_threaded_error_close(self):
+        """Check that the created file handlers are closed on errors."""
+        filelist = ['a001.bla', 'a002.bla', 'a003.bla']
+        ft_info = self.config['file_types']['ftype1']
+        created = []
+
+        def _bad_reader(filename, filename_info, filetype_info):
+            if filename == 'a002.bla':
+                raise IOError("Bad file {}".format(filename))
+            created.append(MagicMock(filename=filename))
+            return created[-1]
+
+        ft_info['file_reader'] = _bad_reader
+        self.reader.filehandler_workers = 3
+        fhs = self.reader.new_filehandler_instances(
+            ft_info, self.reader.filename_items_for_filetype(filelist, ft_info))
+        with self.assertRaisesRegexp(IOError, 'Bad file a002.bla'):
+            list(fhs)
+        self.assertEqual(len(created), 2)
+        for fh in created:
+            fh.close.assert_called_once_with()
+
 
 class TestFileFileYAMLReader(unittest.TestCase):
     """Test units from FileYAMLReader."""
@@ -192,6 +288,8 @@ class TestFileFileYAMLReader(unittest.TestCase):
     @patch('satpy.readers.yaml_reader.yaml', spec=yr.yaml)
     def setUp(self, _, rec_up):  # pylint: disable=arguments-differ
         """Setup a reader instance with a fake config."""
+        from satpy.config import CONFIG_CACHE
+        CONFIG_CACHE.clear()
         patterns = ['a{something:3s}.bla']
         res_dict = {'reader': {'name': 'fake',
                                'sensors': ['canon']},
@@ -220,6 +318,17 @@ class TestFileFileYAMLReader(unittest.TestCase):
                                             'end_time': datetime(2000, 1, 2),
         })
 
+    def test_pickle(self):
+        """Check that the reader can be pickled without its coords cache."""
+        import pickle
+        from weakref import WeakValueDictionary
+        sdef = MagicMock()
+        self.reader.coords_cache[('lons', 'lats')] = sdef
+        new_reader = pickle.loads(pickle.dumps(self.reader))
+        self.assertIsInstance(new_reader.coords_cache, WeakValueDictionary)
+        self.assertEqual(len(new_reader.coords_cache), 0)
+        self.assertEqual(new_reader.info['name'], 'fake')
+
     def test_all_dataset_ids(self):
         """Check that all datasets ids are returned."""
         self.assertSetEqual(set(self.reader.all_dataset_ids),
@@ -307,22 +416,76 @@ class TestFileFileYAMLReader(unittest.TestCase):
         file_handler = FakeFH(datetime(1999, 12, 31, 10, 0),
                               datetime(2000, 1, 3, 12, 30))
 
-        self.reader.filter_parameters['area'] = True
+        area = MagicMock()
+        self.reader.filter_parameters['area'] = area
         bnd.return_value.contour_poly.intersection.return_value = True
         adb.return_value.contour_poly.intersection.return_value = True
-        res = self.reader.check_file_covers_area(file_handler, True)
+        res = self.reader.check_file_covers_area(file_handler, area)
         self.assertTrue(res)
 
         bnd.return_value.contour_poly.intersection.return_value = False
         adb.return_value.contour_poly.intersection.return_value = False
-        res = self.reader.check_file_covers_area(file_handler, True)
+        res = self.reader.check_file_covers_area(file_handler, area)
         self.assertFalse(res)
 
         file_handler.get_bounding_box.side_effect = NotImplementedError()
-        self.reader.filter_parameters['area'] = True
-        res = self.reader.check_file_covers_area(file_handler, True)
+        self.reader.filter_parameters['area'] = area
+        res = self.reader.check_file_covers_area(file_handler, area)
         self.assertTrue(res)
 
+        # area names are looked up, area definitions used as they are
+        file_handler.get_bounding_box.side_effect = None
+        adb.reset_mock()
+        res = self.reader.check_file_covers_area(file_handler, 'euro4')
+        gad.assert_called_once_with('euro4')
+        self.assertIs(adb.call_args[0][0], gad.return_value)
+        gad.reset_mock()
+        res = self.reader.check_file_covers_area(file_handler, area)
+        gad.assert_not_called()
+        self.assertIs(adb.call_args[0][0], area)
+
+    def test_segment_covers_area(self):
+        """Test that segments are checked against the area from headers."""
+        from pyresample.geometry import AreaDefinition
+        proj_dict = {'a': 6378169.0, 'b': 6356583.8, 'h': 35785831.0,
+                     'lon_0': 0.0, 'proj': 'geos', 'units': 'm'}
+        extent = 5570248.477339261
+        segments = []
+        for idx in range(4):
+            top = extent - idx * extent / 2
+            area = AreaDefinition('seg', 'seg', 'geos', proj_dict, 3712, 928,
+                                  (-extent, top - extent / 2, extent, top))
+            fh = FakeFH(datetime(2000, 1, 1), datetime(2000, 1, 1, 0, 15))
+            fh.get_segment_area_def = MagicMock(return_value=area)
+            fh.get_bounding_box.side_effect = (
+                lambda area=area:
+                    yr.get_geostationary_segment_bounding_box(area))
+            segments.append(fh)
+
+        # same projection, compared on the extents only
+        north = AreaDefinition('north', 'north', 'geos', proj_dict, 10, 10,
+                               (-2000000, 3000000, 2000000, 5000000))
+        covering = [self.reader.check_file_covers_area(fh, north)
+                    for fh in segments]
+        self.assertEqual(covering, [True, False, False, False])
+        for fh in segments:
+            fh.get_bounding_box.assert_not_called()
+
+        # other projection, compared on lon/lat bounding boxes
+        latlong = AreaDefinition('ll', 'll', 'latlong', {'proj': 'latlong'},
+                                 10, 10, (-10, 35, 30, 70))
+        covering = [self.reader.check_file_covers_area(fh, latlong)
+                    for fh in segments]
+        self.assertEqual(covering, [True, False, False, False])
+
+        # geos area reaching into space, seen from another longitude
+        proj_dict = dict(proj_dict, lon_0=9.5)
+        space = AreaDefinition('space', 'space', 'geos', proj_dict, 10, 10,
+                               (-extent, 2000000, extent, extent))
+        covering = [self.reader.check_file_covers_area(fh, space)
+                    for fh in segments]
+        self.assertEqual(covering, [True, True, False, False])
+
     def test_start_end_time(self):
         """Check start and end time behaviours."""
         self.reader.file_handlers = {}
@@ -488,6 +651,29 @@ class TestFileFileYAMLReader(unittest.TestCase):
 
         self.assertIs(proj, xarray.concat.return_value)
 
+    def test_load_dataset_window(self):
+        """Check loading a window of a dataset from segments."""
+        image = np.arange(12 * 6).reshape((12, 6))
+        file_handlers = [FakeSegmentFH(0, image),
+                         FakeWholeSegmentFH(1, image),
+                         FakeSegmentFH(2, image)]
+        dsid = DatasetID(name='ch01')
+        self.reader.ids = {dsid: {}}
+
+        res = self.reader._load_dataset_data(file_handlers, dsid,
+                                             xslice=slice(1, 4),
+                                             yslice=slice(3, 7))
+        np.testing.assert_array_equal(res.values, image[3:7, 1:4])
+        self.assertEqual(file_handlers[0].windows,
+                         [(slice(1, 4), slice(3, 4))])
+        # the whole segment is read then sliced
+        self.assertEqual(file_handlers[1].windows,
+                         [(slice(None), slice(None))])
+        # the last segment isn't covered by the window
+        self.assertEqual(file_handlers[2].windows, [])
+        self.assertEqual(res.attrs['start_time'], datetime(2018, 1, 1, 12, 0))
+        self.assertEqual(res.attrs['end_time'], datetime(2018, 1, 1, 12, 2))
+
 
 def suite():
     """The test suite for test_scene."""
@@ -28,6 +28,11 @@ from satpy import DatasetID
 
 import numpy as np
 
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
 if sys.version_info < (2, 7):
     import unittest2 as unittest
 else:
@@ -144,6 +149,152 @@ class TestCFWriter(unittest.TestCase):
         finally:
             os.remove(filename)
 
+    def test_compression_and_packing(self):
+        from satpy import Scene
+        import xarray as xr
+        import dask.array as da
+        import tempfile
+        scn = Scene()
+        start_time = datetime(2018, 5, 30, 10, 0)
+        end_time = datetime(2018, 5, 30, 10, 15)
+        data = np.linspace(-10., 10., 200).reshape((10, 20))
+        data[0, 0] = np.nan
+        scn['test-array'] = xr.DataArray(da.from_array(data, chunks=5),
+                                         dims=('y', 'x'),
+                                         attrs=dict(start_time=start_time,
+                                                    end_time=end_time))
+        scn['test-array2'] = xr.DataArray(da.from_array(data, chunks=5),
+                                          dims=('y', 'x'),
+                                          attrs=dict(start_time=start_time,
+                                                     end_time=end_time,
+                                                     valid_min=-20.,
+                                                     valid_max=20.))
+        # values outside of the valid range don't wrap around when packed
+        scn['test-array3'] = xr.DataArray(da.from_array(data * 12., chunks=5),
+                                          dims=('y', 'x'),
+                                          attrs=dict(start_time=start_time,
+                                                     end_time=end_time,
+                                                     valid_range=(-50., 100.)))
+        try:
+            handle, filename = tempfile.mkstemp()
+            os.close(handle)
+            scn.save_datasets(filename=filename, writer='cf',
+                              compression={'zlib': True, 'complevel': 4},
+                              chunks={'x': 10}, pack_dtype=np.int16,
+                              encoding={'test-array2': {'chunksizes': (5, 5)}})
+            import h5netcdf as nc4
+            with nc4.File(filename) as f:
+                var = f['test-array']
+                self.assertEqual(var.dtype, np.int16)
+                self.assertEqual(var.compression, 'gzip')
+                self.assertTupleEqual(var.chunks, (10, 10))
+                self.assertEqual(var.attrs['_FillValue'], -32768)
+                self.assertEqual(var[0, 0], -32768)
+                self.assertEqual(var[0, 1], -32767)
+                self.assertEqual(var[-1, -1], 32767)
+                var = f['test-array2']
+                self.assertTupleEqual(var.chunks, (5, 5))
+                self.assertAlmostEqual(var.attrs['scale_factor'], 40. / 65534)
+            with xr.open_dataset(filename) as nc:
+                np.testing.assert_allclose(nc['test-array'].values, data,
+                                           atol=20. / 65534)
+                expected = data * 12.
+                expected[(expected < -50.) | (expected > 100.)] = np.nan
+                self.assertTrue(np.isnan(expected[-1, -1]))
+                np.testing.assert_allclose(nc['test-array3'].values, expected,
+                                           atol=150. / 65534)
+            # the valid range applies to the packed values
+            import netCDF4
+            with netCDF4.Dataset(filename) as nc:
+                var = nc['test-array3']
+                np.testing.assert_array_equal(var.valid_range, [-32767, 32767])
+                self.assertEqual(var.valid_range.dtype, np.int16)
+                res = var[:]
+                np.testing.assert_array_equal(np.ma.getmaskarray(res),
+                                              np.isnan(expected))
+                np.testing.assert_allclose(res.compressed(),
+                                           expected[~np.isnan(expected)],
+                                           atol=150. / 65534)
+                var = nc['test-array2']
+                self.assertEqual(var.valid_min, -32767)
+                self.assertEqual(var.valid_max, 32767)
+                self.assertEqual(np.ma.count_masked(var[:]), 1)
+        finally:
+            os.remove(filename)
+
+    def test_packing_ranges_one_pass(self):
+        """Test the ranges of the packed datasets are computed together."""
+        from satpy import Scene
+        import xarray as xr
+        import dask
+        import dask.array as da
+        import tempfile
+        scn = Scene()
+        start_time = datetime(2018, 5, 30, 10, 0)
+        end_time = datetime(2018, 5, 30, 10, 15)
+        for i in range(3):
+            data = np.linspace(-10., 10., 200).reshape((10, 20)) * (i + 1)
+            scn['test-array{}'.format(i)] = xr.DataArray(
+                da.from_array(data, chunks=5), dims=('y', 'x'),
+                attrs=dict(start_time=start_time, end_time=end_time))
+        try:
+            handle, filename = tempfile.mkstemp()
+            os.close(handle)
+            with mock.patch('satpy.writers.cf_writer.dask.compute',
+                            side_effect=dask.compute) as compute:
+                res = scn.save_datasets(filename=filename, writer='cf',
+                                        pack_dtype=np.int16, compute=False)
+            self.assertEqual(compute.call_count, 1)
+            dask.compute(res)
+            with xr.open_dataset(filename) as nc:
+                for i in range(3):
+                    self.assertAlmostEqual(
+                        nc['test-array{}'.format(i)].encoding['scale_factor'],
+                        20. * (i + 1) / 65534)
+        finally:
+            os.remove(filename)
+
+    def test_groups_delayed(self):
+        from satpy import Scene
+        from satpy.writers import compute_writer_results
+        from pyresample.geometry import AreaDefinition
+        import xarray as xr
+        import dask.array as da
+        import tempfile
+        scn = Scene()
+        start_time = datetime(2018, 5, 30, 10, 0)
+        end_time = datetime(2018, 5, 30, 10, 15)
+        for area_id, shape in (('area1', (10, 20)), ('area2', (5, 10))):
+            area = AreaDefinition(area_id, area_id, area_id,
+                                  {'proj': 'geos', 'h': 35785831., 'a': 6378169.,
+                                   'b': 6356583.8, 'lon_0': 0.},
+                                  shape[1], shape[0],
+                                  (-1000000., -1000000., 1000000., 1000000.))
+            scn[area_id + '-array'] = xr.DataArray(
+                da.arange(shape[0] * shape[1], chunks=10).reshape(shape),
+                dims=('y', 'x'),
+                attrs=dict(start_time=start_time, end_time=end_time,
+                           area=area))
+        try:
+            handle, filename = tempfile.mkstemp()
+            os.close(handle)
+            res = scn.save_datasets(filename=filename, writer='cf',
+                                    groups=True, compute=False,
+                                    header_attrs={'sensor': 'SEVIRI'})
+            self.assertEqual(len(res), 2)
+            compute_writer_results([res])
+            with xr.open_dataset(filename) as nc:
+                self.assertEqual(nc.attrs['sensor'], 'SEVIRI')
+                self.assertEqual(len(nc.data_vars), 0)
+            for area_id, size in (('area1', 200), ('area2', 50)):
+                with xr.open_dataset(filename, group=area_id) as nc:
+                    np.testing.assert_array_equal(
+                        nc[area_id + '-array'].values.ravel(), np.arange(size))
+                    self.assertEqual(nc[area_id + '-array'].attrs['grid_mapping'],
+                                     'geos')
+        finally:
+            os.remove(filename)
+
 
 def suite():
     """The test suite for this writer's tests.
@@ -112,6 +112,94 @@ class TestGeoTIFFWriter(unittest.TestCase):
                           dtype=np.float32)
         w.save_datasets(datasets)
 
+    def test_cog_write(self):
+        """Test writing tiles and overviews in one pass."""
+        import xarray as xr
+        import dask.array as da
+        from datetime import datetime
+        from osgeo import gdal
+        from satpy.writers.geotiff import GeoTIFFWriter
+        data = np.arange(100 * 200, dtype=np.float32).reshape((100, 200))
+        ds = xr.DataArray(da.from_array(data, chunks=30), dims=('y', 'x'),
+                          attrs={'name': 'test',
+                                 'start_time': datetime.utcnow()})
+        w = GeoTIFFWriter(base_dir=self.base_dir, enhancement_config=False,
+                          dtype=np.float32)
+        res = w.save_datasets([ds], cog=True, blockxsize=32, blockysize=32,
+                              compress='DEFLATE', compute=False)
+        # chunks are aligned with the tiles
+        self.assertEqual(res[0][0].chunks,
+                         ((1, ), (32, 32, 32, 4), (32, ) * 6 + (8, )))
+        target = res[1][0]
+        with mock.patch.object(target, '_write_tile',
+                               wraps=target._write_tile) as write_tile:
+            da.store(res[0], res[1], lock=True)
+        # every overview tile is written once, when it is complete
+        num_tiles = 0
+        for i in range(3):
+            ovr = target.dst_ds.GetRasterBand(1).GetOverview(i)
+            blockxsize, blockysize = ovr.GetBlockSize()
+            num_tiles += (-(-ovr.XSize // blockxsize) *
+                          -(-ovr.YSize // blockysize))
+        self.assertEqual(write_tile.call_count, num_tiles)
+        self.assertEqual(len(set(call[0] for call in
+                                 write_tile.call_args_list)), num_tiles)
+        self.assertEqual(target._tiles, {})
+        target.close()
+
+        # the temporary file is removed
+        self.assertEqual(len(os.listdir(self.base_dir)), 1)
+        fn = os.path.join(self.base_dir, os.listdir(self.base_dir)[0])
+        dst_ds = gdal.Open(fn)
+        bnd = dst_ds.GetRasterBand(1)
+        self.assertEqual(bnd.GetBlockSize(), [32, 32])
+        np.testing.assert_allclose(bnd.ReadAsArray(), data)
+        self.assertEqual(bnd.GetOverviewCount(), 3)
+        for i, factor in enumerate((2, 4, 8)):
+            np.testing.assert_allclose(bnd.GetOverview(i).ReadAsArray(),
+                                       data[::factor, ::factor])
+        # COG layout: the IFDs first, then the data of the smallest overview
+        # first and of the full resolution image last
+        bands = [bnd] + [bnd.GetOverview(i) for i in range(3)]
+        ifd_offsets = [int(b.GetMetadataItem('IFD_OFFSET', 'TIFF'))
+                       for b in bands]
+        data_offsets = [int(b.GetMetadataItem('BLOCK_OFFSET_0_0', 'TIFF'))
+                        for b in bands]
+        self.assertEqual(ifd_offsets, sorted(ifd_offsets))
+        self.assertEqual(data_offsets, sorted(data_offsets, reverse=True))
+        self.assertGreater(data_offsets[-1], ifd_offsets[-1])
+
+    def test_cog_write_error(self):
+        """Test no file is left behind when the COG data can't be computed."""
+        import xarray as xr
+        import dask.array as da
+        from datetime import datetime
+        from satpy.writers.geotiff import GeoTIFFWriter
+
+        def fail(block, block_info=None):
+            if block_info[0]['array-location'][0][0] > 0:
+                raise ValueError("Bad block")
+            return block
+
+        data = da.from_array(np.ones((100, 200), dtype=np.float32),
+                             chunks=32)
+        ds = xr.DataArray(data.map_blocks(fail, dtype=data.dtype),
+                          dims=('y', 'x'),
+                          attrs={'name': 'test',
+                                 'start_time': datetime.utcnow()})
+        w = GeoTIFFWriter(base_dir=self.base_dir, enhancement_config=False,
+                          dtype=np.float32)
+        self.assertRaises(ValueError, w.save_datasets, [ds], cog=True,
+                          blockxsize=32, blockysize=32)
+        self.assertEqual(os.listdir(self.base_dir), [])
+
+        # targets that are never closed are removed too
+        res = w.save_datasets([ds], cog=True, blockxsize=32, blockysize=32,
+                              compute=False)
+        self.assertEqual(len(os.listdir(self.base_dir)), 1)
+        del res
+        self.assertEqual(os.listdir(self.base_dir), [])
+
 
 def suite():
     """The test suite for this writer's tests.
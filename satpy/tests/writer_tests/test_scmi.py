@@ -23,6 +23,7 @@ from glob import glob
 from datetime import datetime, timedelta
 
 import numpy as np
+import dask
 import dask.array as da
 
 try:
@@ -266,6 +267,119 @@ class TestSCMIWriter(unittest.TestCase):
         all_files = glob(os.path.join(self.base_dir, 'TESTS_AII*test_ds_B*.nc'))
         self.assertEqual(len(all_files), 9)
 
+    def test_numbered_tiles_global_scaling(self):
+        """Test that tiles share the scaling and empty tiles are skipped"""
+        from netCDF4 import Dataset
+        from satpy.writers.scmi import SCMIWriter, NetCDFWrapper
+        from xarray import DataArray
+        from pyresample.geometry import AreaDefinition
+        from pyresample.utils import proj4_str_to_dict
+        w = SCMIWriter(base_dir=self.base_dir, compress=True)
+        area_def = AreaDefinition(
+            'test',
+            'test',
+            'test',
+            proj_dict=proj4_str_to_dict('+proj=lcc +datum=WGS84 +ellps=WGS84 +lon_0=-95. '
+                                        '+lat_0=25 +lat_1=25 +units=m +no_defs'),
+            x_size=90,
+            y_size=180,
+            area_extent=(-1000., -1500., 1000., 1500.),
+        )
+        now = datetime(2018, 1, 1, 12, 0, 0)
+        data = np.linspace(0., 1., 16200, dtype=np.float32).reshape((180, 90))
+        # the last row of tiles is empty
+        data[120:] = np.nan
+        ds = DataArray(
+            da.from_array(data, chunks=(60, 45)),
+            attrs=dict(
+                name='test_ds',
+                platform_name='PLAT',
+                sensor='SENSOR',
+                units='1',
+                area=area_def,
+                start_time=now,
+                end_time=now + timedelta(minutes=20))
+        )
+        with mock.patch.object(NetCDFWrapper, 'write', side_effect=NetCDFWrapper.write,
+                               autospec=True) as write:
+            w.save_datasets([ds], sector_id='TEST', source_name="TESTS", tile_count=(3, 3),
+                            num_workers=2)
+        self.assertEqual(write.call_count, 6)
+        all_files = sorted(glob(os.path.join(self.base_dir, 'TESTS_AII*.nc')))
+        self.assertEqual(len(all_files), 6)
+        factors = set()
+        for fn in all_files:
+            with Dataset(fn) as nc:
+                factors.add((nc['data'].scale_factor, nc['data'].add_offset))
+        self.assertEqual(len(factors), 1)
+        max_value = np.nanmax(data)
+        self.assertAlmostEqual(factors.pop()[0], max_value / (2**15 - 2), places=8)
+
+        # the same files are written with delayed computations
+        for fn in all_files:
+            os.remove(fn)
+        delayeds = w.save_datasets([ds], sector_id='TEST', source_name="TESTS", tile_count=(3, 3),
+                                   compute=False)
+        self.assertEqual(len(delayeds), 9)
+        written = [fn for fn in dask.compute(*delayeds) if fn is not None]
+        self.assertListEqual(sorted(written), all_files)
+
+    def test_source_computed_once(self):
+        """Test that the source data is only computed once when persisted"""
+        import threading
+        from satpy.writers.scmi import SCMIWriter
+        from xarray import DataArray
+        from pyresample.geometry import AreaDefinition
+        from pyresample.utils import proj4_str_to_dict
+        area_def = AreaDefinition(
+            'test',
+            'test',
+            'test',
+            proj_dict=proj4_str_to_dict('+proj=lcc +datum=WGS84 +ellps=WGS84 +lon_0=-95. '
+                                        '+lat_0=25 +lat_1=25 +units=m +no_defs'),
+            x_size=90,
+            y_size=120,
+            area_extent=(-1000., -1500., 1000., 1500.),
+        )
+        now = datetime(2018, 1, 1, 12, 0, 0)
+        computed = []
+        lock = threading.Lock()
+
+        def _load(block):
+            with lock:
+                computed.append(block.shape)
+            return block.astype(np.float32) / 10800.
+
+        source = da.arange(10800, chunks=10800).reshape((120, 90)).rechunk((60, 30))
+        ds = DataArray(
+            source.map_blocks(_load, dtype=np.float32),
+            attrs=dict(
+                name='test_ds',
+                platform_name='PLAT',
+                sensor='SENSOR',
+                units='1',
+                area=area_def,
+                start_time=now,
+                end_time=now + timedelta(minutes=20))
+        )
+        w = SCMIWriter(base_dir=self.base_dir, compress=True)
+        w.save_datasets([ds], sector_id='TEST', source_name="TESTS", tile_count=(3, 3),
+                        persist=True)
+        self.assertEqual(len(computed), 6)
+        self.assertEqual(len(glob(os.path.join(self.base_dir, 'TESTS_AII*.nc'))), 9)
+
+        del computed[:]
+        w.save_datasets([ds], sector_id='TEST', source_name="TESTS", tile_count=(3, 3))
+        num_computed = len(computed)
+        self.assertGreater(num_computed, 6)
+
+        # nothing is persisted when the scaling range is configured
+        del computed[:]
+        ds.attrs.update(valid_min=0., valid_max=1.)
+        w.save_datasets([ds], sector_id='TEST', source_name="TESTS", tile_count=(3, 3),
+                        persist=True)
+        self.assertEqual(len(computed), num_computed)
+
 
 def suite():
     """The test suite for this writer's tests."""
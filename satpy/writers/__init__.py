@@ -29,12 +29,13 @@ import logging
 import os
 
 import numpy as np
+import six
 import yaml
 import dask.array as da
 import xarray as xr
 import warnings
 
-from satpy.config import (config_search_paths, glob_config,
+from satpy.config import (CONFIG_CACHE, config_search_paths, glob_config,
                           get_environ_config_dir, recursive_dict_update)
 from satpy import CHUNK_SIZE
 from satpy.plugin_base import Plugin
@@ -769,6 +770,8 @@ class DecisionTree(object):
     def __init__(self, decision_dicts, attrs, **kwargs):
         self.attrs = attrs
         self.tree = {}
+        # find_match results keyed by the values of `attrs`
+        self._matches = {}
         if not isinstance(decision_dicts, (list, tuple)):
             decision_dicts = [decision_dicts]
         self.add_config_to_tree(*decision_dicts)
@@ -780,6 +783,7 @@ class DecisionTree(object):
         self._build_tree(conf)
 
     def _build_tree(self, conf):
+        self._matches.clear()
         for section_name, attrs in conf.items():
             # Set a path in the tree for each section in the configuration
             # files
@@ -821,6 +825,21 @@ class DecisionTree(object):
         return match
 
     def find_match(self, **kwargs):
+        """Find the section of the tree best matching the `kwargs` attributes.
+
+        Matches are remembered for each combination of attribute values so
+        that looking up many datasets with the same metadata (ex. several
+        products of the same sensor) only searches the tree once.
+        """
+        match_key = tuple(kwargs.get(attr) for attr in self.attrs)
+        try:
+            return self._matches[match_key]
+        except KeyError:
+            pass
+        except TypeError:
+            # unhashable attribute values (ex. a list of sensors)
+            match_key = None
+
         try:
             match = self._find_match(self.tree, self.attrs, kwargs)
         except (KeyError, IndexError, ValueError):
@@ -831,6 +850,8 @@ class DecisionTree(object):
             # only possible if no default section was provided
             raise KeyError("No decision section found for %s" %
                            (kwargs.get("uid", None), ))
+        if match_key is not None:
+            self._matches[match_key] = match
         return match
 
 
@@ -846,23 +867,31 @@ class EnhancementDecisionTree(DecisionTree):
         super(EnhancementDecisionTree, self).__init__(
             decision_dicts, attrs, **kwargs)
 
+    def _read_config_section(self, config_file):
+        with open(config_file) as fd:
+            enhancement_config = yaml.load(fd)
+        if enhancement_config is None:
+            # empty file
+            return {}
+        enhancement_section = enhancement_config.get(self.prefix, {})
+        if not enhancement_section:
+            LOG.debug("Config '{}' has no '{}' section or it is empty".format(config_file, self.prefix))
+        return enhancement_section
+
     def add_config_to_tree(self, *decision_dict):
         conf = {}
         for config_file in decision_dict:
-            if os.path.isfile(config_file):
-                with open(config_file) as fd:
-                    enhancement_config = yaml.load(fd)
-                    if enhancement_config is None:
-                        # empty file
-                        continue
-                    enhancement_section = enhancement_config.get(
-                        self.prefix, {})
-                    if not enhancement_section:
-                        LOG.debug("Config '{}' has no '{}' section or it is empty".format(config_file, self.prefix))
-                        continue
-                    conf = recursive_dict_update(conf, enhancement_section)
-            elif isinstance(config_file, dict):
+            if isinstance(config_file, dict):
                 conf = recursive_dict_update(conf, config_file)
+            elif os.path.isfile(config_file):
+                # parsed sections are shared by all trees, they are only
+                # read when merged in `conf`
+                enhancement_section = CONFIG_CACHE.get(
+                    (self.__class__, self.prefix), [config_file],
+                    lambda: self._read_config_section(config_file),
+                    copy_result=False)
+                if enhancement_section:
+                    conf = recursive_dict_update(conf, enhancement_section)
             else:
                 LOG.debug("Loading enhancement config string")
                 d = yaml.load(config_file)
@@ -908,10 +937,41 @@ class Enhancer(object):
             if not isinstance(self.enhancement_config_file, (list, tuple)):
                 self.enhancement_config_file = [self.enhancement_config_file]
 
-            self.enhancement_tree = EnhancementDecisionTree(*self.enhancement_config_file)
+            self._config_groups = [list(self.enhancement_config_file)]
+            self.enhancement_tree = self._get_enhancement_tree()
 
         self.sensor_enhancement_configs = []
 
+    def _get_enhancement_tree(self):
+        """Get the decision tree built from the configs added so far.
+
+        Trees built only from configuration files are cached for the whole
+        process (see `satpy.config.CONFIG_CACHE`) and shared by all
+        enhancers using the same files, until one of them is modified.
+        Configs are added to the tree in the same groups as they were added
+        to this enhancer since sections are only merged within a group.
+        """
+        def _build():
+            tree = EnhancementDecisionTree(*self._config_groups[0])
+            for config_group in self._config_groups[1:]:
+                tree.add_config_to_tree(*config_group)
+            return tree
+
+        config_files = [config_file for config_group in self._config_groups
+                        for config_file in config_group]
+        if not all(isinstance(config_file, six.string_types) and
+                   os.path.isfile(config_file)
+                   for config_file in config_files):
+            if len(self._config_groups) > 1:
+                # this tree is not shared, just extend it
+                self.enhancement_tree.add_config_to_tree(
+                    *self._config_groups[-1])
+                return self.enhancement_tree
+            return _build()
+        name = (EnhancementDecisionTree,
+                tuple(len(config_group) for config_group in self._config_groups))
+        return CONFIG_CACHE.get(name, config_files, _build, copy_result=False)
+
     def get_sensor_enhancement_config(self, sensor):
         if isinstance(sensor, str):
             # one single sensor
@@ -934,7 +994,8 @@ class Enhancer(object):
                 new_configs.append(config_file)
 
         if new_configs:
-            self.enhancement_tree.add_config_to_tree(*new_configs)
+            self._config_groups.append(new_configs)
+            self.enhancement_tree = self._get_enhancement_tree()
 
     def apply(self, img, **info):
         enh_kwargs = self.enhancement_tree.find_match(**info)
@@ -25,6 +25,7 @@
 import logging
 from datetime import datetime
 
+import dask
 import xarray as xr
 import numpy as np
 
@@ -143,6 +144,105 @@ def area2cf(dataarray, strict=False):
     return res
 
 
+def _get_valid_range(dataarray):
+    """Get the valid range of `dataarray` from its attributes."""
+    return dataarray.attrs.get(
+        'valid_range', (dataarray.attrs.get('valid_min'),
+                        dataarray.attrs.get('valid_max')))
+
+
+def get_data_ranges(dataarrays):
+    """Compute the range of the float `dataarrays` without a valid range.
+
+    The ranges are computed together, in one pass over the data, and
+    returned by dataarray name. This pass happens when the datasets are
+    prepared, also when their writing is delayed, since the packing
+    parameters have to be known before the file is created.
+
+    """
+    to_compute = [dataarray for dataarray in dataarrays
+                  if np.issubdtype(dataarray.dtype, np.floating) and
+                  None in _get_valid_range(dataarray)]
+    if not to_compute:
+        return {}
+    names = [dataarray.attrs['name'] for dataarray in to_compute]
+    logger.debug("Computing the range of %s for packing", ', '.join(names))
+    ranges = dask.compute(*[(dataarray.min(), dataarray.max())
+                            for dataarray in to_compute])
+    return dict(zip(names, ranges))
+
+
+def get_packing_encoding(dataarray, dtype, data_range=None):
+    """Get the encoding packing the float `dataarray` to integers of `dtype`.
+
+    The range of the data is taken from the `valid_range` or
+    `valid_min`/`valid_max` attributes when available, from `data_range`
+    otherwise and is computed from the data if it isn't given (see
+    :func:`get_data_ranges`). The smallest value of `dtype` is used as fill
+    value. Values outside of the valid range wrap around when packed, they
+    have to be masked first (see :func:`mask_outside_valid_range`).
+
+    """
+    dtype = np.dtype(dtype)
+    info = np.iinfo(dtype)
+    valid_min, valid_max = _get_valid_range(dataarray)
+    if valid_min is None or valid_max is None:
+        if data_range is None:
+            logger.debug("Computing the range of %s for packing",
+                         dataarray.name)
+            data_range = dask.compute(dataarray.min(), dataarray.max())
+        valid_min, valid_max = data_range
+    # the smallest integer is kept for the fill value
+    min_packed = info.min + 1
+    scale_factor = (float(valid_max) - float(valid_min)) / (info.max - min_packed)
+    if scale_factor == 0 or np.isnan(scale_factor):
+        scale_factor = 1.
+    return {'dtype': dtype,
+            'scale_factor': scale_factor,
+            'add_offset': float(valid_min) - min_packed * scale_factor,
+            '_FillValue': info.min}
+
+
+def pack_valid_range(attrs, encoding):
+    """Convert the valid range in `attrs` to the packed values of `encoding`.
+
+    CF (and netCDF4-python) compare `valid_range`, `valid_min` and
+    `valid_max` to the packed values of a variable, not to the unpacked
+    ones.
+
+    """
+    dtype = encoding['dtype']
+    info = np.iinfo(dtype)
+    for key in ('valid_range', 'valid_min', 'valid_max'):
+        if attrs.get(key) is None:
+            continue
+        packed = np.round((np.asarray(attrs[key], dtype=np.float64) -
+                           encoding['add_offset']) / encoding['scale_factor'])
+        attrs[key] = np.clip(packed, info.min + 1, info.max).astype(dtype)
+
+
+def mask_outside_valid_range(dataarray):
+    """Replace the values of `dataarray` outside of its valid range by NaN.
+
+    The valid range is taken from the `valid_range` or
+    `valid_min`/`valid_max` attributes, the data is returned as is when they
+    aren't available.
+
+    """
+    valid_min, valid_max = _get_valid_range(dataarray)
+    if valid_min is None and valid_max is None:
+        return dataarray
+    valid = True
+    if valid_min is not None:
+        valid = dataarray >= valid_min
+    if valid_max is not None:
+        valid = valid & (dataarray <= valid_max)
+    encoding = dataarray.encoding
+    dataarray = dataarray.where(valid)
+    dataarray.encoding = encoding
+    return dataarray
+
+
 def make_time_bounds(dataarray, start_times, end_times):
     import numpy as np
     start_time = min(start_time for start_time in start_times
@@ -157,11 +257,33 @@ def make_time_bounds(dataarray, start_times, end_times):
 
 
 class CFWriter(Writer):
-    """Writer producing NetCDF/CF compatible datasets."""
+    """Writer producing NetCDF/CF compatible datasets.
+
+    Besides the `encoding` passed on to :meth:`xarray.Dataset.to_netcdf`,
+    the NetCDF variables can be compressed (`compression`, for example
+    ``{'zlib': True, 'complevel': 4}``), chunked on disk (`chunks`, a
+    dictionary of chunk size per dimension name) and float variables packed
+    to scaled integers (`pack_dtype`, for example ``np.int16``). Settings
+    given in `encoding` for a variable take precedence.
+
+    With `groups` set to `True` the datasets of each area are written to
+    their own NetCDF group named after the area. With `compute` set to
+    `False` a delayed object writing the data chunk by chunk is returned for
+    every group of the file; the `netcdf4` engine is then used by default
+    since `h5netcdf` doesn't support delayed writing.
+
+    """
 
     @staticmethod
-    def da2cf(dataarray, epoch=EPOCH):
-        """Convert the dataarray to something cf-compatible."""
+    def da2cf(dataarray, epoch=EPOCH, pack_dtype=None, data_range=None):
+        """Convert the dataarray to something cf-compatible.
+
+        Float data is packed to integers of `pack_dtype` when it is given
+        (see :func:`get_packing_encoding`, `data_range` is the range of the
+        data when it has no valid range), the values outside of the valid
+        range of the data are then written as fill values and the valid
+        range is converted to packed values.
+        """
         new_data = dataarray.copy()
 
         # Remove the area
@@ -194,6 +316,12 @@ class CFWriter(Writer):
         new_data.attrs.setdefault('long_name', new_data.attrs.pop('name'))
         if 'prerequisites' in new_data.attrs:
             new_data.attrs['prerequisites'] = [np.string_(str(prereq)) for prereq in new_data.attrs['prerequisites']]
+        if pack_dtype is not None and np.issubdtype(new_data.dtype, np.floating):
+            encoding = get_packing_encoding(new_data, pack_dtype,
+                                            data_range=data_range)
+            new_data = mask_outside_valid_range(new_data)
+            new_data.encoding.update(encoding)
+            pack_valid_range(new_data.attrs, encoding)
         return new_data
 
     def save_dataset(self, dataset, filename=None, fill_value=None, **kwargs):
@@ -205,7 +333,7 @@ class CFWriter(Writer):
         for ds in datasets:
             ds_collection.update(get_extra_ds(ds))
 
-        datas = {}
+        cf_datasets = []
         for ds in ds_collection.values():
             try:
                 new_datasets = area2cf(ds)
@@ -216,17 +344,44 @@ class CFWriter(Writer):
             for new_ds in new_datasets:
                 start_times.append(new_ds.attrs.pop("start_time", None))
                 end_times.append(new_ds.attrs.pop("end_time", None))
-                datas[new_ds.attrs['name']] = self.da2cf(new_ds,
-                                                         kwargs.get('epoch',
-                                                                    EPOCH))
+                cf_datasets.append(new_ds)
+
+        pack_dtype = kwargs.get('pack_dtype')
+        data_ranges = {}
+        if pack_dtype is not None:
+            data_ranges = get_data_ranges(cf_datasets)
+        datas = {}
+        for new_ds in cf_datasets:
+            name = new_ds.attrs['name']
+            datas[name] = self.da2cf(new_ds, kwargs.get('epoch', EPOCH),
+                                     pack_dtype,
+                                     data_range=data_ranges.get(name))
         return datas, start_times, end_times
 
-    def save_datasets(self, datasets, filename=None, **kwargs):
-        """Save all datasets to one or more files."""
-        logger.info('Saving datasets to NetCDF4/CF.')
-        # XXX: Should we combine the info of all datasets?
-        filename = filename or self.get_filename(**datasets[0].attrs)
+    @staticmethod
+    def _group_by_area(datasets):
+        """Group the datasets by the name of their area.
 
+        Swaths are named ``swath_<n>`` and datasets without an area are put
+        in the root group.
+
+        """
+        groups = {}
+        swath_names = {}
+        for ds in datasets:
+            area = ds.attrs.get('area')
+            if area is None:
+                group = None
+            elif getattr(area, 'area_id', None):
+                group = area.area_id
+            else:
+                group = swath_names.setdefault(
+                    id(area), 'swath_{}'.format(len(swath_names)))
+            groups.setdefault(group, []).append(ds)
+        return groups
+
+    def _create_dataset(self, datasets, header_attrs=None, **kwargs):
+        """Create the CF compatible `xarray.Dataset` of `datasets`."""
         datas, start_times, end_times = self._collect_datasets(datasets, kwargs)
 
         dataset = xr.Dataset(datas)
@@ -238,16 +393,97 @@ class CFWriter(Writer):
         except KeyError:
             logger.warning('No time dimension in datasets, skipping time bounds creation.')
 
-        header_attrs = kwargs.pop('header_attrs', None)
-
         if header_attrs is not None:
             dataset.attrs.update({k: v for k, v in header_attrs.items() if v})
 
         dataset.attrs['history'] = ("Created by pytroll/satpy on " +
                                     str(datetime.utcnow()))
         dataset.attrs['conventions'] = 'CF-1.7'
-        engine = kwargs.pop("engine", 'h5netcdf')
-        kwargs.pop('config_files')
-        kwargs.pop('compute')
+        return dataset
+
+    @staticmethod
+    def _get_encoding(dataset, encoding=None, compression=None, chunks=None):
+        """Get the encoding of every variable of `dataset`.
+
+        The compression, chunk sizes and packing of the variables are
+        completed with the user provided `encoding`.
+
+        """
+        res = {}
+        for name, var in dataset.data_vars.items():
+            var_encoding = {}
+            if var.ndim:
+                var_encoding.update(compression or {})
+                if chunks:
+                    var_encoding['chunksizes'] = tuple(
+                        min(chunks.get(dim, size), size)
+                        for dim, size in zip(var.dims, var.shape))
+            var_encoding.update(var.encoding)
+            var_encoding.update((encoding or {}).get(name, {}))
+            if var_encoding:
+                res[name] = var_encoding
+        return res
+
+    def save_datasets(self, datasets, filename=None, groups=False,
+                      encoding=None, compression=None, chunks=None,
+                      pack_dtype=None, compute=True, **kwargs):
+        """Save all datasets to one or more files.
+
+        Args:
+            datasets (list): `xarray.DataArray` objects to save.
+            filename (str): Name of the file to create.
+            groups (bool): Save the datasets of every area to a NetCDF group
+                named after the area.
+            encoding (dict): Encoding of the variables, by variable name.
+            compression (dict): Encoding compressing every variable
+                (ex. ``{'zlib': True, 'complevel': 4}``).
+            chunks (dict): Size of the chunks of the NetCDF variables by
+                dimension name.
+            pack_dtype (numpy.dtype): Integer type to pack float data to.
+                The range of the float datasets without a valid range is
+                computed in an extra pass over their data, done when this
+                method is called even if `compute` is `False`.
+            compute (bool): Write the file now or return the delayed
+                objects writing it.
+
+        Returns:
+            The list of delayed objects writing each group of the file if
+            `compute` is `False`.
+
+        """
+        logger.info('Saving datasets to NetCDF4/CF.')
+        # XXX: Should we combine the info of all datasets?
+        filename = filename or self.get_filename(**datasets[0].attrs)
+
+        header_attrs = kwargs.pop('header_attrs', None)
+        epoch = kwargs.pop('epoch', EPOCH)
+        engine = kwargs.pop("engine", None)
+        if engine is None:
+            # h5netcdf doesn't support delayed writing
+            engine = 'h5netcdf' if compute else 'netcdf4'
+        kwargs.pop('config_files', None)
         kwargs.pop('overlay', None)
-        dataset.to_netcdf(filename, engine=engine, **kwargs)
+
+        if groups:
+            root = xr.Dataset(attrs=dict(header_attrs or {}))
+            root.attrs['history'] = ("Created by pytroll/satpy on " +
+                                     str(datetime.utcnow()))
+            root.attrs['conventions'] = 'CF-1.7'
+            root.to_netcdf(filename, engine=engine, mode='w')
+            to_save = sorted(self._group_by_area(datasets).items(),
+                             key=lambda item: str(item[0]))
+            mode = 'a'
+        else:
+            to_save = [(None, datasets)]
+            mode = kwargs.pop('mode', 'w')
+
+        delayeds = []
+        for group, group_datasets in to_save:
+            dataset = self._create_dataset(group_datasets, header_attrs=header_attrs,
+                                           epoch=epoch, pack_dtype=pack_dtype)
+            group_encoding = self._get_encoding(dataset, encoding, compression, chunks)
+            delayeds.append(dataset.to_netcdf(filename, engine=engine, mode=mode,
+                                              group=group, encoding=group_encoding,
+                                              compute=compute, **kwargs))
+        if not compute:
+            return delayeds
@@ -24,8 +24,11 @@
 """
 
 import logging
+import os
+import tempfile
 
 import dask
+import dask.array as da
 import numpy as np
 from osgeo import gdal, osr
 
@@ -49,6 +52,203 @@ NP2GDAL = {
 }
 
 
+def _downsample(data, factor, resampling='nearest'):
+    """Downsample the 2D `data` block by `factor` in both dimensions.
+
+    The result has ``ceil(size / factor)`` pixels along each dimension like
+    the overviews created by GDAL.
+
+    """
+    if resampling == 'nearest':
+        return data[::factor, ::factor]
+    if resampling != 'average':
+        raise ValueError("Unknown overview resampling '{}'".format(resampling))
+    rows = -(-data.shape[0] // factor)
+    cols = -(-data.shape[1] // factor)
+    padded = np.full((rows * factor, cols * factor), np.nan)
+    padded[:data.shape[0], :data.shape[1]] = data
+    res = np.nanmean(padded.reshape(rows, factor, cols, factor), axis=(1, 3))
+    if np.issubdtype(data.dtype, np.integer):
+        res = res.round()
+    return res.astype(data.dtype)
+
+
+class COGTarget(object):
+    """Tiled GeoTIFF file with internal overviews written block by block.
+
+    Every block stored in it (see `dask.array.store`) is written to the
+    full resolution image and, downsampled, to every overview level of a
+    temporary tiled GeoTIFF created next to the destination file. Blocks
+    must start at a multiple of every overview factor and should cover
+    whole internal tiles. The downsampled blocks usually cover only a part
+    of an overview tile, so they are buffered until the tile is complete
+    and every tile is written to GDAL once, with all its bands. No tile is
+    ever flushed half written and read back, whatever the GDAL block cache
+    size. The buffers hold the overview tiles waiting for the rest of their
+    blocks, one row of tiles per overview level when the blocks are stored
+    row by row.
+
+    Closing the target copies the temporary file to the destination with
+    the ``COPY_SRC_OVERVIEWS`` creation option, which puts the smallest
+    overview first and the full resolution image last as a Cloud Optimized
+    GeoTIFF expects, and removes the temporary file. The data is computed
+    once, but the file is written twice: the copy reads the whole
+    temporary file back. This layout can't be written directly as the
+    blocks are computed since the overviews have to come first. The
+    temporary file is not compressed, the tiles are only compressed by the
+    copy, so it takes as much disk space as the uncompressed image plus a
+    third for its overviews until the target is closed.
+
+    A target that isn't closed, because computing the data failed or
+    because it is never closed, can be discarded: its temporary file is
+    removed without writing the destination file. This also happens when
+    the target is garbage collected.
+
+    Writing to the same object from multiple threads must be serialized
+    with a lock.
+
+    """
+
+    # creation options describing the layout of the temporary file
+    TMP_OPTIONS = ("TILED", "BLOCKXSIZE", "BLOCKYSIZE", "INTERLEAVE",
+                   "NBITS", "PIXELTYPE", "ALPHA")
+
+    def __init__(self, create_opts, overviews, resampling='nearest',
+                 fill_value=None):
+        filename, width, height, num_bands, gformat, g_opts = create_opts
+        self.filename = filename
+        self.options = [opt for opt in g_opts
+                        if not opt.upper().startswith('COPY_SRC_OVERVIEWS')]
+        fd, self.tmp_filename = tempfile.mkstemp(
+            suffix='.tif', prefix=os.path.basename(filename) + '.',
+            dir=os.path.dirname(filename) or None)
+        os.close(fd)
+        raster = gdal.GetDriverByName("GTiff")
+        # the temporary file is not compressed: the tiles are only
+        # compressed once, when copied to the destination file
+        tmp_options = [opt for opt in self.options
+                       if opt.split('=')[0].upper() in self.TMP_OPTIONS]
+        tmp_options.append("BIGTIFF=IF_SAFER")
+        self.dst_ds = raster.Create(self.tmp_filename, width, height,
+                                    num_bands, gformat, tmp_options)
+        if self.dst_ds is None:
+            os.remove(self.tmp_filename)
+            raise IOError("Could not create {}: {}".format(
+                self.tmp_filename, gdal.GetLastErrorMsg()))
+        self.gformat = gformat
+        self.overviews = overviews
+        self.resampling = resampling
+        # incomplete overview tiles: (level, tile row, tile column) ->
+        # [(bands, rows, columns) buffer, number of pixels still missing]
+        self._tiles = {}
+        if overviews:
+            # only create the (empty) overview levels, their tiles are
+            # written with the image data
+            self.dst_ds.BuildOverviews("NONE", list(overviews))
+        if fill_value is not None:
+            for i in range(self.dst_ds.RasterCount):
+                self.dst_ds.GetRasterBand(i + 1).SetNoDataValue(fill_value)
+
+    def __setitem__(self, key, value):
+        """Write the (bands, y, x) block `value` at the `key` slices."""
+        yoff = key[1].start or 0
+        xoff = key[2].start or 0
+        value = np.ascontiguousarray(value)
+        # write all the bands at once so that each tile is written once
+        self.dst_ds.WriteRaster(xoff, yoff, value.shape[2], value.shape[1],
+                                value.tobytes(), buf_type=self.gformat)
+        for level, factor in enumerate(self.overviews):
+            data = np.stack([_downsample(band, factor, self.resampling)
+                             for band in value])
+            self._write_overview(level, data, xoff // factor, yoff // factor)
+
+    def _write_overview(self, level, data, xoff, yoff):
+        """Buffer the `data` of an overview level and write complete tiles."""
+        ovr = self.dst_ds.GetRasterBand(1).GetOverview(level)
+        blockxsize, blockysize = ovr.GetBlockSize()
+        rows, cols = data.shape[1:]
+        for tile_row in range(yoff // blockysize,
+                              (yoff + rows - 1) // blockysize + 1):
+            tile_y = tile_row * blockysize
+            tile_rows = min(blockysize, ovr.YSize - tile_y)
+            y_start = max(yoff, tile_y)
+            y_end = min(yoff + rows, tile_y + tile_rows)
+            for tile_col in range(xoff // blockxsize,
+                                  (xoff + cols - 1) // blockxsize + 1):
+                tile_x = tile_col * blockxsize
+                tile_cols = min(blockxsize, ovr.XSize - tile_x)
+                x_start = max(xoff, tile_x)
+                x_end = min(xoff + cols, tile_x + tile_cols)
+                key = (level, tile_row, tile_col)
+                if key not in self._tiles:
+                    self._tiles[key] = [
+                        np.zeros((data.shape[0], tile_rows, tile_cols),
+                                 dtype=data.dtype),
+                        tile_rows * tile_cols]
+                tile = self._tiles[key]
+                tile[0][:, y_start - tile_y:y_end - tile_y,
+                        x_start - tile_x:x_end - tile_x] = \
+                    data[:, y_start - yoff:y_end - yoff,
+                         x_start - xoff:x_end - xoff]
+                tile[1] -= (y_end - y_start) * (x_end - x_start)
+                if tile[1] <= 0:
+                    self._write_tile(*key)
+
+    def _write_tile(self, level, tile_row, tile_col):
+        """Write all the bands of a buffered overview tile."""
+        data = self._tiles.pop((level, tile_row, tile_col))[0]
+        for i, band_data in enumerate(data):
+            ovr = self.dst_ds.GetRasterBand(i + 1).GetOverview(level)
+            blockxsize, blockysize = ovr.GetBlockSize()
+            ovr.WriteArray(band_data, tile_col * blockxsize,
+                           tile_row * blockysize)
+
+    def close(self):
+        """Write the Cloud Optimized GeoTIFF file and remove the temporary one."""
+        if self.dst_ds is None:
+            return
+        try:
+            # overview tiles left incomplete by blocks that were never stored
+            for key in list(self._tiles):
+                self._write_tile(*key)
+            self.dst_ds.FlushCache()
+            raster = gdal.GetDriverByName("GTiff")
+            # everything goes in the TIFF tags, but GDAL would also write a
+            # NaN no data value to an .aux.xml file (NaN != NaN)
+            pam_enabled = gdal.GetConfigOption("GDAL_PAM_ENABLED")
+            gdal.SetConfigOption("GDAL_PAM_ENABLED", "NO")
+            try:
+                cog_ds = raster.CreateCopy(self.filename, self.dst_ds,
+                                           options=self.options +
+                                           ["COPY_SRC_OVERVIEWS=YES"])
+            finally:
+                gdal.SetConfigOption("GDAL_PAM_ENABLED", pam_enabled)
+            if cog_ds is None:
+                raise IOError("Could not write {}: {}".format(
+                    self.filename, gdal.GetLastErrorMsg()))
+            # flush and close the destination file
+            cog_ds = None
+        finally:
+            self.discard()
+
+    def discard(self):
+        """Close and remove the temporary file without writing the destination."""
+        if self.dst_ds is None:
+            return
+        self.dst_ds = None
+        self._tiles = {}
+        if os.path.exists(self.tmp_filename):
+            os.remove(self.tmp_filename)
+
+    def __del__(self):
+        """Remove the temporary file of a target that was never closed."""
+        try:
+            self.discard()
+        except (AttributeError, OSError):
+            # partially initialized target or interpreter shutdown
+            pass
+
+
 class GeoTIFFWriter(ImageWriter):
     """Writer to save GeoTIFF images.
 
@@ -60,6 +260,11 @@ class GeoTIFFWriter(ImageWriter):
 
         scn.save_datasets(writer='geotiff', dtype=np.float32, enhance=False)
 
+    Cloud Optimized GeoTIFF output, with the internal tiles and overviews
+    computed in the same pass over the data:
+
+        scn.save_datasets(writer='geotiff', cog=True)
+
     """
 
     GDAL_OPTIONS = ("tfw",
@@ -120,6 +325,89 @@ class GeoTIFFWriter(ImageWriter):
             bnd.SetNoDataValue(0)
             bnd.WriteArray(chn.values)
 
+    @staticmethod
+    def _get_overview_factors(width, height, blocksize):
+        """Get the overview factors until the image fits in one tile."""
+        factors = []
+        factor = 2
+        while max(width, height) / float(factor // 2) > blocksize:
+            factors.append(factor)
+            factor *= 2
+        return factors
+
+    @staticmethod
+    def _get_cog_chunk_size(dim_chunks, block_size, factors):
+        """Round the chunk size of a dimension to whole tiles and overviews."""
+        step = block_size
+        while any(step % factor for factor in factors):
+            step += block_size
+        return max(1, int(round(max(dim_chunks) / float(step)))) * step
+
+    def _save_cog(self, img, filename, dtype, fill_value, gdal_options,
+                  overviews=None, overview_resampling='nearest',
+                  compute=True):
+        """Save the image as a tiled GeoTIFF with internal overviews.
+
+        The data is rechunked so that every chunk covers whole tiles and
+        starts at a multiple of every overview factor. Each chunk is
+        written, with its overviews, to a temporary file as soon as it is
+        computed and the file is copied to `filename` in the Cloud Optimized
+        GeoTIFF layout when the target is closed (see `COGTarget`).
+
+        """
+        dtype = np.dtype(dtype)
+        gformat = NP2GDAL[dtype.type]
+        gdal_options['tiled'] = 'YES'
+        blockxsize = int(gdal_options.setdefault('blockxsize', 512))
+        blockysize = int(gdal_options.setdefault('blockysize', 512))
+        gdal_options.setdefault('nbits', dtype.itemsize * 8)
+        gdal_options.setdefault('bigtiff', 'IF_SAFER')
+        if overviews is None:
+            overviews = self._get_overview_factors(
+                img.width, img.height, max(blockxsize, blockysize))
+
+        datasets, mode = img.finalize(fill_value=fill_value, dtype=dtype)
+        g_opts = ["{0}={1}".format(k.upper(), str(v))
+                  for k, v in gdal_options.items()]
+        if mode[-1] == 'A':
+            g_opts.append("ALPHA=YES")
+        # tile aligned chunks starting at multiples of the overview factors
+        chunks = datasets.data.chunks
+        data = datasets.data.rechunk(
+            (len(mode),
+             self._get_cog_chunk_size(chunks[1], blockysize, overviews),
+             self._get_cog_chunk_size(chunks[2], blockxsize, overviews)))
+
+        LOG.debug("Saving to COG GeoTiff: %s", filename)
+        ensure_dir(filename)
+        create_opts = (filename, img.width, img.height, len(mode), gformat,
+                       g_opts)
+        target = COGTarget(create_opts, overviews,
+                           resampling=overview_resampling,
+                           fill_value=fill_value)
+        area = img.data.attrs.get('area')
+        if area is None:
+            LOG.warning("No 'area' metadata found in image")
+        else:
+            self._gdal_write_geo(target.dst_ds, area)
+        tags = self.tags.copy()
+        start_time = img.data.attrs.get('start_time')
+        if start_time is not None:
+            tags.update({'TIFFTAG_DATETIME': start_time.strftime(
+                "%Y:%m:%d %H:%M:%S")})
+        target.dst_ds.SetMetadata(tags, '')
+
+        if compute:
+            try:
+                # GDAL datasets can't be written from multiple threads
+                da.store(data, target, lock=True)
+            except Exception:
+                target.discard()
+                raise
+            target.close()
+            return None
+        return data, target
+
     def _gdal_write_geo(self, dst_ds, area):
         try:
             geotransform = [area.area_extent[0], area.pixel_size_x, 0,
@@ -176,11 +464,23 @@ class GeoTIFFWriter(ImageWriter):
         return delayed
 
     def save_image(self, img, filename=None, dtype=None, fill_value=None,
-                   floating_point=None, compute=True, **kwargs):
+                   floating_point=None, compute=True, cog=False,
+                   overviews=None, overview_resampling='nearest', **kwargs):
         """Save the image to the given *filename* in geotiff_ format.
         `floating_point` allows the saving of
         'L' mode images in floating point format if set to True.
 
+        With `cog` set to `True` the image is written as a tiled GeoTIFF
+        (512x512 tiles unless `blockxsize`/`blockysize` are given) with
+        internal overviews, as a Cloud Optimized GeoTIFF. The tiles of
+        the image and of the overviews are computed in the same pass over
+        the data and written to an uncompressed temporary file next to
+        `filename`, which is copied to `filename` in the COG layout at the
+        end: the file is written twice (see `COGTarget`). `overviews`
+        is the list of overview factors (default: powers of 2 until the
+        image fits in one tile) and `overview_resampling` is either
+        'nearest' (default) or 'average'.
+
         .. _geotiff: http://trac.osgeo.org/geotiff/
         """
         filename = filename or self.get_filename(**img.data.attrs)
@@ -214,6 +514,12 @@ class GeoTIFFWriter(ImageWriter):
                           "setting fill value to 'NaN'")
                 fill_value = np.nan
 
+        if cog:
+            return self._save_cog(img, filename, dtype, fill_value,
+                                  gdal_options, overviews=overviews,
+                                  overview_resampling=overview_resampling,
+                                  compute=compute)
+
         try:
             import rasterio  # noqa
             # we can use the faster rasterio-based save
@@ -62,16 +62,30 @@ bandwidth, and space.
 Any tiles (numbered or lettered) not containing any valid data are not
 created.
 
+Scaling and parallel writing
+----------------------------
+
+Products without a configured `valid_min` and `valid_max` are scaled using
+the minimum and maximum of the whole product so that all tiles of a product
+share the same scaling. These are computed in a single pass over the data
+together with the validity of every tile, before any file is created, and
+empty tiles are not written at all. Tile files are then written in
+parallel by at most `num_workers` threads (default: dask's default number
+of workers). The number of tiles written per second is logged for each
+sector.
+
 """
 import os
 import logging
 import string
 import sys
+import time
 from datetime import datetime, timedelta
 from netCDF4 import Dataset
 
 import numpy as np
 from pyproj import Proj
+import dask
 import dask.array as da
 from satpy.writers import Writer, DecisionTree, Enhancer, get_enhanced_image
 from pyresample.geometry import AreaDefinition
@@ -712,12 +726,32 @@ class NetCDFWrapper(object):
         self.xy_factors = xy_factors
         self.compress = compress
         self.fix_awips = fix_awips
+        # scaling of the whole product used when written with `da.store`
+        self.valid_min = None
+        self.valid_max = None
 
     def __setitem__(self, key, data):
         """Write an entire tile to a file."""
+        self.write(data, self.valid_min, self.valid_max)
+
+    def write(self, data, valid_min=None, valid_max=None):
+        """Write an entire tile to a file.
+
+        Args:
+            data (numpy.ndarray): Tile data to write.
+            valid_min (float): Minimum of the data used for scaling. Defaults
+                to the product's `valid_min` or to the minimum of this tile.
+            valid_max (float): Maximum of the data used for scaling. Defaults
+                to the product's `valid_max` or to the maximum of this tile.
+
+        Returns:
+            The name of the file written or `None` if the tile has no valid
+            data.
+
+        """
         if np.isnan(data).all():
             LOG.info("Tile {} contains all invalid data, skipping...".format(self.filename))
-            return
+            return None
 
         ds_info = self.ds_info
         awips_info = self.awips_info
@@ -725,10 +759,12 @@ class NetCDFWrapper(object):
         area_def = ds_info['area']
         LOG.debug("Scaling %s data to fit in netcdf file...", ds_info["name"])
         bit_depth = ds_info.get("bit_depth", 16)
-        valid_min = ds_info.get('valid_min')
+        if valid_min is None:
+            valid_min = ds_info.get('valid_min')
         if valid_min is None:
             valid_min = np.nanmin(data)
-        valid_max = ds_info.get('valid_max')
+        if valid_max is None:
+            valid_max = ds_info.get('valid_max')
         if valid_max is None:
             valid_max = np.nanmax(data)
 
@@ -768,6 +804,7 @@ class NetCDFWrapper(object):
 
         if self.fix_awips:
             fix_awips_file(self.filename)
+        return self.filename
 
     def _calc_factor_offset(self, data=None, dtype=np.int16, bitdepth=None,
                             min=None, max=None, num_fills=1, flag_meanings=False):
@@ -970,24 +1007,100 @@ class SCMIWriter(Writer):
             else:
                 LOG.warning("AWIPS file already exists, will overwrite: %s", output_filename)
 
+    def _get_valid_range(self, dataset):
+        """Get the lazy minimum and maximum used to scale `dataset`."""
+        # invalid values are replaced instead of using nanmin/nanmax which
+        # warn about every chunk without valid data
+        data = dataset.data
+        valid_min = dataset.attrs.get('valid_min')
+        if valid_min is None:
+            valid_min = da.where(da.isfinite(data), data, np.inf).min()
+        valid_max = dataset.attrs.get('valid_max')
+        if valid_max is None:
+            valid_max = da.where(da.isfinite(data), data, -np.inf).max()
+        return valid_min, valid_max
+
+    @staticmethod
+    def _needs_valid_range(dataset):
+        """Tell if the scaling range of `dataset` must be computed from its data."""
+        return dataset.attrs.get('valid_min') is None or dataset.attrs.get('valid_max') is None
+
+    def _persist_products(self, area_products):
+        """Compute the products needing a scaling pass and keep them in memory."""
+        datasets = [dataset for _, ds_list in area_products for dataset in ds_list
+                    if self._needs_valid_range(dataset)]
+        persisted = dict(zip([id(dataset) for dataset in datasets],
+                             dask.persist(*[dataset.data for dataset in datasets])))
+        res = []
+        for area_def, ds_list in area_products:
+            new_list = []
+            for dataset in ds_list:
+                if id(dataset) in persisted:
+                    data = persisted[id(dataset)]
+                    dataset = dataset.copy(deep=False)
+                    dataset.data = data
+                new_list.append(dataset)
+            res.append((area_def, new_list))
+        return res
+
+    @staticmethod
+    def _get_chunk_validity(data):
+        """Get a lazy array telling if each chunk of `data` has valid data."""
+        return da.map_blocks(_any_finite, data, dtype=np.bool_,
+                             chunks=tuple((1, ) * len(c) for c in data.chunks))
+
+    @staticmethod
+    def _tile_chunk_slices(chunks, data_slices):
+        """Get the slices of the chunks overlapping a tile."""
+        chunk_slices = []
+        for dim_chunks, data_slice in zip(chunks, data_slices):
+            bounds = np.cumsum((0, ) + dim_chunks)
+            start, stop, _ = data_slice.indices(bounds[-1])
+            chunk_slices.append(slice(np.searchsorted(bounds, start, side='right') - 1,
+                                      np.searchsorted(bounds, stop, side='left')))
+        return tuple(chunk_slices)
+
     def save_datasets(self, datasets, sector_id=None,
                       source_name=None, filename=None,
                       tile_count=(1, 1), tile_size=None,
                       lettered_grid=False, num_subtiles=None,
-                      compute=True, **kwargs):
+                      compute=True, num_workers=None, persist=False, **kwargs):
+        """Save `datasets` to SCMI tiles of the `sector_id` sector.
+
+        When `compute` is `True` the scaling of every product and the
+        validity of every chunk of data are computed first, in one pass over
+        the data, so that tiles only covering chunks without valid data are
+        never created. With `compute` set to `False` the scaling is computed
+        along with the tiles when the returned delayed objects are computed.
+
+        Args:
+            num_workers (int): Maximum number of threads used to write the
+                tiles when `compute` is `True`.
+            persist (bool): When `compute` is `True`, keep the data of the
+                products without a configured `valid_min` and `valid_max` in
+                memory after the scaling pass so that it is only computed
+                once (read, resampled, enhanced...). This needs memory for
+                all these products at once. By default the data is computed
+                twice, once for the scaling and once for the tiles.
+
+        """
         if sector_id is None:
             raise TypeError("Keyword 'sector_id' is required")
 
         area_datasets = self._group_by_area(datasets)
-        sources_targets = []
-        for area_id, (area_def, ds_list) in area_datasets.items():
+        area_products = [(area_def, self._enhance_and_split_rgbs(ds_list))
+                         for area_def, ds_list in area_datasets.values()]
+        if compute and persist:
+            LOG.debug("Computing the products of sector %s", sector_id)
+            area_products = self._persist_products(area_products)
+        products = []
+        for area_def, ds_list in area_products:
             tile_gen = self._get_tile_generator(area_def, lettered_grid, sector_id, num_subtiles, tile_size, tile_count)
-            for dataset in self._enhance_and_split_rgbs(ds_list):
+            for dataset in ds_list:
                 LOG.info("Preparing product %s to be written to AWIPS SCMI NetCDF file", dataset.attrs["name"])
                 awips_info = self._get_awips_info(dataset.attrs, source_name=source_name)
-                for tile_info, tmp_tile in tile_gen(dataset):
-                    # make sure this entire tile is loaded as one single array
-                    tmp_tile.data = tmp_tile.data.rechunk(tmp_tile.shape)
+                tiles = []
+                for tile_info, tmp_tile in tile_gen(dataset.data):
                     output_filename = filename or self.get_filename(area_def, tile_info, sector_id,
                                                                     source_name=awips_info['source_name'],
                                                                     **dataset.attrs)
@@ -995,12 +1108,51 @@ class SCMIWriter(Writer):
                     nc_wrapper = NetCDFWrapper(output_filename, sector_id, dataset.attrs, awips_info,
                                                tile_gen.xy_factors, tile_info,
                                                compress=self.compress, fix_awips=self.fix_awips)
-                    sources_targets.append((tmp_tile.data, nc_wrapper))
-
-        if compute and sources_targets:
-            # the NetCDF creation is per-file so we don't need to lock
-            return da.store(*zip(*sources_targets), lock=False)
-        return sources_targets
+                    tiles.append((tmp_tile, nc_wrapper))
+                products.append((dataset.data, self._get_valid_range(dataset), tiles))
+
+        if not compute:
+            # the whole tile is given as one single array to the writer
+            return [dask.delayed(nc_wrapper.write)(tile_data, *valid_range)
+                    for _, valid_range, tiles in products
+                    for tile_data, nc_wrapper in tiles]
+
+        LOG.debug("Computing the scaling and valid data of sector %s", sector_id)
+        chunk_validity, valid_ranges = da.compute(
+            [self._get_chunk_validity(data) for data, _, _ in products],
+            [valid_range for _, valid_range, _ in products])
+        sources = []
+        targets = []
+        num_skipped = 0
+        for (data, _, tiles), is_valid, valid_range in zip(products, chunk_validity, valid_ranges):
+            for tile_data, nc_wrapper in tiles:
+                if not is_valid[self._tile_chunk_slices(data.chunks, nc_wrapper.tile_info.data_slices)].any():
+                    num_skipped += 1
+                    continue
+                nc_wrapper.valid_min, nc_wrapper.valid_max = valid_range
+                # make sure this entire tile is loaded as one single array
+                sources.append(tile_data.rechunk(tile_data.shape))
+                targets.append(nc_wrapper)
+        LOG.info("Skipping %d tiles of sector %s without valid data", num_skipped, sector_id)
+        if not sources:
+            return None
+
+        start = time.time()
+        # the NetCDF creation is per-file so we don't need to lock
+        res = da.store(sources, targets, lock=False, num_workers=num_workers)
+        duration = max(time.time() - start, 1e-6)
+        written = set(target.filename for target in targets
+                      if os.path.isfile(target.filename))
+        num_bytes = sum(os.path.getsize(fn) for fn in written)
+        LOG.info("Wrote %d tiles of sector %s in %.2f s (%.1f tiles/s, %.2f MB/s)",
+                 len(written), sector_id, duration, len(written) / duration,
+                 num_bytes / duration / 1e6)
+        return res
+
+
+def _any_finite(block):
+    """Tell if `block` has any valid value, as a block of one element."""
+    return np.array(np.isfinite(block).any(), ndmin=block.ndim)
 
 
 def _create_debug_array(sector_info, num_subtiles, font_path='Verdana.ttf'):